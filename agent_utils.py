@@ -1,20 +1,23 @@
-import asyncio
 import inspect
 import json
 import logging
 import os
 import re
+from collections import Counter
 from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from rich.console import Console
 from ollama import chat, ChatResponse
 
 from settings import get_setting
+from tool_loop import run_async
+from tool_schemas import tool_spec, tool_spec_chars, validate
 from tools import (
     open_in_user_browser,
     scrape_website,
     extract_links,
     download_pdfs,
+    read_pdfs,
 )
 
 AVAILABLE_TOOLS = [
@@ -22,15 +25,19 @@ AVAILABLE_TOOLS = [
     "scrape_website",
     "extract_links",
     "download_pdfs",
+    "read_pdfs",
 ]
 
 console = Console()
 
 TRUNCATE_AT = 2000
+# Rough size estimate used for prompt-token accounting
+CHARS_PER_TOKEN = 4
 FULL_OUTPUT_PLACEHOLDER = "<FULL_TOOL_OUTPUT>"
 
 TOOL_PATTERN = re.compile(r"<tool>(.*?)</tool>", re.DOTALL)
 PLAN_PATTERN = re.compile(r"<plan>(.*?)</plan>", re.DOTALL)
+THINK_PATTERN = re.compile(r"<think>.*?</think>", re.DOTALL)
 
 project_dir = os.path.dirname(os.path.abspath(__file__))
 log_dir = os.path.join(project_dir, "logs")
@@ -49,6 +56,7 @@ TOOL_MAP: Dict[str, Callable[..., Any]] = {
     "scrape_website": scrape_website,
     "extract_links": extract_links,
     "download_pdfs": download_pdfs,
+    "read_pdfs": read_pdfs,
 }
 
 PLANNER_PROMPT = (
@@ -70,6 +78,38 @@ SUMMARY_PROMPT = (
     "in <final>ANSWER</final>. Do not wrap <final> inside <think>."
 )
 
+MAP_PROMPT = (
+    "You are reading one excerpt of the tool outputs gathered for a question. "
+    "List the facts in the excerpt that help answer the question, as short bullet points. "
+    "Reply with NONE if nothing is relevant. Do not answer the question yet."
+)
+
+REDUCE_PROMPT = (
+    "You are given notes taken from several excerpts of tool outputs. "
+    "Merge them into one list of bullet points relevant to the question, removing duplicates."
+)
+
+REDUCE_SUMMARY_PROMPT = (
+    "You are the summarizer agent. Use the notes gathered from all tool outputs to answer "
+    "the question in <final>ANSWER</final>. Do not wrap <final> inside <think>."
+)
+
+STRUCTURED_PLANNER_PROMPT = (
+    "List the sequence of tools you will call. Available tools are: "
+    + ", ".join(AVAILABLE_TOOLS)
+    + '. Respond ONLY with JSON: {"plan": ["TOOL_NAME", ...]}.'
+)
+
+STRUCTURED_EXECUTOR_PROMPT = (
+    "You are the execution agent for {tool}. Given the query and previous output, "
+    "respond ONLY with JSON: {{\"name\": \"{tool}\", \"args\": {{...}}}}."
+)
+
+REPAIR_PROMPT = (
+    "Your last reply was not valid: {errors}. "
+    "Reply again in the required format, with nothing else."
+)
+
 DEFAULT_SYSTEM_PROMPT = (
     "The web scraper defaults to Playwright mode. "
     "Use Selenium only when a user explicitly requests cookie-based browsing. "
@@ -95,6 +135,106 @@ def _extract_plan(text: str) -> List[str]:
     return found
 
 
+def _parse_tool_call(text: str) -> Optional[Dict[str, Any]]:
+    """Return the JSON inside ``<tool>`` tags, or None if missing or malformed."""
+    match = TOOL_PATTERN.search(THINK_PATTERN.sub("", text))
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(1))
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _structured_enabled() -> bool:
+    return str(get_setting("structured_output", "false")).lower() == "true"
+
+
+class StructuredStats:
+    """Per-model counters for structured-output calls, repair retries and failures."""
+
+    def __init__(self) -> None:
+        self.calls: Counter = Counter()
+        self.retries: Counter = Counter()
+        self.failures: Counter = Counter()
+
+    def retry_rate(self, model: str) -> float:
+        return self.retries[model] / self.calls[model] if self.calls[model] else 0.0
+
+
+structured_stats = StructuredStats()
+
+
+def _structured(
+    messages: List[Dict[str, Any]],
+    schema: Dict[str, Any],
+    model: Optional[str] = None,
+    *,
+    retries: int = 1,
+) -> Optional[Dict[str, Any]]:
+    """Ask for JSON constrained by ``schema``; retry with a repair prompt if invalid."""
+    model_name = model or get_setting("stream_model", "llama3.1:8b")
+    structured_stats.calls[model_name] += 1
+    for attempt in range(retries + 1):
+        if attempt:
+            structured_stats.retries[model_name] += 1
+        output = _collect(messages, model=model, tools=[], format=schema)
+        try:
+            data = json.loads(THINK_PATTERN.sub("", output))
+            errors = validate(data, schema)
+        except json.JSONDecodeError as exc:
+            errors = [f"invalid JSON ({exc.msg})"]
+        if not errors:
+            if attempt:
+                logger.info(
+                    "structured retry rate for %s: %.0f%%",
+                    model_name,
+                    structured_stats.retry_rate(model_name) * 100,
+                )
+            return data
+        logger.warning("structured output from %s rejected: %s", model_name, errors)
+        messages = messages + [
+            {"role": "assistant", "content": output},
+            {"role": "user", "content": REPAIR_PROMPT.format(errors="; ".join(errors))},
+        ]
+    structured_stats.failures[model_name] += 1
+    logger.info(
+        "structured retry rate for %s: %.0f%%",
+        model_name,
+        structured_stats.retry_rate(model_name) * 100,
+    )
+    return None
+
+
+class PromptStats:
+    """Estimated prompt tokens sent versus what sending every tool schema would cost."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.sent_tokens = 0
+        self.full_tokens = 0
+
+    def record(self, messages: List[Dict[str, Any]], tools: Iterable[str]) -> None:
+        message_chars = sum(len(str(m.get("content", ""))) for m in messages)
+        sent_chars = sum(tool_spec_chars(name, TOOL_MAP[name]) for name in tools if name in TOOL_MAP)
+        all_chars = sum(tool_spec_chars(name, func) for name, func in TOOL_MAP.items())
+        self.calls += 1
+        self.sent_tokens += (message_chars + sent_chars) // CHARS_PER_TOKEN
+        self.full_tokens += (message_chars + all_chars) // CHARS_PER_TOKEN
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.full_tokens - self.sent_tokens
+
+
+prompt_stats = PromptStats()
+
+
+def _tool_specs(names: Iterable[str]) -> List[Dict[str, Any]]:
+    return [tool_spec(name, TOOL_MAP[name]) for name in names if name in TOOL_MAP]
+
+
 def _invoke_tool(name: str, args: Dict[str, Any]) -> Dict[str, Any]:
     func = TOOL_MAP.get(name)
     console.print(f"[cyan]Calling function: {name}[/cyan]")
@@ -105,7 +245,7 @@ def _invoke_tool(name: str, args: Dict[str, Any]) -> Dict[str, Any]:
         return {"status": "error", "message": f"unknown tool {name}", "data": None}
     try:
         if inspect.iscoroutinefunction(func):
-            return asyncio.run(func(**args))
+            return run_async(func(**args))
         return func(**args)
     except Exception as exc:  # noqa: BLE001
         logger.exception("error during tool execution: %s", exc)
@@ -124,23 +264,43 @@ def _stream_chat(
     messages: List[Dict[str, Any]],
     model: Optional[str] = None,
     *,
-    tools: Optional[List[Any]] = None,
+    tools: Optional[List[str]] = None,
+    format: Optional[Dict[str, Any]] = None,
 ) -> Iterable[ChatResponse]:
+    """Stream a reply, exposing only the named ``tools`` (none by default)."""
+    model = model or get_setting("stream_model", "llama3.1:8b")
+    specs = _tool_specs(tools or [])
+    prompt_stats.record(messages, tools or [])
+    logger.info(
+        "prompt ~%d tokens with %d tool schema(s); ~%d tokens saved over %d calls",
+        prompt_stats.sent_tokens // prompt_stats.calls,
+        len(specs),
+        prompt_stats.saved_tokens,
+        prompt_stats.calls,
+    )
+    return chat(model=model, messages=messages, tools=specs, format=format, stream=True)
+
+
+def _complete(
+    messages: List[Dict[str, Any]],
+    model: Optional[str] = None,
+) -> str:
+    """Return a whole (non-streamed) reply; safe to call from worker threads."""
     model = model or get_setting("stream_model", "llama3.1:8b")
-    if tools is None:
-        tools = list(TOOL_MAP.values())
-    return chat(model=model, messages=messages, tools=tools, stream=True)
+    response = chat(model=model, messages=messages, tools=[], stream=False)
+    return response.message.content or ""
 
 
 def _collect(
     messages: List[Dict[str, Any]],
     model: Optional[str] = None,
     *,
-    tools: Optional[List[Any]] = None,
+    tools: Optional[List[str]] = None,
+    format: Optional[Dict[str, Any]] = None,
 ) -> str:
     in_think = False
     output_buffer = ""
-    for chunk in _stream_chat(messages, model=model, tools=tools):
+    for chunk in _stream_chat(messages, model=model, tools=tools, format=format):
         if chunk.message.content:
             text = chunk.message.content
             output_buffer += text
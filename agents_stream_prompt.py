@@ -9,19 +9,22 @@ from agent_utils import logger
 def run(query: str) -> None:
     logger.info("received query: %s", query)
     scratch = tempfile.mkdtemp(prefix="agent-")
-    plan = PlannerAgent(query).run()
-    log_file = ExecutorAgent(plan, query, scratch).run()
-    SummarizerAgent(log_file).run()
+    planner = PlannerAgent(query)
+    plan = planner.run()
+    executor = ExecutorAgent(plan, query, scratch, step_args=planner.step_args)
+    log_file = executor.run()
+    planner.record_outcome(plan, executor.succeeded)
+    SummarizerAgent(log_file, query=query).run()
 
 
 if __name__ == "__main__":
     import sys
-    from tools.webscraper import scraper
+    import tool_loop
 
     query = " ".join(sys.argv[1:]) if len(sys.argv) > 1 else input("Query: ")
     logger.info("starting agent")
     try:
         run(query)
     finally:
-        scraper.cleanup()
+        tool_loop.shutdown()
         logger.info("agent shutdown")
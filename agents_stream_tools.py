@@ -1,24 +1,30 @@
 import json
 import logging
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, Iterable, List, Optional
 
 import re
 
-import asyncio
 import inspect
+import time
 
 from rich.console import Console
 from ollama import chat, ChatResponse
 
 from settings import get_setting
+from tool_loop import run_async
+from fast_planner import fast_plan
+from plan_cache import shared_plan_cache
+from sufficiency import early_exit_enabled, stats as early_exit_stats, SufficiencyChecker
+from tool_schemas import tool_spec
 
 from tools import (
     open_in_user_browser,
     scrape_website,
     extract_links,
     download_pdfs,
+    read_pdfs,
 )
 
 AVAILABLE_TOOLS = [
@@ -26,9 +32,11 @@ AVAILABLE_TOOLS = [
     "scrape_website",
     "extract_links",
     "download_pdfs",
+    "read_pdfs",
 ]
 
 console = Console()
+plan_cache = shared_plan_cache(AVAILABLE_TOOLS)
 
 TRUNCATE_AT = 2000
 FULL_OUTPUT_PLACEHOLDER = "<FULL_TOOL_OUTPUT>"
@@ -72,8 +80,10 @@ class StreamingAgent:
 
     query: str
     debug: bool = False
+    step_args: List[Optional[Dict[str, Any]]] = field(default_factory=list)
+    plan_source: str = ""
 
-    def _chat(self, messages: List[Dict[str, Any]], *, tools: Optional[List[Any]] = None) -> str:
+    def _chat(self, messages: List[Dict[str, Any]], *, tools: Optional[List[str]] = None) -> str:
         if self.debug:
             console.print(f"[magenta]Messages: {messages}[/magenta]")
         output_buffer = ""
@@ -86,12 +96,24 @@ class StreamingAgent:
         return output_buffer
 
     def define_plan(self) -> List[str]:
+        planned = fast_plan(self.query)
+        if planned is not None:
+            logger.info("fast planner rule %s plan: %s", planned.rule, planned.plan)
+            self.step_args = planned.args
+            self.plan_source = "fast"
+            return planned.plan
+        cached = plan_cache.get(self.query)
+        if cached is not None:
+            logger.info("plan cache hit: %s", cached)
+            self.plan_source = "cache"
+            return cached
+        self.plan_source = "llm"
         messages = [
             {"role": "system", "content": DEFAULT_SYSTEM_PROMPT},
             {"role": "system", "content": PLANNER_PROMPT},
             {"role": "user", "content": self.query},
         ]
-        output = self._chat(messages, tools=None)
+        output = self._chat(messages)
         return _extract_plan(output)
 
     def get_args(self, tool_name: str, last_output: str) -> Dict[str, Any]:
@@ -101,7 +123,7 @@ class StreamingAgent:
             {"role": "system", "content": EXECUTOR_PROMPT.format(tool=tool_name)},
             {"role": "user", "content": user_text},
         ]
-        output = self._chat(messages)
+        output = self._chat(messages, tools=[tool_name])
         match = TOOL_PATTERN.search(output)
         if not match:
             return {}
@@ -117,18 +139,40 @@ class StreamingAgent:
                 "content": json.dumps({"query": self.query, "last_output": last_output}),
             },
         ]
-        self._chat(messages, tools=None)
+        self._chat(messages)
 
     def run(self) -> None:
         console.print("[bold blue]define plan[/bold blue]")
         plan = self.define_plan()
         last_output = ""
-        for tool_name in plan:
+        succeeded = True
+        checker = SufficiencyChecker() if early_exit_enabled() else None
+        started = time.monotonic()
+        skipped: List[str] = []
+        for index, tool_name in enumerate(plan):
             console.print(f"[bold blue]run {tool_name}[/bold blue]")
-            args = self.get_args(tool_name, last_output)
+            preset = self.step_args[index] if index < len(self.step_args) else None
+            args = preset if preset is not None else self.get_args(tool_name, last_output)
             result = _invoke_tool(tool_name, args, debug=self.debug)
+            succeeded = succeeded and result.get("status") != "error"
             full_output = json.dumps(_minify_result(result), separators=(",", ":"))
             last_output = full_output
+            remaining = plan[index + 1:]
+            if (
+                checker
+                and remaining
+                and result.get("status") != "error"
+                and checker.sufficient(self.query, last_output, remaining)
+            ):
+                skipped = remaining
+                break
+        if checker:
+            executed = len(plan) - len(skipped)
+            early_exit_stats.record(len(skipped), (time.monotonic() - started) / max(executed, 1))
+            if skipped:
+                logger.info("answer found early; skipped %s", skipped)
+        if self.plan_source in ("llm", "cache"):
+            plan_cache.record(self.query, plan, succeeded)
         console.print("[bold blue]summarize[/bold blue]")
         self.summarize(last_output)
 
@@ -161,6 +205,7 @@ TOOL_MAP: Dict[str, Callable[..., Any]] = {
     "scrape_website": scrape_website,
     "extract_links": extract_links,
     "download_pdfs": download_pdfs,
+    "read_pdfs": read_pdfs,
 }
 
 
@@ -193,7 +238,7 @@ def _invoke_tool(name: str, args: Dict[str, Any], *, debug: bool) -> Dict[str, A
         return {"status": "error", "message": f"unknown tool {name}", "data": None}
     try:
         if inspect.iscoroutinefunction(func):
-            result = asyncio.run(func(**args))
+            result = run_async(func(**args))
         else:
             result = func(**args)
         if debug:
@@ -206,13 +251,12 @@ def _invoke_tool(name: str, args: Dict[str, Any], *, debug: bool) -> Dict[str, A
 
 
 def _stream_chat(
-    messages: List[Dict[str, Any]], *, tools: Optional[List[Any]] = None
+    messages: List[Dict[str, Any]], *, tools: Optional[List[str]] = None
 ) -> Iterable[ChatResponse]:
-    """Yield chat responses from Ollama with streaming enabled."""
+    """Yield chat responses from Ollama, exposing only the named ``tools``."""
     model = get_setting("stream_model", "llama3.1:8b")
-    if tools is None:
-        tools = list(TOOL_MAP.values())
-    return chat(model=model, messages=messages, tools=tools, stream=True)
+    specs = [tool_spec(name, TOOL_MAP[name]) for name in tools or [] if name in TOOL_MAP]
+    return chat(model=model, messages=messages, tools=specs, stream=True)
 
 
 def run(query: str, *, debug: bool = False) -> None:
@@ -224,7 +268,7 @@ def run(query: str, *, debug: bool = False) -> None:
 
 if __name__ == "__main__":
     import argparse
-    from tools.webscraper import scraper
+    import tool_loop
 
     parser = argparse.ArgumentParser(description="run the streaming agent")
     parser.add_argument("query", nargs="*", help="agent query")
@@ -236,5 +280,5 @@ if __name__ == "__main__":
     try:
         run(query, debug=args.debug)
     finally:
-        asyncio.run(scraper.cleanup())
+        tool_loop.shutdown()
         logger.info("agent shutdown")
@@ -0,0 +1,127 @@
+import codecs
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import xxhash
+
+# Strings longer than this many characters are written to a file and passed by handle
+ARTIFACT_THRESHOLD = int(os.getenv("ARTIFACT_THRESHOLD", "8192"))
+PREVIEW_CHARS = 300
+HANDLE_KEY = "artifact"
+
+
+def is_handle(value: Any) -> bool:
+    return isinstance(value, dict) and isinstance(value.get(HANDLE_KEY), str) and "chars" in value
+
+
+def artifact_chars(value: Any) -> int:
+    """Total characters held in artifacts referenced anywhere in ``value``."""
+    if is_handle(value):
+        return value["chars"]
+    if isinstance(value, dict):
+        return sum(artifact_chars(v) for v in value.values())
+    if isinstance(value, list):
+        return sum(artifact_chars(v) for v in value)
+    return 0
+
+
+def iter_handles(value: Any) -> Iterator[Dict[str, Any]]:
+    if is_handle(value):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_handles(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_handles(item)
+
+
+class ArtifactStore:
+    def __init__(self, root: str, threshold: int = ARTIFACT_THRESHOLD) -> None:
+        """Content-addressed store for large tool outputs under ``root``.
+
+        Large strings are written once and replaced by a small handle
+        (``{"artifact": id, "chars": n, "preview": ...}``) that is what gets
+        logged and shown to the model. Readers map the file instead of
+        loading a copy into every step.
+        """
+        self.root = root
+        self.threshold = threshold
+
+    def _path(self, artifact_id: str) -> str:
+        return os.path.join(self.root, f"{artifact_id}.txt")
+
+    def put(self, text: str) -> Dict[str, Any]:
+        data = text.encode("utf-8")
+        artifact_id = xxhash.xxh64(data).hexdigest()
+        path = self._path(artifact_id)
+        if not os.path.exists(path):
+            os.makedirs(self.root, exist_ok=True)
+            # unique per writer: concurrent puts of the same text must not share a temp file
+            with tempfile.NamedTemporaryFile(dir=self.root, suffix=".tmp", delete=False) as f:
+                f.write(data)
+            try:
+                os.replace(f.name, path)
+            except OSError:
+                os.unlink(f.name)
+                raise
+        return {HANDLE_KEY: artifact_id, "chars": len(text), "preview": text[:PREVIEW_CHARS]}
+
+    @contextmanager
+    def view(self, handle: Dict[str, Any]) -> Iterator[mmap.mmap]:
+        """Map the artifact read-only; slices of the map do not copy the whole file."""
+        with open(self._path(handle[HANDLE_KEY]), "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield mapped
+            finally:
+                mapped.close()
+
+    def read(self, handle: Dict[str, Any]) -> str:
+        with self.view(handle) as mapped:
+            buffer = memoryview(mapped)
+            try:
+                return str(buffer, "utf-8")
+            finally:
+                buffer.release()  # the map cannot close while a view is exported
+
+    def iter_text(self, handle: Dict[str, Any], chunk_chars: int) -> Iterator[str]:
+        """Yield the artifact's text in pieces of about ``chunk_chars`` characters."""
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        with self.view(handle) as mapped:
+            for start in range(0, len(mapped), chunk_chars):
+                text = decoder.decode(mapped[start:start + chunk_chars])
+                if text:
+                    yield text
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+
+    def spill(self, value: Any) -> Any:
+        """Replace every string longer than the threshold in ``value`` with a handle."""
+        if isinstance(value, str):
+            return self.put(value) if len(value) > self.threshold else value
+        if isinstance(value, dict) and not is_handle(value):
+            return {k: self.spill(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.spill(v) for v in value]
+        return value
+
+    def resolve(self, value: Any) -> Any:
+        """Inverse of :meth:`spill`: swap handles back for their full text."""
+        if is_handle(value):
+            return self.read(value)
+        if isinstance(value, dict):
+            return {k: self.resolve(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(v) for v in value]
+        return value
+
+
+def store_for_log(log_file: str, threshold: Optional[int] = None) -> ArtifactStore:
+    """The artifact store that sits next to an executor log."""
+    root = os.path.join(os.path.dirname(os.path.abspath(log_file)), "artifacts")
+    return ArtifactStore(root, ARTIFACT_THRESHOLD if threshold is None else threshold)
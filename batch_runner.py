@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Set
+
+import tool_loop
+from agent_utils import logger
+from executor import ExecutorAgent
+from planner import PlannerAgent
+from summarizer import SummarizerAgent
+from tools.scheduler import BATCH
+
+
+def load_queries(path: str) -> List[Dict[str, Any]]:
+    """Read ``{"id": ..., "query": ...}`` lines; a missing id defaults to the line number."""
+    queries: List[Dict[str, Any]] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if isinstance(item, str):
+                item = {"query": item}
+            queries.append({"id": str(item.get("id", line_no)), "query": item["query"]})
+    return queries
+
+
+def completed_ids(path: str) -> Set[str]:
+    """Ids that already have a successful result in the output file."""
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partial line from an interrupted run
+            if record.get("status") == "success":
+                done.add(str(record["id"]))
+    return done
+
+
+def _ends_with_newline(path: str) -> bool:
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return True
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def run_query(query_id: str, query: str, scratch_root: Optional[str] = None) -> Dict[str, Any]:
+    """Plan, execute and summarize one query, timing each stage."""
+    timings: Dict[str, float] = {}
+    record: Dict[str, Any] = {"id": query_id, "query": query}
+    started = time.perf_counter()
+    try:
+        scratch = tempfile.mkdtemp(prefix=f"agent-{query_id}-", dir=scratch_root)
+        mark = time.perf_counter()
+        planner = PlannerAgent(query)
+        plan = planner.run()
+        timings["plan"] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        # batch page loads queue behind interactive ones in the shared scheduler
+        executor = ExecutorAgent(plan, query, scratch, step_args=planner.step_args, priority=BATCH)
+        log_file = executor.run()
+        planner.record_outcome(plan, executor.succeeded)
+        timings["execute"] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        answer = SummarizerAgent(log_file, query=query).run()
+        timings["summarize"] = time.perf_counter() - mark
+
+        record.update(status="success", plan=plan, log_file=log_file, answer=answer)
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("query %s failed: %s", query_id, exc)
+        record.update(status="error", message=str(exc))
+    timings["total"] = time.perf_counter() - started
+    record["timings"] = {k: round(v, 3) for k, v in timings.items()}
+    return record
+
+
+def run_batch(
+    input_path: str,
+    output_path: str,
+    concurrency: int = 4,
+    scratch_root: Optional[str] = None,
+) -> int:
+    """Run every pending query from ``input_path``, appending results to ``output_path``.
+
+    Results are written as soon as each query finishes, so an interrupted
+    batch resumes where it stopped; failed queries are retried on the next run.
+    Returns the number of queries run.
+    """
+    done = completed_ids(output_path)
+    pending = [q for q in load_queries(input_path) if q["id"] not in done]
+    logger.info("%d queries pending, %d already done", len(pending), len(done))
+    needs_newline = not _ends_with_newline(output_path)
+    with open(output_path, "a", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        if needs_newline:
+            out.write("\n")  # terminate the partial line an interrupted run left behind
+        futures = [pool.submit(run_query, q["id"], q["query"], scratch_root) for q in pending]
+        for future in as_completed(futures):
+            record = future.result()
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            logger.info("query %s %s in %.1fs", record["id"], record["status"], record["timings"]["total"])
+    return len(pending)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="run the agent over a JSONL file of queries")
+    parser.add_argument("input", help="JSONL file with one {\"id\", \"query\"} object per line")
+    parser.add_argument("output", help="JSONL file results are appended to")
+    parser.add_argument("--concurrency", type=int, default=4, help="queries run at the same time")
+    parser.add_argument("--scratch-root", default=None, help="directory for per-query scratch dirs")
+    args = parser.parse_args(argv)
+
+    try:
+        run_batch(args.input, args.output, concurrency=args.concurrency, scratch_root=args.scratch_root)
+    finally:
+        tool_loop.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,29 @@
 import argparse
+import inspect
 import json
 import os
+import time
 from typing import Any, Dict, List, Optional
 
 from agent_utils import (
     _collect,
     _invoke_tool,
     _minify_result,
-    TOOL_PATTERN,
+    _parse_tool_call,
+    _structured,
+    _structured_enabled,
     DEFAULT_SYSTEM_PROMPT,
     EXECUTOR_PROMPT,
+    FULL_OUTPUT_PLACEHOLDER,
+    REPAIR_PROMPT,
+    STRUCTURED_EXECUTOR_PROMPT,
+    TOOL_MAP,
     logger,
 )
+from artifacts import ArtifactStore, is_handle
+from step_log import StepLogWriter
+from sufficiency import early_exit_enabled, stats as early_exit_stats, SufficiencyChecker
+from tool_schemas import tool_call_schema
 
 
 class ExecutorAgent:
@@ -21,40 +33,113 @@ class ExecutorAgent:
         query: str,
         scratch_dir: str,
         model: Optional[str] = None,
+        compress: bool = False,
+        step_args: Optional[List[Optional[Dict[str, Any]]]] = None,
+        structured: Optional[bool] = None,
+        early_exit: Optional[bool] = None,
+        priority: Optional[str] = None,
     ) -> None:
         self.plan = plan
+        self.step_args = step_args or []
         self.query = query
         self.scratch_dir = scratch_dir
         self.model = model
+        self.compress = compress
+        self.succeeded = True
+        self.structured = _structured_enabled() if structured is None else structured
+        if early_exit is None:
+            early_exit = early_exit_enabled()
+        self.checker = SufficiencyChecker() if early_exit else None
+        # Plan steps skipped because an earlier output already answered the query
+        self.skipped: List[str] = []
+        self.artifacts = ArtifactStore(os.path.join(scratch_dir, "artifacts"))
+        # Scheduler class for tools that fetch pages; the tools' default when unset
+        self.priority = priority
+
+    def _expand_args(self, value: Any, previous: Any) -> Any:
+        """Substitute artifact handles and the full-output placeholder with real text."""
+        if is_handle(value):
+            return self.artifacts.read(value)
+        if isinstance(value, str) and FULL_OUTPUT_PLACEHOLDER in value:
+            # the placeholder stands for text, so structured output is passed as JSON
+            full = self.artifacts.resolve(previous)
+            return value.replace(FULL_OUTPUT_PLACEHOLDER, full if isinstance(full, str) else json.dumps(full))
+        if isinstance(value, dict):
+            return {k: self._expand_args(v, previous) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._expand_args(v, previous) for v in value]
+        return value
 
     def _get_args(self, tool_name: str, last_output: str) -> Dict[str, Any]:
         user_text = json.dumps({"query": self.query, "last_output": last_output})
+        if self.structured and tool_name in TOOL_MAP:
+            messages = [
+                {"role": "system", "content": DEFAULT_SYSTEM_PROMPT},
+                {"role": "system", "content": STRUCTURED_EXECUTOR_PROMPT.format(tool=tool_name)},
+                {"role": "user", "content": user_text},
+            ]
+            data = _structured(messages, tool_call_schema(tool_name, TOOL_MAP[tool_name]), model=self.model)
+            return data["args"] if data else {}
+
         messages = [
             {"role": "system", "content": DEFAULT_SYSTEM_PROMPT},
             {"role": "system", "content": EXECUTOR_PROMPT.format(tool=tool_name)},
             {"role": "user", "content": user_text},
         ]
-        output = _collect(messages, model=self.model)
-        match = TOOL_PATTERN.search(output)
-        if not match:
-            return {}
-        data = json.loads(match.group(1))
+        output = _collect(messages, model=self.model, tools=[tool_name])
+        data = _parse_tool_call(output)
+        if data is None:
+            logger.warning("no valid <tool> call for %s; asking the model to repair it", tool_name)
+            messages += [
+                {"role": "assistant", "content": output},
+                {"role": "user", "content": REPAIR_PROMPT.format(errors="missing or malformed <tool> JSON")},
+            ]
+            data = _parse_tool_call(_collect(messages, model=self.model, tools=[tool_name])) or {}
         return data.get("args", {})
 
     def run(self) -> str:
         os.makedirs(self.scratch_dir, exist_ok=True)
-        log_path = os.path.join(self.scratch_dir, "log.json")
-        results = []
+        log_name = "log.jsonl.zst" if self.compress else "log.jsonl"
+        log_path = os.path.join(self.scratch_dir, log_name)
         last_output = ""
-        for tool_name in self.plan:
-            args = self._get_args(tool_name, last_output)
-            result = _invoke_tool(tool_name, args)
-            full = json.dumps(_minify_result(result), separators=",:")
-            results.append({"tool": tool_name, "args": args, "result": result})
-            last_output = full
-        with open(log_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2)
-        logger.info("wrote executor logs to %s", log_path)
+        previous: Any = None
+        started = time.monotonic()
+        executed = 0
+        with StepLogWriter(log_path) as step_log:
+            for index, tool_name in enumerate(self.plan):
+                preset = self.step_args[index] if index < len(self.step_args) else None
+                args = preset if preset is not None else self._get_args(tool_name, last_output)
+                # Large outputs are stored once; the log and prompts only carry handles
+                call_args = self._expand_args(args, previous)
+                func = TOOL_MAP.get(tool_name)
+                if self.priority and func and "priority" in inspect.signature(func).parameters:
+                    call_args = {**call_args, "priority": self.priority}
+                result = self.artifacts.spill(_invoke_tool(tool_name, call_args))
+                previous = result.get("data")
+                last_output = json.dumps(_minify_result(result), separators=",:")
+                if result.get("status") == "error":
+                    self.succeeded = False
+                step_log.append({"tool": tool_name, "args": args, "result": result})
+                logger.info("logged %s step to %s", tool_name, log_path)
+                executed += 1
+                remaining = self.plan[index + 1:]
+                if (
+                    self.checker
+                    and remaining
+                    and result.get("status") != "error"
+                    and self.checker.sufficient(self.query, last_output, remaining)
+                ):
+                    self.skipped = remaining
+                    break
+        if self.checker:
+            early_exit_stats.record(len(self.skipped), (time.monotonic() - started) / max(executed, 1))
+            if self.skipped:
+                logger.info(
+                    "answer found early; skipped %s (total %d steps, ~%.1fs saved)",
+                    self.skipped,
+                    early_exit_stats.steps_saved,
+                    early_exit_stats.seconds_saved,
+                )
         return log_path
 
 
@@ -64,10 +149,23 @@ def main(argv: Optional[List[str]] = None) -> None:
     parser.add_argument("--query", required=True, help="original query")
     parser.add_argument("--scratch_dir", required=True, help="working directory")
     parser.add_argument("--model", default=None, help="ollama model")
+    parser.add_argument("--compress", action="store_true", help="zstd-compress the step log")
+    parser.add_argument("--structured", action="store_true", default=None, help="use JSON-schema constrained output")
+    parser.add_argument(
+        "--early-exit", action="store_true", default=None, help="stop once a step output answers the query"
+    )
     args = parser.parse_args(argv)
 
     plan = json.loads(args.plan)
-    agent = ExecutorAgent(plan, args.query, args.scratch_dir, model=args.model)
+    agent = ExecutorAgent(
+        plan,
+        args.query,
+        args.scratch_dir,
+        model=args.model,
+        compress=args.compress,
+        structured=args.structured,
+        early_exit=args.early_exit,
+    )
     log_file = agent.run()
     print(log_file)
 
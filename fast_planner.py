@@ -0,0 +1,160 @@
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from settings import get_setting
+
+URL_PATTERN = re.compile(r"https?://[^\s<>\"'`]+")
+# Rules match the query with its URL replaced by this token, anchored at the
+# start so only imperative phrasings qualify ("list the links on <url>", not
+# "what does <url> say about links").
+URL_TOKEN = "<url>"
+POLITE = r"(?:(?:please|can you|could you|i want to|i'd like to)\s+)*"
+DOWNLOAD_PDFS = re.compile(
+    POLITE + r"(?:download|fetch|get|grab|save)\s+(?:all\s+)?(?:the\s+)?pdfs?(?:\s+files)?"
+    r"\s+(?:from|on|at|linked\s+(?:on|from))\s+(?:the\s+page\s+)?<url>",
+    re.IGNORECASE,
+)
+DOWNLOAD_PDF_URL = re.compile(POLITE + r"(?:download|fetch|grab|save)\s+(?:the\s+)?(?:pdf\s+)?<url>", re.IGNORECASE)
+LIST_LINKS = re.compile(
+    POLITE + r"(?:(?:list|show|extract|get|find|give)\s+(?:me\s+)?)?(?:all\s+)?(?:the\s+)?(?:links?|urls?|hrefs?)"
+    r"\s+(?:on|from|in|at|of)\s+(?:the\s+page\s+)?<url>",
+    re.IGNORECASE,
+)
+OPEN_BROWSER = re.compile(
+    POLITE + r"(?:open|launch|show)\s+<url>\s+(?:in|with|using)\s+(?:my\s+|the\s+|a\s+)?(?:web\s+)?(?:browser|chrome)",
+    re.IGNORECASE,
+)
+URL_QUESTION = re.compile(
+    r"(?:what|which|how)\s+(?:does|do|did)\s+(?:the\s+page\s+)?<url>\s+(?:says?|mentions?|tells?\s+(?:me|us))"
+    r"\s+(?:about|on|regarding)\s+(?P<topic>.+)",
+    re.IGNORECASE,
+)
+DEFAULT_MIN_CONFIDENCE = 0.75
+
+
+@dataclass
+class FastPlan:
+    """A plan produced without the LLM.
+
+    ``args`` holds one entry per step; ``None`` means the step's arguments
+    depend on earlier output and must still be filled in by the executor.
+    """
+
+    plan: List[str]
+    args: List[Optional[Dict[str, Any]]]
+    confidence: float
+    rule: str
+
+
+@dataclass
+class FastPlanStats:
+    hits: int = 0
+    misses: int = 0
+    rules: Counter = field(default_factory=Counter)
+
+    def record(self, plan: Optional[FastPlan]) -> None:
+        if plan is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.rules[plan.rule] += 1
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+stats = FastPlanStats()
+
+
+def _strip_url(query: str, url: str) -> str:
+    text = query.replace(url, " ")
+    text = re.sub(r"\s+", " ", text).strip(" ?.!,:;\"'")
+    return text
+
+
+def _template(query: str, url: str) -> str:
+    text = query.replace(url, URL_TOKEN)
+    return re.sub(r"\s+", " ", text).strip(" ?.!,:;\"'")
+
+
+def _confidence(base: float, match: "re.Match[str]", text: str) -> float:
+    """Scale ``base`` by how much of the query the match explains."""
+    return round(base * match.end() / len(text), 3)
+
+
+def _download_pdfs(query: str, url: str) -> Optional[FastPlan]:
+    text = _template(query, url)
+    if url.lower().split("?")[0].endswith(".pdf"):
+        match = DOWNLOAD_PDF_URL.match(text)
+        if match:
+            return FastPlan(["download_pdfs"], [{"links": [url]}], _confidence(0.95, match, text), "download_pdf_url")
+    match = DOWNLOAD_PDFS.match(text)
+    if not match:
+        return None
+    return FastPlan(
+        ["extract_links", "download_pdfs"],
+        [{"url": url, "file_types": ["pdf"]}, None],
+        _confidence(0.9, match, text),
+        "download_pdfs_from_page",
+    )
+
+
+def _list_links(query: str, url: str) -> Optional[FastPlan]:
+    text = _template(query, url)
+    match = LIST_LINKS.match(text)
+    if not match:
+        return None
+    return FastPlan(["extract_links"], [{"url": url}], _confidence(0.9, match, text), "list_links")
+
+
+def _open_browser(query: str, url: str) -> Optional[FastPlan]:
+    text = _template(query, url)
+    match = OPEN_BROWSER.match(text)
+    if not match:
+        return None
+    return FastPlan(["open_in_user_browser"], [{"url": url}], _confidence(0.9, match, text), "open_browser")
+
+
+def _url_question(query: str, url: str) -> Optional[FastPlan]:
+    text = _template(query, url)
+    match = URL_QUESTION.match(text)
+    if match:
+        topic = match.group("topic")
+        # Very long questions tend to describe multi-step tasks the rules cannot see
+        confidence = 0.85 if len(topic.split()) <= 15 else 0.5
+        return FastPlan(["scrape_website"], [{"url": url, "query": topic}], confidence, "url_question")
+    question = _strip_url(query, url)
+    if not question:
+        return None
+    # Anything else about one page is probably a scrape, but the rules cannot tell
+    # what is being asked, so this plan stays below the default threshold
+    return FastPlan(["scrape_website"], [{"url": url, "query": question}], 0.5, "url_catch_all")
+
+
+RULES: List[Callable[[str, str], Optional[FastPlan]]] = [
+    _download_pdfs,
+    _open_browser,
+    _list_links,
+    _url_question,
+]
+
+
+def fast_plan(query: str, min_confidence: Optional[float] = None) -> Optional[FastPlan]:
+    """Return a plan for common single-URL query shapes, or ``None`` to use the LLM."""
+    if min_confidence is None:
+        min_confidence = float(get_setting("fast_plan_min_confidence", DEFAULT_MIN_CONFIDENCE))
+    plan = None
+    urls = list(dict.fromkeys(u.rstrip(").,;:!?") for u in URL_PATTERN.findall(query)))
+    if len(urls) == 1:
+        for rule in RULES:
+            candidate = rule(query, urls[0])
+            if candidate is not None:
+                if candidate.confidence >= min_confidence:
+                    plan = candidate
+                break
+    stats.record(plan)
+    return plan
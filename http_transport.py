@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, MutableMapping
+
+from mcp.server.fastmcp import FastMCP
+
+logger = logging.getLogger(__name__)
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+class RequestLimiter:
+    def __init__(self, app: ASGIApp, max_inflight: int = 16, max_queue: int = 64, queue_timeout: float = 30) -> None:
+        """ASGI middleware that bounds concurrent MCP calls over streamable HTTP.
+
+        At most ``max_inflight`` POST requests (tool calls and other JSON-RPC
+        messages) are handled at once; up to ``max_queue`` more wait for a
+        turn for at most ``queue_timeout`` seconds. Anything beyond that is
+        answered with 503 and ``Retry-After`` so clients back off instead of
+        piling more work onto the shared browser. Long-lived GET event
+        streams are not counted.
+
+        With the ``sse`` transport a POST is answered with 202 as soon as the
+        message is queued and the tool runs on the session's event stream, so
+        this only bounds message intake there, not running tool calls.
+        """
+        self.app = app
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.inflight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._slots = asyncio.Semaphore(max_inflight)
+
+    async def _reject(self, send: Send, reason: str) -> None:
+        self.rejected += 1
+        logger.warning(f"Rejecting MCP request: {reason} ({self.inflight} in flight, {self.waiting} queued)")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [(b"content-type", b"text/plain"), (b"retry-after", b"1")],
+            }
+        )
+        await send({"type": "http.response.body", "body": f"Server busy: {reason}".encode()})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("method") != "POST":
+            await self.app(scope, receive, send)
+            return
+        if self._slots.locked():
+            if self.waiting >= self.max_queue:
+                await self._reject(send, "queue full")
+                return
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                await self._reject(send, "timed out waiting for a free slot")
+                return
+            finally:
+                self.waiting -= 1
+        else:
+            await self._slots.acquire()
+        self.inflight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.inflight -= 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {"inflight": self.inflight, "waiting": self.waiting, "rejected": self.rejected}
+
+
+async def serve_http(
+    server: FastMCP,
+    transport: str,
+    host: str,
+    port: int,
+    *,
+    max_connections: int = 100,
+    max_inflight: int = 16,
+    max_queue: int = 64,
+    queue_timeout: float = 30,
+    log_level: str = "warning",
+) -> None:
+    """Serve ``server`` over streamable HTTP (``http``) or ``sse`` until interrupted.
+
+    All clients share this process, so they share one warm browser and the
+    scraper's scheduler. ``max_connections`` caps open connections; uvicorn
+    answers 503 beyond it.
+    """
+    import uvicorn
+
+    app = server.streamable_http_app() if transport == "http" else server.sse_app()
+    limited = RequestLimiter(app, max_inflight=max_inflight, max_queue=max_queue, queue_timeout=queue_timeout)
+    config = uvicorn.Config(
+        limited,
+        host=host,
+        port=port,
+        limit_concurrency=max_connections,
+        log_level=log_level.lower(),
+    )
+
+    class _Server(uvicorn.Server):
+        def handle_exit(self, sig: int, frame: Any) -> None:
+            super().handle_exit(sig, frame)
+            # uvicorn >= 0.29 re-raises the signal after its graceful shutdown,
+            # which would cancel the browser and worker cleanup that follows;
+            # older versions have no captured signals to clear
+            captured = getattr(self, "_captured_signals", None)
+            if captured is not None:
+                captured.clear()
+
+    logger.info(f"Serving MCP over {transport} on http://{host}:{port}")
+    await _Server(config).serve()
@@ -3,7 +3,13 @@ import logging
 import os
 import asyncio
 
-from tools import mcp, scraper
+from mcp.server.fastmcp import FastMCP
+
+from tools import mcp, scraper, cpu_pool
+from tools.open_in_user_browser import user_drivers
+from tools.react_browser import close_sessions
+from http_transport import serve_http
+from supervisor import create_proxy_server, Supervisor
 
 parser = argparse.ArgumentParser(description="Web Scraper MCP Server")
 parser.add_argument(
@@ -11,6 +17,68 @@ parser.add_argument(
     default="WARNING",
     help="Logging level (debug, info, warning, error, critical)",
 )
+parser.add_argument(
+    "--prewarm",
+    action="store_true",
+    default=os.getenv("PREWARM", "false").lower() == "true",
+    help="Launch the browser and CPU workers at startup instead of on first request",
+)
+parser.add_argument(
+    "--health-interval",
+    type=float,
+    default=float(os.getenv("HEALTH_CHECK_INTERVAL", "60")),
+    help="Seconds between browser health checks (0 disables them)",
+)
+parser.add_argument(
+    "--max-browser-rss-mb",
+    type=float,
+    default=float(os.getenv("MAX_BROWSER_RSS_MB", "0")),
+    help="Recycle the browser when Chromium memory exceeds this many MB (0 disables)",
+)
+parser.add_argument(
+    "--drain-timeout",
+    type=float,
+    default=float(os.getenv("DRAIN_TIMEOUT", "30")),
+    help="Seconds to wait for in-flight requests on shutdown",
+)
+parser.add_argument(
+    "--transport",
+    choices=["stdio", "http", "sse"],
+    default=os.getenv("MCP_TRANSPORT", "stdio"),
+    help="stdio serves one client; http (streamable HTTP) and sse serve many clients sharing one browser",
+)
+parser.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"), help="Address to bind for http/sse")
+parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")), help="Port to bind for http/sse")
+parser.add_argument(
+    "--max-connections",
+    type=int,
+    default=int(os.getenv("MAX_CONNECTIONS", "100")),
+    help="Open connections accepted before answering 503",
+)
+parser.add_argument(
+    "--max-inflight",
+    type=int,
+    default=int(os.getenv("MAX_INFLIGHT_REQUESTS", "16")),
+    help="MCP requests handled at once (tool calls only with --transport http); more wait in a queue",
+)
+parser.add_argument(
+    "--max-queue",
+    type=int,
+    default=int(os.getenv("MAX_QUEUED_REQUESTS", "64")),
+    help="MCP requests allowed to wait for a slot before answering 503",
+)
+parser.add_argument(
+    "--queue-timeout",
+    type=float,
+    default=float(os.getenv("QUEUE_TIMEOUT", "30")),
+    help="Seconds a queued request waits for a slot before answering 503",
+)
+parser.add_argument(
+    "--workers",
+    type=int,
+    default=int(os.getenv("MCP_WORKERS", "0")),
+    help="Run tools in this many worker processes, sharded by host (0 runs them in-process)",
+)
 args, _ = parser.parse_known_args()
 
 project_dir = os.path.dirname(os.path.abspath(__file__))
@@ -23,10 +91,74 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=[logging.StreamHandler(), logging.FileHandler(log_file)],
 )
+logger = logging.getLogger(__name__)
 
 
-if __name__ == "__main__":
+async def _run_transport(server: FastMCP) -> None:
+    if args.transport == "stdio":
+        await server.run_stdio_async()
+    else:
+        await serve_http(
+            server,
+            args.transport,
+            args.host,
+            args.port,
+            max_connections=args.max_connections,
+            max_inflight=args.max_inflight,
+            max_queue=args.max_queue,
+            queue_timeout=args.queue_timeout,
+            log_level=args.log_level,
+        )
+
+
+async def serve() -> None:
+    """Run the MCP server with a managed browser lifecycle."""
+    if args.prewarm:
+        cpu_pool.start()
+        try:
+            await scraper.start()
+        except Exception as e:
+            logger.error(f"Browser prewarm failed, continuing lazily: {str(e)}")
+
+    monitor = None
+    if args.health_interval > 0:
+        monitor = asyncio.create_task(
+            scraper.monitor(args.health_interval, max_rss_mb=args.max_browser_rss_mb)
+        )
     try:
-        mcp.run()
+        await _run_transport(mcp)
     finally:
-        asyncio.run(scraper.cleanup())
+        if monitor:
+            monitor.cancel()
+        await close_sessions()
+        await scraper.shutdown(args.drain_timeout)
+        await asyncio.to_thread(user_drivers.close)
+        cpu_pool.shutdown()
+
+
+async def serve_supervised() -> None:
+    """Run the MCP server in front of worker processes that each own a browser."""
+    supervisor = Supervisor(
+        args.workers,
+        {
+            "log_level": log_level,
+            "prewarm": args.prewarm,
+            "health_interval": args.health_interval,
+            "max_rss_mb": args.max_browser_rss_mb,
+            "drain_timeout": args.drain_timeout,
+        },
+    )
+    supervisor.start()
+    monitor = asyncio.create_task(supervisor.monitor(metrics_interval=args.health_interval or 60))
+    try:
+        await _run_transport(create_proxy_server(supervisor))
+    finally:
+        monitor.cancel()
+        await asyncio.to_thread(supervisor.stop, args.drain_timeout)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve_supervised() if args.workers > 0 else serve())
+    except KeyboardInterrupt:
+        pass  # cleanup already ran in serve()
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from settings import CACHE_DIR
+
+URL_PATTERN = re.compile(r"https?://\S+|www\.\S+", re.IGNORECASE)
+QUOTED_PATTERN = re.compile(r"\"[^\"]*\"|'[^']*'|“[^”]*”")
+NUMBER_PATTERN = re.compile(r"\b\d+(?:[.,]\d+)*\b")
+
+PLAN_CACHE_FILE = CACHE_DIR / "plan_cache.json"
+
+
+def normalize_query(query: str) -> str:
+    """Reduce a query to its template by masking URLs, quoted strings and numbers."""
+    text = URL_PATTERN.sub("<url>", query)
+    text = QUOTED_PATTERN.sub("<str>", text)
+    text = NUMBER_PATTERN.sub("<num>", text)
+    text = re.sub(r"[?!.,;:]+(\s|$)", r"\1", text.lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _fingerprint(tools: List[str]) -> str:
+    return hashlib.sha1(",".join(sorted(tools)).encode("utf-8")).hexdigest()
+
+
+class PlanCache:
+    def __init__(self, tools: List[str], path: Optional[Path] = PLAN_CACHE_FILE, max_entries: int = 256) -> None:
+        """LRU cache of plans keyed by query template, persisted to ``path``.
+
+        Only plans whose last execution succeeded are reused. The cache is
+        dropped when the set of available ``tools`` changes.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.fingerprint = _fingerprint(tools)
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._entries = self._read()
+
+    def _read(self) -> "OrderedDict[str, Dict[str, Any]]":
+        if not self.path or not self.path.exists():
+            return OrderedDict()
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return OrderedDict()
+        if data.get("tools") != self.fingerprint:
+            return OrderedDict()  # tool set changed, cached plans may reference missing tools
+        return OrderedDict(data.get("entries", []))
+
+    def _save(self, key: str) -> None:
+        """Write the cache, keeping entries other processes saved since we loaded it."""
+        if not self.path:
+            return
+        on_disk = self._read()
+        # keys only other writers know go first (oldest); ours follow in LRU order
+        merged = OrderedDict((k, v) for k, v in on_disk.items() if k not in self._entries)
+        for other, entry in self._entries.items():
+            merged[other] = entry if other == key or other not in on_disk else on_disk[other]
+        while len(merged) > self.max_entries:
+            merged.popitem(last=False)
+        self._entries = merged
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"tools": self.fingerprint, "entries": list(self._entries.items())}, f)
+        os.replace(tmp, self.path)
+
+    def get(self, query: str) -> Optional[List[str]]:
+        """Return the cached plan for the query's template if it last succeeded."""
+        key = normalize_query(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry["ok"]:
+                return None
+            self._entries.move_to_end(key)
+            return list(entry["plan"])
+
+    def record(self, query: str, plan: List[str], success: bool) -> None:
+        """Store ``plan`` for the query's template with its execution outcome."""
+        if not plan:
+            return
+        key = normalize_query(query)
+        with self._lock:
+            entry = self._entries.pop(key, {"plan": plan, "successes": 0, "failures": 0})
+            entry["plan"] = plan
+            entry["ok"] = success
+            entry["successes" if success else "failures"] += 1
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            try:
+                self._save(key)
+            except OSError:
+                pass
+
+
+_shared: Dict[str, PlanCache] = {}
+
+
+def shared_plan_cache(tools: List[str]) -> PlanCache:
+    """The process-wide cache for ``tools``, so every agent records into one instance."""
+    fingerprint = _fingerprint(tools)
+    if fingerprint not in _shared:
+        _shared[fingerprint] = PlanCache(tools)
+    return _shared[fingerprint]
@@ -1,40 +1,89 @@
 import argparse
 import json
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from agent_utils import (
     _collect,
     _extract_plan,
+    _structured,
+    _structured_enabled,
+    AVAILABLE_TOOLS,
     DEFAULT_SYSTEM_PROMPT,
     PLANNER_PROMPT,
+    STRUCTURED_PLANNER_PROMPT,
     logger,
 )
+from fast_planner import fast_plan, stats as fast_plan_stats
+from plan_cache import shared_plan_cache
+from tool_schemas import plan_schema
+
+plan_cache = shared_plan_cache(AVAILABLE_TOOLS)
 
 
 class PlannerAgent:
-    def __init__(self, task: str, model: Optional[str] = None) -> None:
+    def __init__(self, task: str, model: Optional[str] = None, structured: Optional[bool] = None) -> None:
         self.task = task
         self.model = model
+        self.structured = _structured_enabled() if structured is None else structured
+        # Arguments known up front for each step (None: let the executor decide)
+        self.step_args: List[Optional[Dict[str, Any]]] = []
+        # Where the plan came from: "fast", "cache" or "llm"
+        self.source = ""
 
     def run(self) -> List[str]:
-        messages = [
-            {"role": "system", "content": DEFAULT_SYSTEM_PROMPT},
-            {"role": "system", "content": PLANNER_PROMPT},
-            {"role": "user", "content": self.task},
-        ]
-        output = _collect(messages, model=self.model)
-        plan = _extract_plan(output)
+        planned = fast_plan(self.task)
+        logger.info(
+            "fast planner hit rate: %d/%d (%.0f%%)",
+            fast_plan_stats.hits,
+            fast_plan_stats.hits + fast_plan_stats.misses,
+            fast_plan_stats.hit_rate * 100,
+        )
+        if planned is not None:
+            logger.info("fast planner rule %s plan: %s", planned.rule, planned.plan)
+            self.step_args = planned.args
+            self.source = "fast"
+            return planned.plan
+
+        cached = plan_cache.get(self.task)
+        if cached is not None:
+            logger.info("plan cache hit: %s", cached)
+            self.source = "cache"
+            return cached
+
+        if self.structured:
+            messages = [
+                {"role": "system", "content": DEFAULT_SYSTEM_PROMPT},
+                {"role": "system", "content": STRUCTURED_PLANNER_PROMPT},
+                {"role": "user", "content": self.task},
+            ]
+            data = _structured(messages, plan_schema(AVAILABLE_TOOLS), model=self.model)
+            plan = data["plan"] if data else []
+        else:
+            messages = [
+                {"role": "system", "content": DEFAULT_SYSTEM_PROMPT},
+                {"role": "system", "content": PLANNER_PROMPT},
+                {"role": "user", "content": self.task},
+            ]
+            output = _collect(messages, model=self.model)
+            plan = _extract_plan(output)
         logger.info("planner plan: %s", plan)
+        self.source = "llm"
         return plan
 
+    def record_outcome(self, plan: List[str], success: bool) -> None:
+        """Remember an executed LLM or cached plan for queries of the same shape."""
+        if self.source in ("llm", "cache"):
+            plan_cache.record(self.task, plan, success)
+
 
 def main(argv: Optional[List[str]] = None) -> None:
     parser = argparse.ArgumentParser(description="planner component")
     parser.add_argument("--task", required=True, help="task to plan")
     parser.add_argument("--model", default=None, help="ollama model")
+    parser.add_argument("--structured", action="store_true", default=None, help="use JSON-schema constrained output")
     args = parser.parse_args(argv)
 
-    plan = PlannerAgent(args.task, model=args.model).run()
+    plan = PlannerAgent(args.task, model=args.model, structured=args.structured).run()
     print(json.dumps(plan))
 
 
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
 
 SETTINGS_PATH = Path(__file__).with_name("settings.json")
+# Directory for caches that should survive restarts (driver paths, extracted text, ...)
+CACHE_DIR = Path(os.getenv("WEBDOCS_CACHE_DIR", Path.home() / ".cache" / "webdocs-mcp"))
 
 try:
     with SETTINGS_PATH.open("r") as f:
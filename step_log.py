@@ -0,0 +1,63 @@
+import io
+import json
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+import zstandard
+
+
+class StepLogWriter:
+    def __init__(self, path: str) -> None:
+        """JSONL log of one run; ``.zst`` paths are zstd-compressed.
+
+        An existing log at ``path`` is replaced. Every step is flushed as soon
+        as it is written (as its own zstd frame when compressed), so a crash
+        keeps all completed steps readable.
+        """
+        self.path = path
+        self._raw = open(path, "wb")
+        self._zstd: Optional[Any] = None
+        if path.endswith(".zst"):
+            self._zstd = zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+
+    def append(self, step: Dict[str, Any]) -> None:
+        line = (json.dumps(step, separators=(",", ":")) + "\n").encode("utf-8")
+        if self._zstd is not None:
+            self._zstd.write(line)
+            self._zstd.flush(zstandard.FLUSH_FRAME)
+        else:
+            self._raw.write(line)
+        self._raw.flush()
+
+    def close(self) -> None:
+        if self._zstd is not None:
+            self._zstd.close()
+        self._raw.close()
+
+    def __enter__(self) -> "StepLogWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _open_text(path: str) -> TextIO:
+    if path.endswith(".zst"):
+        raw = open(path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def iter_steps(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield logged steps one at a time without loading the whole log.
+
+    Legacy ``.json`` logs (a single JSON list) are still accepted.
+    """
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+        return
+    with _open_text(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,98 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import Iterable, Optional, Set
+
+from ollama import chat
+
+from settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = {
+    "a", "about", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from",
+    "get", "how", "i", "in", "is", "it", "me", "of", "on", "or", "page", "say", "says", "site",
+    "tell", "that", "the", "this", "to", "what", "when", "where", "which", "who", "why", "with",
+    "http", "https", "www", "com",
+}
+# Tools that only read data; skipping them never leaves a requested action undone
+READ_ONLY_TOOLS = {"scrape_website", "extract_links", "read_pdfs"}
+
+DEFAULT_MIN_OVERLAP = 0.6
+DEFAULT_MODEL = "qwen3:1.7b"
+
+SUFFICIENCY_PROMPT = (
+    "Decide whether the tool output below already contains the answer to the question. "
+    "Reply with YES or NO only."
+)
+
+
+def _terms(text: str) -> Set[str]:
+    return {w for w in WORD_PATTERN.findall(text.lower()) if w not in STOPWORDS and len(w) > 1}
+
+
+def lexical_overlap(query: str, output: str) -> float:
+    """Fraction of the query's content words that appear in ``output``."""
+    query_terms = _terms(query)
+    if not query_terms:
+        return 0.0
+    return len(query_terms & _terms(output)) / len(query_terms)
+
+
+@dataclass
+class EarlyExitStats:
+    runs: int = 0
+    exits: int = 0
+    steps_saved: int = 0
+    seconds_saved: float = 0.0
+
+    def record(self, skipped: int, avg_step_seconds: float) -> None:
+        self.runs += 1
+        if skipped:
+            self.exits += 1
+            self.steps_saved += skipped
+            self.seconds_saved += skipped * avg_step_seconds
+
+
+stats = EarlyExitStats()
+
+
+class SufficiencyChecker:
+    def __init__(self, model: Optional[str] = None, min_overlap: Optional[float] = None) -> None:
+        """Decide whether a step output already answers the query.
+
+        A lexical overlap check runs first and rejects most outputs for free;
+        only outputs that pass it are confirmed by a small model.
+        """
+        self.model = model or get_setting("sufficiency_model", DEFAULT_MODEL)
+        if min_overlap is None:
+            min_overlap = float(get_setting("early_exit_min_overlap", DEFAULT_MIN_OVERLAP))
+        self.min_overlap = min_overlap
+
+    def _confirm(self, query: str, output: str) -> bool:
+        messages = [
+            {"role": "system", "content": SUFFICIENCY_PROMPT},
+            {"role": "user", "content": f"Question: {query}\n\nTool output:\n{output}"},
+        ]
+        try:
+            response = chat(model=self.model, messages=messages, tools=[], stream=False)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("sufficiency check failed: %s", exc)
+            return False
+        reply = re.sub(r"<think>.*?</think>", "", response.message.content or "", flags=re.DOTALL)
+        return reply.strip().upper().startswith("YES")
+
+    def sufficient(self, query: str, output: str, remaining: Iterable[str]) -> bool:
+        """Return True if the remaining plan steps can be skipped."""
+        if not set(remaining) <= READ_ONLY_TOOLS:
+            return False
+        overlap = lexical_overlap(query, output)
+        if overlap < self.min_overlap:
+            return False
+        logger.info("lexical overlap %.2f; asking %s whether the answer is complete", overlap, self.model)
+        return self._confirm(query, output)
+
+
+def early_exit_enabled() -> bool:
+    return str(get_setting("early_exit", "false")).lower() == "true"
@@ -1,28 +1,128 @@
 import argparse
 import json
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
 
 from agent_utils import (
     _collect,
+    _complete,
     DEFAULT_SYSTEM_PROMPT,
+    MAP_PROMPT,
+    REDUCE_PROMPT,
+    REDUCE_SUMMARY_PROMPT,
     SUMMARY_PROMPT,
     logger,
 )
+from artifacts import artifact_chars, iter_handles, store_for_log
+from step_log import iter_steps
+
+# Rough size estimate used to keep each chunk inside the model context
+CHARS_PER_TOKEN = 4
+
+
+def _chunk_texts(texts: Iterable[str], max_chars: int) -> List[str]:
+    """Pack ``texts`` into chunks of at most ``max_chars``, splitting long ones."""
+    chunks: List[str] = []
+    current = ""
+    for text in texts:
+        while len(text) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(text[:max_chars])
+            text = text[max_chars:]
+        if current and len(current) + len(text) + 1 > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n{text}" if current else text
+    if current:
+        chunks.append(current)
+    return chunks
 
 
 class SummarizerAgent:
-    def __init__(self, log_file: str, model: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        log_file: str,
+        model: Optional[str] = None,
+        *,
+        query: Optional[str] = None,
+        map_reduce: Optional[bool] = None,
+        parallelism: int = 4,
+        chunk_tokens: int = 2000,
+    ) -> None:
+        """Answer the query from the executor log.
+
+        With ``map_reduce`` every step output is split into chunks of about
+        ``chunk_tokens`` tokens that are summarized ``parallelism`` at a time
+        and then merged. ``None`` enables it only when the outputs would not
+        fit in a single chunk.
+        """
         self.log_file = log_file
         self.model = model
+        self.query = query
+        self.map_reduce = map_reduce
+        self.parallelism = parallelism
+        self.chunk_chars = chunk_tokens * CHARS_PER_TOKEN
+        self.artifacts = store_for_log(log_file)
+
+    def _ask(self, prompt: str, content: str) -> str:
+        payload = {"query": self.query, "content": content} if self.query else {"content": content}
+        messages = [
+            {"role": "system", "content": DEFAULT_SYSTEM_PROMPT},
+            {"role": "system", "content": prompt},
+            {"role": "user", "content": json.dumps(payload)},
+        ]
+        return _complete(messages, model=self.model)
+
+    def _summarize_all(self, prompt: str, chunks: List[str]) -> List[str]:
+        with ThreadPoolExecutor(max_workers=max(self.parallelism, 1)) as pool:
+            notes = list(pool.map(lambda chunk: self._ask(prompt, chunk), chunks))
+        return [n for n in notes if n.strip() and n.strip().upper() != "NONE"]
+
+    def _map_reduce(self) -> List[str]:
+        """Summarize every step output chunk-wise, merging until the notes fit one chunk."""
+        def texts() -> Iterable[str]:
+            for step in iter_steps(self.log_file):
+                yield json.dumps({"tool": step.get("tool"), "result": step.get("result")})
+                # Spilled outputs are streamed from their mapped files rather than loaded whole
+                for handle in iter_handles(step.get("result")):
+                    yield from self.artifacts.iter_text(handle, self.chunk_chars)
+
+        chunks = _chunk_texts(texts(), self.chunk_chars)
+        logger.info("map-reduce summarizing %d chunks", len(chunks))
+        notes = self._summarize_all(MAP_PROMPT, chunks)
+        while sum(len(n) for n in notes) > self.chunk_chars and len(notes) > 1:
+            groups = _chunk_texts(notes, self.chunk_chars)
+            if len(groups) == len(notes):
+                break  # every note already fills a chunk; merging cannot shrink it
+            logger.info("reducing %d notes in %d groups", len(notes), len(groups))
+            notes = self._summarize_all(REDUCE_PROMPT, groups)
+        return notes
 
     def run(self) -> str:
-        with open(self.log_file, "r", encoding="utf-8") as f:
-            steps: List[dict] = json.load(f)
-        last_output = json.dumps(steps[-1]["result"]) if steps else ""
+        # First pass keeps only the last step and the total size in memory
+        last_step = None
+        total_chars = 0
+        for step in iter_steps(self.log_file):
+            last_step = step
+            total_chars += len(json.dumps(step.get("result"))) + artifact_chars(step.get("result"))
+        map_reduce = self.map_reduce
+        if map_reduce is None:
+            map_reduce = total_chars > self.chunk_chars
+
+        if map_reduce and last_step is not None:
+            payload = {"notes": self._map_reduce()}
+            prompt = REDUCE_SUMMARY_PROMPT
+        else:
+            payload = {"last_output": json.dumps(self.artifacts.resolve(last_step["result"])) if last_step else ""}
+            prompt = SUMMARY_PROMPT
+        if self.query:
+            payload = {"query": self.query, **payload}
         messages = [
             {"role": "system", "content": DEFAULT_SYSTEM_PROMPT},
-            {"role": "system", "content": SUMMARY_PROMPT},
-            {"role": "user", "content": json.dumps({"last_output": last_output})},
+            {"role": "system", "content": prompt},
+            {"role": "user", "content": json.dumps(payload)},
         ]
         output = _collect(messages, model=self.model)
         logger.info("summary complete")
@@ -34,9 +134,26 @@ def main(argv: Optional[List[str]] = None) -> None:
     parser = argparse.ArgumentParser(description="summarizer component")
     parser.add_argument("--logs", required=True, help="executor log file")
     parser.add_argument("--model", default=None, help="ollama model")
+    parser.add_argument("--query", default=None, help="original query")
+    parser.add_argument(
+        "--map-reduce",
+        choices=["auto", "on", "off"],
+        default="auto",
+        help="summarize all step outputs in chunks (auto: only when they do not fit one chunk)",
+    )
+    parser.add_argument("--parallel", type=int, default=4, help="chunks summarized concurrently")
+    parser.add_argument("--chunk-tokens", type=int, default=2000, help="approximate tokens per chunk")
     args = parser.parse_args(argv)
 
-    SummarizerAgent(args.logs, model=args.model).run()
+    map_reduce = {"auto": None, "on": True, "off": False}[args.map_reduce]
+    SummarizerAgent(
+        args.logs,
+        model=args.model,
+        query=args.query,
+        map_reduce=map_reduce,
+        parallelism=args.parallel,
+        chunk_tokens=args.chunk_tokens,
+    ).run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,310 @@
+import asyncio
+import bisect
+import functools
+import hashlib
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from mcp.server.fastmcp import FastMCP
+
+logger = logging.getLogger(__name__)
+
+SHARDED_TOOLS = [
+    "open_in_user_browser",
+    "scrape_website",
+    "extract_links",
+    "download_pdfs",
+    "read_pdfs",
+    "react_browser_task",
+]
+# The visible user browser is a single window, so it always lives on worker 0
+PINNED_TOOLS = {"open_in_user_browser": 0}
+METRICS = "__metrics__"
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    def __init__(self, nodes: int, replicas: int = 64) -> None:
+        """Consistent hash ring over worker indexes ``0..nodes-1``."""
+        points = sorted((_hash(f"{node}-{i}"), node) for node in range(nodes) for i in range(replicas))
+        self._keys = [p[0] for p in points]
+        self._nodes = [p[1] for p in points]
+
+    def node_for(self, key: str) -> int:
+        index = bisect.bisect(self._keys, _hash(key)) % len(self._keys)
+        return self._nodes[index]
+
+
+def shard_key(tool: str, kwargs: Dict[str, Any]) -> str:
+    """Key that keeps requests for one host (or one session or file) on the same worker."""
+    if tool == "react_browser_task" and kwargs.get("session_id"):
+        return f"session:{kwargs['session_id']}"
+    for name in ("url", "links", "files"):
+        value = kwargs.get(name)
+        if isinstance(value, list):
+            value = value[0] if value else ""
+        if value:
+            return (urlsplit(value).hostname or value).lower() if name != "files" else value
+    return tool
+
+
+def _worker_main(index: int, requests: Any, results: Any, options: Dict[str, Any]) -> None:
+    # stdout carries the MCP protocol in stdio mode; keep worker output off it
+    sys.stdout = sys.stderr
+    logging.basicConfig(
+        level=options.get("log_level", logging.WARNING),
+        format=f"%(asctime)s - worker{index} - %(name)s - %(levelname)s - %(message)s",
+    )
+    try:
+        asyncio.run(_serve_worker(index, requests, results, options))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _serve_worker(index: int, requests: Any, results: Any, options: Dict[str, Any]) -> None:
+    import tools
+    from tools.open_in_user_browser import user_drivers
+    from tools.react_browser import close_sessions
+    from tools.scheduler import scheduler
+
+    stats = {"served": 0, "errors": 0, "inflight": 0}
+    tasks = set()
+
+    async def handle(req_id: int, name: str, kwargs: Dict[str, Any]) -> None:
+        stats["inflight"] += 1
+        result: Any = {"status": "error", "message": f"{name} was cancelled by worker shutdown", "data": None}
+        try:
+            func = getattr(tools, name)
+            if asyncio.iscoroutinefunction(func):
+                result = await func(**kwargs)
+            else:
+                result = await asyncio.to_thread(func, **kwargs)
+        except Exception as e:  # noqa: BLE001
+            result = {"status": "error", "message": str(e), "data": None}
+        finally:
+            # Always answer, even when cancelled, so the caller is not left waiting
+            if not isinstance(result, dict):
+                result = {"status": "success", "message": "", "data": result}
+            stats["inflight"] -= 1
+            stats["served"] += 1
+            if result.get("status") == "error":
+                stats["errors"] += 1
+            results.put((req_id, result))
+
+    if options.get("prewarm"):
+        tools.cpu_pool.start()
+        try:
+            await tools.scraper.start()
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Browser prewarm failed, continuing lazily: {str(e)}")
+    monitor = None
+    if options.get("health_interval"):
+        monitor = asyncio.create_task(
+            tools.scraper.monitor(options["health_interval"], max_rss_mb=options.get("max_rss_mb", 0))
+        )
+    try:
+        parent = os.getppid()
+        while True:
+            try:
+                item = await asyncio.to_thread(requests.get, True, 1)
+            except queue.Empty:
+                if os.getppid() != parent:
+                    logger.warning("Supervisor exited; stopping worker")
+                    break
+                continue
+            if item is None:
+                break
+            req_id, name, kwargs = item
+            if name == METRICS:
+                results.put((req_id, {
+                    "worker": index,
+                    "pid": os.getpid(),
+                    **stats,
+                    "browser_rss_mb": tools.scraper.browser_rss_mb(),
+                    "scheduler": scheduler.snapshot(),
+                }))
+                continue
+            task = asyncio.create_task(handle(req_id, name, kwargs))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    finally:
+        if monitor:
+            monitor.cancel()
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=options.get("drain_timeout", 30))
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+        await close_sessions()
+        await tools.scraper.shutdown(options.get("drain_timeout", 30))
+        await asyncio.to_thread(user_drivers.close)
+        tools.cpu_pool.shutdown()
+
+
+class Supervisor:
+    def __init__(self, workers: int, options: Optional[Dict[str, Any]] = None) -> None:
+        """Run tools in ``workers`` processes, each with its own browser and CPU pool.
+
+        Calls are routed by consistent hashing on the target host so each
+        worker's browser cache, single-flight registry and host rate limits
+        see all traffic for its hosts. Crashed workers are restarted and the
+        calls they were running fail with an error result.
+        """
+        self.size = max(workers, 1)
+        self.options = options or {}
+        self.ring = HashRing(self.size)
+        self.restarts = 0
+        self._ctx = multiprocessing.get_context("spawn")
+        self._procs: List[Any] = [None] * self.size
+        self._queues: List[Any] = [None] * self.size
+        self._results: List[Any] = [None] * self.size
+        self._pending: Dict[int, Tuple[int, asyncio.Future, asyncio.AbstractEventLoop]] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._stopping = False
+
+    def _spawn(self, index: int) -> None:
+        # Not a daemon: workers start their own CPU pool processes. They exit
+        # on their own if the supervisor dies without stopping them.
+        # Each worker gets fresh queues: a killed process can leave a queue's
+        # internal lock held, which would block every other worker sharing it.
+        requests, results = self._ctx.Queue(), self._ctx.Queue()
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(index, requests, results, self.options),
+            name=f"mcp-worker-{index}",
+        )
+        proc.start()
+        self._procs[index], self._queues[index], self._results[index] = proc, requests, results
+        threading.Thread(
+            target=self._read_results, args=(index, results), name=f"mcp-worker-{index}-results", daemon=True
+        ).start()
+        logger.info(f"Started MCP worker {index} (pid {proc.pid})")
+
+    def start(self) -> None:
+        for index in range(self.size):
+            self._spawn(index)
+
+    def _read_results(self, index: int, results: Any) -> None:
+        while not self._stopping and self._results[index] is results:
+            try:
+                req_id, result = results.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            self._resolve(req_id, result)
+
+    def _resolve(self, req_id: int, result: Dict[str, Any]) -> None:
+        with self._lock:
+            entry = self._pending.pop(req_id, None)
+        if entry is None:
+            return
+        _, future, loop = entry
+        loop.call_soon_threadsafe(lambda: future.done() or future.set_result(result))
+
+    async def _send(self, index: int, name: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        req_id = next(self._ids)
+        with self._lock:
+            self._pending[req_id] = (index, future, loop)
+        self._queues[index].put((req_id, name, kwargs))
+        try:
+            return await future
+        finally:
+            with self._lock:
+                self._pending.pop(req_id, None)
+
+    async def call(self, name: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Run tool ``name`` on the worker that owns its shard."""
+        index = PINNED_TOOLS.get(name)
+        if index is None:
+            index = self.ring.node_for(shard_key(name, kwargs))
+        return await self._send(index, name, kwargs)
+
+    def check_workers(self) -> int:
+        """Restart dead workers and fail their calls; return how many were restarted."""
+        restarted = 0
+        for index, proc in enumerate(self._procs):
+            if self._stopping or proc is None or proc.is_alive():
+                continue
+            logger.warning(f"MCP worker {index} (pid {proc.pid}) exited with {proc.exitcode}; restarting")
+            with self._lock:
+                lost = [rid for rid, (owner, _, _) in self._pending.items() if owner == index]
+            for req_id in lost:
+                self._resolve(req_id, {"status": "error", "message": "worker process crashed", "data": None})
+            self._spawn(index)
+            self.restarts += 1
+            restarted += 1
+        return restarted
+
+    async def metrics(self, timeout: float = 5) -> Dict[str, Any]:
+        """Collect per-worker metrics and their totals."""
+        replies = await asyncio.gather(
+            *(asyncio.wait_for(self._send(i, METRICS, {}), timeout) for i in range(self.size)),
+            return_exceptions=True,
+        )
+        workers = [r for r in replies if isinstance(r, dict)]
+        return {
+            "workers": workers,
+            "responding": len(workers),
+            "restarts": self.restarts,
+            **{key: sum(w[key] for w in workers) for key in ("served", "errors", "inflight")},
+        }
+
+    async def monitor(self, interval: float = 5, metrics_interval: float = 60) -> None:
+        """Restart crashed workers every ``interval`` seconds and log metrics periodically."""
+        last_metrics = time.monotonic()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.check_workers()
+                if metrics_interval and time.monotonic() - last_metrics >= metrics_interval:
+                    last_metrics = time.monotonic()
+                    logger.info(f"MCP worker metrics: {await self.metrics()}")
+            except Exception:
+                # e.g. a respawn failing for lack of memory; keep supervising the other workers
+                logger.exception("MCP worker check failed")
+
+    def stop(self, timeout: float = 30) -> None:
+        self._stopping = True
+        for q in self._queues:
+            if q is not None:
+                q.put(None)
+        for proc in self._procs:
+            if proc is not None:
+                proc.join(timeout)
+                if proc.is_alive():
+                    proc.terminate()
+
+
+def _proxy(supervisor: Supervisor, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(func)
+    async def proxy(**kwargs: Any) -> Dict[str, Any]:
+        return await supervisor.call(name, kwargs)
+
+    return proxy
+
+
+def create_proxy_server(supervisor: Supervisor, name: str = "Web Scraper MCP 🚀") -> FastMCP:
+    """An MCP server exposing the same tools, each forwarded to the supervisor."""
+    import tools
+
+    server = FastMCP(name)
+    for tool in SHARDED_TOOLS:
+        func = getattr(tools, tool)
+        server.add_tool(_proxy(supervisor, tool, func), name=tool, description=func.__doc__)
+    return server
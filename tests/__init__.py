@@ -1,6 +1,11 @@
+import os
 import sys
+import tempfile
 import types
 
+# keep on-disk caches (plans, drivers, pdf text) out of the user's cache dir
+os.environ.setdefault("WEBDOCS_CACHE_DIR", tempfile.mkdtemp(prefix="webdocs-test-"))
+
 # provide dummy mcp package for tests
 sys.modules.setdefault("mcp", types.ModuleType("mcp"))
 sys.modules.setdefault("mcp.server", types.ModuleType("mcp.server"))
@@ -0,0 +1,48 @@
+from artifacts import ArtifactStore, artifact_chars, is_handle
+
+
+def test_spill_and_resolve_round_trip(tmp_path):
+    store = ArtifactStore(str(tmp_path), threshold=10)
+    text = "héllo wörld " * 50
+    value = {"status": "success", "data": {"text": text, "title": "short"}}
+    spilled = store.spill(value)
+    handle = spilled["data"]["text"]
+    assert is_handle(handle)
+    assert handle["chars"] == len(text)
+    assert spilled["data"]["title"] == "short"
+    assert artifact_chars(spilled) == len(text)
+    assert store.resolve(spilled) == value
+    # content addressed: the same text is stored once
+    assert store.put(text) == handle
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_iter_text_keeps_multibyte_characters_whole(tmp_path):
+    store = ArtifactStore(str(tmp_path), threshold=0)
+    text = "ä€𝄞" * 100
+    handle = store.put(text)
+    pieces = list(store.iter_text(handle, 7))
+    assert "".join(pieces) == text
+    assert len(pieces) > 1
+
+
+def test_concurrent_puts_of_the_same_text(tmp_path, monkeypatch):
+    import os
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    store = ArtifactStore(str(tmp_path), threshold=0)
+    text = "shared " * 1000
+    both_written = threading.Barrier(2, timeout=5)
+    replace = os.replace
+
+    def replace_together(src, dst):
+        both_written.wait()  # neither writer renames until both have written their temp file
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", replace_together)
+    with ThreadPoolExecutor(2) as pool:
+        handles = list(pool.map(lambda _: store.put(text), range(2)))
+    assert handles[0] == handles[1]
+    assert [p.name for p in tmp_path.iterdir()] == [f"{handles[0]['artifact']}.txt"]
+    assert store.read(handles[0]) == text
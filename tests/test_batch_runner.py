@@ -0,0 +1,35 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+from batch_runner import run_batch
+from tool_loop import run_async
+
+
+def _fake_run(query_id, query, scratch_root=None):
+    status = "error" if query == "bad" else "success"
+    return {"id": query_id, "query": query, "status": status, "timings": {"total": 0.0}}
+
+
+def test_batch_resumes_and_retries_failures(tmp_path):
+    queries = tmp_path / "queries.jsonl"
+    queries.write_text('{"id": "a", "query": "one"}\n"bad"\n{"query": "three"}\n')
+    output = tmp_path / "results.jsonl"
+    output.write_text('{"id": "a", "status": "success"}\n{"id": "3", "sta')
+
+    with patch("batch_runner.run_query", side_effect=_fake_run) as run:
+        assert run_batch(str(queries), str(output), concurrency=2) == 2
+    assert sorted(c.args[0] for c in run.call_args_list) == ["2", "3"]
+
+    with patch("batch_runner.run_query", side_effect=_fake_run) as run:
+        assert run_batch(str(queries), str(output)) == 1
+    assert run.call_args.args[:2] == ("2", "bad")
+    records = [json.loads(line) for line in output.read_text().splitlines()[2:]]
+    assert len(records) == 3
+
+
+def test_run_async_reuses_one_loop():
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    assert run_async(current_loop()) is run_async(current_loop())
@@ -0,0 +1,29 @@
+import asyncio
+import os
+
+from tools.cpu_pool import CpuPool
+
+
+def _double(value):
+    return value * 2
+
+
+def test_small_inputs_run_inline():
+    pool = CpuPool(workers=2, inline_threshold=100)
+    assert asyncio.run(pool.run(_double, 21, size=10)) == 42
+    assert pool._executor is None
+
+
+def test_disabled_pool_runs_inline():
+    pool = CpuPool(workers=0, inline_threshold=0)
+    assert asyncio.run(pool.run(_double, "a", size=10_000)) == "aa"
+    assert pool._executor is None
+
+
+def test_large_inputs_run_in_a_worker():
+    pool = CpuPool(workers=1, inline_threshold=0)
+    try:
+        assert asyncio.run(pool.run(os.getpid, size=1)) != os.getpid()
+        assert asyncio.run(pool.run(_double, 21, size=1)) == 42
+    finally:
+        pool.shutdown()
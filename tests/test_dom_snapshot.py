@@ -0,0 +1,38 @@
+from tools.dom_snapshot import format_snapshot, resolve_target
+
+
+SNAPSHOT = {
+    "title": "Shop",
+    "url": "https://example.com/",
+    "elements": [
+        {"id": "e1", "tag": "a", "type": "", "text": "Next page", "href": "/page/2"},
+        {"id": "e2", "tag": "input", "type": "search", "text": "Search", "href": ""},
+    ],
+    "outline": [
+        {"level": 1, "text": "Products"},
+        {"level": 0, "text": "Fresh coffee beans from local roasters."},
+        {"level": 0, "text": "Fresh coffee beans from local roasters."},
+    ],
+}
+
+
+def test_format_snapshot_lists_elements_and_outline():
+    text = format_snapshot(SNAPSHOT)
+    assert '[e1] a "Next page" -> /page/2' in text
+    assert '[e2] input:search "Search"' in text
+    assert "# Products" in text
+    assert text.count("Fresh coffee beans") == 1
+
+
+def test_format_snapshot_respects_budget():
+    snapshot = dict(SNAPSHOT, outline=[{"level": 0, "text": f"{i} " + "word " * 50} for i in range(100)])
+    text = format_snapshot(snapshot, budget_tokens=200)
+    assert len(text) <= 200 * 4 + len("... (truncated)") + 1
+    assert text.endswith("... (truncated)")
+
+
+def test_resolve_target():
+    assert resolve_target("e12") == '[data-wd-id="e12"]'
+    assert resolve_target("[e3]") == '[data-wd-id="e3"]'
+    assert resolve_target("button.next") == "button.next"
+    assert resolve_target("[name=q]") == "[name=q]"
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+
+import pytest
+
+from tools.driver_pool import DriverPool
+
+
+class _FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_drivers_are_reused_and_quit_on_close():
+    pool = DriverPool(_FakeDriver, max_size=1, idle_timeout=0)
+    with pool.driver() as first:
+        pass
+    with pool.driver() as second:
+        pass
+    assert first is second
+    assert pool.size == 1
+    pool.close()
+    assert first.quit_called
+    assert pool.size == 0
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_max_size_blocks_until_release():
+    pool = DriverPool(_FakeDriver, max_size=1, idle_timeout=0)
+    held = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+    threading.Timer(0.05, pool.release, args=(held,)).start()
+    assert pool.acquire(timeout=2) is held
+    pool.close()
+
+
+def test_reap_and_clear_quit_drivers():
+    pool = DriverPool(_FakeDriver, max_size=2, idle_timeout=0)
+    idle = pool.acquire()
+    busy = pool.acquire()
+    pool.release(idle)
+    assert pool.reap_idle() == 1
+    assert idle.quit_called
+    pool.clear()
+    pool.release(busy)
+    assert busy.quit_called
+    assert pool.size == 0
+
+
+def test_cancelled_lease_returns_its_driver():
+    pool = DriverPool(_FakeDriver, max_size=1, idle_timeout=0)
+    held = pool.acquire()
+
+    async def scenario():
+        async def waiter():
+            async with pool.lease(timeout=2):
+                pass
+
+        task = asyncio.create_task(waiter())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # the waiting thread gets the driver after the caller is gone
+        await asyncio.to_thread(pool.release, held)
+        async with pool.lease(timeout=2) as driver:
+            return driver
+
+    assert asyncio.run(scenario()) is held
+    assert pool.size == 1
+    pool.close()
+
+
+def test_probe_idle_quits_dead_drivers():
+    class _DeadDriver(_FakeDriver):
+        def execute_script(self, script):
+            raise ConnectionRefusedError("chromedriver is gone")
+
+    drivers = iter([_DeadDriver(), _FakeDriver()])
+    pool = DriverPool(lambda: next(drivers), max_size=2, idle_timeout=0)
+    dead, alive = pool.acquire(), pool.acquire()
+    alive.execute_script = lambda script: 1
+    pool.release(dead)
+    pool.release(alive)
+    assert pool.probe_idle() == 1
+    assert dead.quit_called and not alive.quit_called
+    assert pool.size == 1
+    assert pool.acquire() is alive
+    pool.close()
@@ -1,6 +1,7 @@
 import json
 from unittest.mock import patch
 from executor import ExecutorAgent
+from step_log import iter_steps
 
 
 def test_executor_run(tmp_path):
@@ -10,6 +11,52 @@ def test_executor_run(tmp_path):
         with patch("executor._invoke_tool", return_value=fake_result):
             agent = ExecutorAgent(plan, "query", str(tmp_path))
             log_file = agent.run()
-    with open(log_file) as f:
-        data = json.load(f)
+    data = list(iter_steps(log_file))
     assert data[0]["result"] == fake_result
+
+
+def test_executor_early_exit(tmp_path):
+    plan = ["scrape_website", "extract_links", "scrape_website"]
+    result = {"status": "success", "data": "The rate limit is 100 requests per minute."}
+    with patch("executor._invoke_tool", return_value=result) as invoke:
+        with patch("sufficiency.SufficiencyChecker._confirm", return_value=True) as confirm:
+            agent = ExecutorAgent(
+                plan, "rate limit requests", str(tmp_path), step_args=[{}, {}, {}], early_exit=True
+            )
+            log_file = agent.run()
+    assert invoke.call_count == 1
+    assert confirm.call_count == 1
+    assert agent.skipped == ["extract_links", "scrape_website"]
+    assert len(list(iter_steps(log_file))) == 1
+
+
+def test_lexical_gate_and_side_effects_skip_model():
+    from sufficiency import SufficiencyChecker
+
+    checker = SufficiencyChecker(min_overlap=0.6)
+    with patch.object(SufficiencyChecker, "_confirm", return_value=True) as confirm:
+        assert not checker.sufficient("rate limit requests", "nothing relevant", ["scrape_website"])
+        assert not checker.sufficient("rate limit requests", "rate limit requests", ["download_pdfs"])
+    confirm.assert_not_called()
+
+
+def test_executor_passes_full_output_to_next_step(tmp_path):
+    plan = ["open_in_user_browser", "scrape_website"]
+    page = "<html>" + "x" * 20000 + "</html>"
+    results = [{"status": "success", "data": {"page_source": page}}, {"status": "success", "data": "ok"}]
+    step_args = [{}, {"url": "https://example.com", "query": "<FULL_TOOL_OUTPUT>"}]
+    with patch("executor._invoke_tool", side_effect=results) as invoke:
+        agent = ExecutorAgent(plan, "query", str(tmp_path), step_args=step_args)
+        log_file = agent.run()
+    assert invoke.call_args_list[1][0][1]["query"] == json.dumps({"page_source": page})
+    first = list(iter_steps(log_file))[0]["result"]["data"]["page_source"]
+    assert first["chars"] == len(page) and len(first["preview"]) < len(page)
+
+
+def test_executor_passes_priority_to_fetching_tools(tmp_path):
+    plan = ["scrape_website", "open_in_user_browser"]
+    step_args = [{"url": "https://example.com", "query": "q"}, {"url": "https://example.com"}]
+    with patch("executor._invoke_tool", return_value={"status": "success", "data": "ok"}) as invoke:
+        ExecutorAgent(plan, "query", str(tmp_path), step_args=step_args, priority="batch").run()
+    assert invoke.call_args_list[0][0][1]["priority"] == "batch"
+    assert "priority" not in invoke.call_args_list[1][0][1]
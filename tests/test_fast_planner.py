@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+from fast_planner import fast_plan
+from planner import PlannerAgent
+
+
+def test_url_question():
+    planned = fast_plan("What does https://example.com/docs say about rate limits?")
+    assert planned.plan == ["scrape_website"]
+    assert planned.args == [{"url": "https://example.com/docs", "query": "rate limits"}]
+
+
+def test_download_pdfs_from_page():
+    planned = fast_plan("download pdfs from https://example.com/reports")
+    assert planned.plan == ["extract_links", "download_pdfs"]
+    assert planned.args == [{"url": "https://example.com/reports", "file_types": ["pdf"]}, None]
+
+
+def test_links_on_page():
+    planned = fast_plan("list all links on https://example.com.")
+    assert planned.plan == ["extract_links"]
+    assert planned.args == [{"url": "https://example.com"}]
+
+
+def test_falls_back_without_single_url():
+    assert fast_plan("what is python") is None
+    assert fast_plan("compare https://a.example and https://b.example") is None
+    assert fast_plan("what does https://example.com say about x", min_confidence=0.99) is None
+
+
+def test_planner_skips_llm_on_fast_path():
+    with patch("planner._collect") as collect:
+        planner = PlannerAgent("links on https://example.com")
+        plan = planner.run()
+    collect.assert_not_called()
+    assert plan == ["extract_links"]
+    assert planner.step_args == [{"url": "https://example.com"}]
+
+
+def test_rules_only_match_imperative_phrasings():
+    planned = fast_plan("what does https://example.com/blog say about URL shorteners?")
+    assert planned.plan == ["scrape_website"]
+    assert planned.args[0]["query"] == "URL shorteners"
+    assert fast_plan("open https://example.com in my browser").plan == ["open_in_user_browser"]
+    assert fast_plan("download https://example.com/report.pdf").plan == ["download_pdfs"]
+    # none of these are explained by a rule, so they go to the LLM planner
+    assert fast_plan("how do I open chrome devtools according to https://developer.chrome.com/docs") is None
+    assert fast_plan("fill in the contact form on https://example.com and submit it") is None
+    assert fast_plan("get the revenue figure from https://example.com/report.pdf") is None
+    assert fast_plan("list the links on https://example.com and download the newest one") is None
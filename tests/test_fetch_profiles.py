@@ -0,0 +1,80 @@
+import asyncio
+
+from tools.fetch_profiles import FetchProfiles
+from tools.webscraper import WebScraper, _static_text
+
+URL = "https://www.example.com/page"
+
+
+def test_cheapest_working_strategy_is_chosen(tmp_path):
+    profiles = FetchProfiles(tmp_path / "profiles.json", explore_every=0)
+    assert profiles.plan(URL) == ["static", "light", "full"]
+    profiles.record(URL, "static", False, 0.2)
+    profiles.record(URL, "light", True, 1.5, 3000)
+    assert profiles.plan(URL) == ["light", "full"]
+    # a strategy that returns far less text than the best one no longer counts as working
+    profiles.record(URL, "static", True, 0.2, 400)
+    profiles.record(URL, "static", True, 0.2, 400)
+    profiles.record(URL, "static", True, 0.2, 400)
+    assert profiles.plan("https://www.example.com/other")[0] == "light"
+    profiles.record(URL, "static", True, 0.2, 2900)
+    profiles.record(URL, "static", True, 0.2, 2900)
+    assert profiles.plan(URL)[0] == "static"
+
+
+def test_profiles_persist_and_reexplore(tmp_path):
+    path = tmp_path / "profiles.json"
+    profiles = FetchProfiles(path, explore_every=3)
+    profiles.record(URL, "static", True, 0.1, 1000)
+    profiles.finished(URL)
+    # second visit tries the stalest other strategy first
+    assert profiles.plan(URL) == ["light", "static", "full"]
+    profiles.save()
+
+    reloaded = FetchProfiles(path, explore_every=3)
+    assert reloaded.snapshot(URL)["static"]["chars"] == 1000
+    reloaded.finished(URL)
+    assert reloaded.plan(URL) == ["static", "light", "full"]
+    reloaded.finished(URL)
+    assert reloaded.plan(URL)[0] == "light"
+
+
+def test_scraper_escalates_on_thin_pages(tmp_path, monkeypatch):
+    profiles = FetchProfiles(tmp_path / "profiles.json", explore_every=0)
+    monkeypatch.setattr("tools.webscraper.fetch_profiles", profiles)
+    scraper = WebScraper()
+    tried = []
+
+    async def fake_fetch_with(strategy, url, timeout, extract):
+        tried.append(strategy)
+        if strategy == "static":
+            return "Please enable JavaScript"
+        return "article text " * 50
+
+    scraper._fetch_with = fake_fetch_with
+    text = asyncio.run(scraper._fetch_content(URL, 10, "full"))
+    assert text.startswith("article text")
+    assert tried == ["static", "light"]
+    assert profiles.plan(URL) == ["light", "full"]
+
+
+def test_main_content_is_never_fetched_statically(tmp_path, monkeypatch):
+    profiles = FetchProfiles(tmp_path / "profiles.json", explore_every=0)
+    for _ in range(3):
+        profiles.record(URL, "static", True, 0.1, 5000)
+    monkeypatch.setattr("tools.webscraper.fetch_profiles", profiles)
+    scraper = WebScraper()
+    tried = []
+
+    async def fake_fetch_with(strategy, url, timeout, extract):
+        tried.append(strategy)
+        return "article text " * 50
+
+    scraper._fetch_with = fake_fetch_with
+    asyncio.run(scraper._fetch_content(URL, 10, "main"))
+    assert tried == ["light"]
+
+
+def test_static_text_ignores_noscript_notices():
+    html = "<body><noscript>Please enable JavaScript to use this app.</noscript><div id=root></div></body>"
+    assert _static_text(html) == ""
@@ -0,0 +1,38 @@
+import asyncio
+
+from http_transport import RequestLimiter
+
+
+def test_limiter_queues_then_rejects_with_503():
+    release = asyncio.Event()
+    handled = []
+
+    async def app(scope, receive, send):
+        handled.append(scope["path"])
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    limiter = RequestLimiter(app, max_inflight=1, max_queue=1, queue_timeout=5)
+
+    async def request(path, method="POST"):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await limiter({"type": "http", "method": method, "path": path}, None, send)
+        return sent[0]["status"]
+
+    async def main():
+        first = asyncio.create_task(request("/a"))
+        queued = asyncio.create_task(request("/b"))
+        await asyncio.sleep(0)
+        assert await request("/c") == 503
+        stream = asyncio.create_task(request("/events", method="GET"))
+        await asyncio.sleep(0)
+        assert limiter.stats() == {"inflight": 1, "waiting": 1, "rejected": 1}
+        release.set()
+        return await asyncio.gather(first, queued, stream)
+
+    assert asyncio.run(main()) == [200, 200, 200]
+    assert handled == ["/a", "/events", "/b"]
@@ -1,8 +1,8 @@
-import json
 from unittest.mock import patch
 
 from planner import PlannerAgent
 from executor import ExecutorAgent
+from step_log import iter_steps
 from summarizer import SummarizerAgent
 
 
@@ -18,6 +18,5 @@ def test_full_flow(tmp_path):
         log_file = ExecutorAgent(plan, "test", str(tmp_path)).run()
         result = SummarizerAgent(log_file).run()
     assert result == "summary"
-    with open(log_file) as f:
-        steps = json.load(f)
+    steps = list(iter_steps(log_file))
     assert steps[0]["tool"] == "scrape_website"
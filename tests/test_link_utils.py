@@ -0,0 +1,53 @@
+from tools.link_utils import clean_links, normalize_url
+
+
+def test_normalize_url_strips_noise():
+    url = "HTTPS://Example.COM:443/Docs/?utm_source=x&b=2&a=1#section"
+    assert normalize_url(url) == "https://example.com/Docs?a=1&b=2"
+
+
+def test_normalize_url_resolves_relative():
+    assert normalize_url("../a/", "https://example.com/x/y/") == "https://example.com/x/a"
+
+
+def test_normalize_url_keeps_ipv6_brackets():
+    assert normalize_url("http://[::1]:8080/a/") == "http://[::1]:8080/a"
+    assert normalize_url("https://[2001:DB8::1]:443/") == "https://[2001:db8::1]/"
+
+
+def test_clean_links_skips_malformed_urls():
+    links = [
+        {"url": "http://example.com:abc/x", "text": "Bad port"},
+        {"url": "http://[::1/x", "text": "Bad host"},
+        {"url": "/ok", "text": "Fine"},
+    ]
+    assert clean_links(links, "https://example.com/") == [{"url": "https://example.com/ok", "text": "Fine"}]
+
+
+def test_clean_links_dedupes_and_filters():
+    links = [
+        {"url": "https://example.com/report.pdf", "text": "https://example.com/report.pdf"},
+        {"url": "https://example.com/report.pdf#page=2", "text": "Annual report"},
+        {"url": "https://other.org/report.pdf", "text": "Other report"},
+        {"url": "https://docs.example.com/guide", "text": "Guide"},
+        {"url": "mailto:team@example.com", "text": "Mail"},
+    ]
+    result = clean_links(links, "https://www.example.com/", same_domain=True, file_types=["pdf"])
+    assert result == [{"url": "https://example.com/report.pdf", "text": "Annual report"}]
+
+    result = clean_links(links, "https://example.com/")
+    assert [link["url"] for link in result] == [
+        "https://example.com/report.pdf",
+        "https://other.org/report.pdf",
+        "https://docs.example.com/guide",
+    ]
+
+
+def test_clean_links_ranks_by_query():
+    links = [
+        {"url": "https://example.com/about", "text": "About us"},
+        {"url": "https://example.com/pricing", "text": "Pricing plans"},
+        {"url": "https://example.com/blog", "text": "Blog"},
+    ]
+    result = clean_links(links, "https://example.com/", query="pricing plan", top_n=1)
+    assert result == [{"url": "https://example.com/pricing", "text": "Pricing plans"}]
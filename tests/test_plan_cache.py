@@ -0,0 +1,53 @@
+from plan_cache import PlanCache, normalize_query, shared_plan_cache
+
+
+def test_normalize_query_masks_variable_parts():
+    a = normalize_query('Find "pricing" on https://a.example/x in 2024?')
+    b = normalize_query("find 'plans' on http://b.example in 1999")
+    assert a == b == "find <str> on <url> in <num>"
+
+
+def test_reuses_successful_plans_only(tmp_path):
+    cache = PlanCache(["scrape_website"], path=tmp_path / "plans.json")
+    cache.record("summarize https://a.example", ["scrape_website"], success=False)
+    assert cache.get("summarize https://b.example") is None
+    cache.record("summarize https://a.example", ["scrape_website"], success=True)
+    assert cache.get("summarize https://b.example") == ["scrape_website"]
+
+    reloaded = PlanCache(["scrape_website"], path=tmp_path / "plans.json")
+    assert reloaded.get("summarize https://c.example") == ["scrape_website"]
+    changed = PlanCache(["scrape_website", "read_pdfs"], path=tmp_path / "plans.json")
+    assert changed.get("summarize https://c.example") is None
+
+
+def test_lru_eviction():
+    cache = PlanCache(["t"], path=None, max_entries=2)
+    cache.record("one", ["t"], True)
+    cache.record("two", ["t"], True)
+    cache.get("one")
+    cache.record("three", ["t"], True)
+    assert cache.get("two") is None
+    assert cache.get("one") == ["t"]
+
+
+def test_writers_sharing_a_file_keep_each_others_plans(tmp_path):
+    path = tmp_path / "plans.json"
+    planner, streaming = PlanCache(["t"], path=path), PlanCache(["t"], path=path)
+    planner.record("summarize https://a.example", ["t"], True)
+    streaming.record("list links on https://a.example", ["t"], True)
+    reloaded = PlanCache(["t"], path=path)
+    assert reloaded.get("summarize https://b.example") == ["t"]
+    assert reloaded.get("list links on https://b.example") == ["t"]
+    assert shared_plan_cache(["t"]) is shared_plan_cache(["t"])
+
+
+def test_lru_eviction_with_a_file(tmp_path):
+    cache = PlanCache(["t"], path=tmp_path / "plans.json", max_entries=2)
+    cache.record("one", ["t"], True)
+    cache.record("two", ["t"], True)
+    cache.get("one")
+    cache.record("three", ["t"], True)
+    assert cache.get("two") is None
+    assert cache.get("one") == ["t"]
+    reloaded = PlanCache(["t"], path=tmp_path / "plans.json", max_entries=2)
+    assert reloaded.get("two") is None and reloaded.get("three") == ["t"]
@@ -0,0 +1,50 @@
+import asyncio
+import importlib
+from unittest.mock import patch
+
+react = importlib.import_module("tools.react_browser")
+
+
+class _Session(react.BrowserSession):
+    closed = False
+
+    def alive(self):
+        return True
+
+    async def close(self):
+        self.closed = True
+
+
+async def _fake_open():
+    await asyncio.sleep(0.01)
+    return _Session(context=None, page=None)
+
+
+def test_busy_sessions_are_not_expired():
+    async def scenario():
+        react._sessions.clear()
+        busy = await react._get_session("busy")
+        busy.last_used -= react.SESSION_TTL + 1
+        idle = await react._get_session("idle")
+        react._put_session(idle)
+        idle.last_used -= react.SESSION_TTL + 1
+        await react._expire_sessions()
+        assert list(react._sessions) == ["busy"]
+        assert idle.closed and not busy.closed
+        react._put_session(busy)
+
+    with patch.object(react, "_open_session", _fake_open):
+        asyncio.run(scenario())
+    react._sessions.clear()
+
+
+def test_concurrent_creation_keeps_one_session():
+    async def scenario():
+        react._sessions.clear()
+        first, second = await asyncio.gather(react._get_session("s"), react._get_session("s"))
+        assert first is second and first.users == 2
+        assert len(react._sessions) == 1
+
+    with patch.object(react, "_open_session", _fake_open):
+        asyncio.run(scenario())
+    react._sessions.clear()
@@ -0,0 +1,56 @@
+import asyncio
+import importlib
+
+from tools.read_pdfs import read_pdfs
+
+read_pdfs_module = importlib.import_module("tools.read_pdfs")
+
+
+def _write_pdf(path, lines):
+    """Write a minimal one-page-per-line PDF."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(len(lines)))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(lines)} >>")
+    font_id = 3 + 2 * len(lines)
+    for i, line in enumerate(lines):
+        stream = f"BT /F1 12 Tf 72 720 Td ({line}) Tj ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(out)
+
+
+def test_read_pdfs_extracts_and_caches(tmp_path, monkeypatch):
+    monkeypatch.setattr(read_pdfs_module, "PDF_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(read_pdfs_module, "PDF_PAGES_PER_TASK", 1)
+    pdf = tmp_path / "report.pdf"
+    _write_pdf(pdf, ["First page", "Second page", "Third page"])
+
+    result = asyncio.run(read_pdfs([str(pdf)]))
+    document = result["data"]["documents"][0]
+    assert result["status"] == "success"
+    assert document["pages"] == 3
+    assert not document["cached"]
+    assert document["content"].split("\n") == ["First page", "Second page", "Third page"]
+
+    again = asyncio.run(read_pdfs([str(pdf)]))["data"]["documents"][0]
+    assert again["cached"]
+    assert again["content"] == document["content"]
+
+
+def test_read_pdfs_missing_file(tmp_path):
+    result = asyncio.run(read_pdfs([str(tmp_path / "missing.pdf")]))
+    assert result["status"] == "error"
@@ -0,0 +1,39 @@
+import asyncio
+
+from tools.readability import format_article
+from tools.webscraper import WebScraper
+
+
+def test_format_article_marks_headings_and_items():
+    article = {
+        "title": "T",
+        "blocks": [
+            {"level": 1, "item": False, "text": "Guide"},
+            {"level": 0, "item": False, "text": "Intro text."},
+            {"level": 2, "item": False, "text": "Steps"},
+            {"level": 0, "item": True, "text": "First"},
+        ],
+        "body": None,
+    }
+    assert format_article(article) == "# Guide\nIntro text.\n## Steps\n- First"
+    assert format_article({"title": "T", "blocks": [], "body": "all text"}) == "all text"
+
+
+def test_extract_modes_are_fetched_separately():
+    scraper = WebScraper()
+    calls = []
+
+    async def fake_fetch(url, timeout, extract="full"):
+        calls.append(extract)
+        return extract
+
+    scraper._fetch_content = fake_fetch
+
+    async def main():
+        return await asyncio.gather(
+            scraper.fetch_content("https://example.com"),
+            scraper.fetch_content("https://example.com", extract="full"),
+        )
+
+    assert asyncio.run(main()) == ["main", "full"]
+    assert sorted(calls) == ["full", "main"]
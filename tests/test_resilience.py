@@ -0,0 +1,179 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NameResolutionError
+
+from tools import resilience
+from tools.resilience import call_with_retries, call_with_retries_sync, CircuitBreaker, CircuitOpenError
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+def test_transient_errors_are_retried():
+    attempts = []
+
+    async def flaky(remaining):
+        attempts.append(remaining)
+        if len(attempts) < 3:
+            raise requests.ConnectionError("reset")
+        return "ok"
+
+    with patch.object(resilience, "breaker", CircuitBreaker()), patch.object(resilience, "_backoff", return_value=0):
+        assert asyncio.run(call_with_retries("https://a.test/x", flaky, timeout=5, retries=3)) == "ok"
+    assert len(attempts) == 3
+
+
+def test_permanent_errors_fail_fast():
+    calls = []
+
+    def missing(remaining):
+        calls.append(1)
+        raise _http_error(404)
+
+    with patch.object(resilience, "breaker", CircuitBreaker()):
+        with pytest.raises(requests.HTTPError):
+            call_with_retries_sync("https://a.test/x", missing, retries=3)
+    assert calls == [1]
+
+
+def test_deadline_cancels_the_attempt():
+    cancelled = []
+
+    async def hang(remaining):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    with patch.object(resilience, "breaker", CircuitBreaker()):
+        with pytest.raises(TimeoutError):
+            asyncio.run(call_with_retries("https://a.test/x", hang, timeout=0.05))
+    assert cancelled == [1]
+
+
+def test_circuit_opens_and_half_opens():
+    breaker = CircuitBreaker(threshold=2, cooldown=0)
+    calls = []
+
+    def down(remaining):
+        calls.append(1)
+        raise requests.ConnectionError("refused")
+
+    with patch.object(resilience, "breaker", breaker), patch.object(resilience, "_backoff", return_value=0):
+        with pytest.raises(requests.ConnectionError):
+            call_with_retries_sync("https://down.test/a", down, retries=5)
+        assert calls == [1, 1]
+        breaker.cooldown = 60
+        with pytest.raises(CircuitOpenError, match="refused"):
+            call_with_retries_sync("https://down.test/b", down)
+        assert calls == [1, 1]
+        breaker.cooldown = 0
+        assert call_with_retries_sync("https://down.test/c", lambda remaining: "up") == "up"
+        assert not breaker.is_open("https://down.test/")
+
+
+def test_transient_classification_ignores_the_url():
+    from tools.resilience import is_transient
+
+    wrapped = Exception("Error fetching content from https://a.test/timeout-settings: 404 page")
+    assert not is_transient(wrapped)
+    reset = Exception("Page.goto: net::ERR_CONNECTION_RESET at https://a.test/")
+    assert is_transient(reset)
+    assert not is_transient(Exception("Page.goto: net::ERR_NAME_NOT_RESOLVED at https://timeout.test/"))
+    unresolved = MaxRetryError(None, "/", NameResolutionError("a.test", None, "Name or service not known"))
+    assert not is_transient(requests.ConnectionError(unresolved))
+    assert is_transient(requests.ConnectionError(MaxRetryError(None, "/", ConnectionResetError())))
+
+
+def test_deadline_during_driver_acquire_keeps_the_pool_usable():
+    from tools.driver_pool import DriverPool
+
+    class _Driver:
+        def quit(self):
+            pass
+
+    pool = DriverPool(_Driver, max_size=1, idle_timeout=0)
+
+    async def scenario():
+        async def attempt(remaining):
+            async with pool.lease(timeout=5):
+                await asyncio.sleep(remaining + 1)
+
+        held = await asyncio.to_thread(pool.acquire)
+        for _ in range(2):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(attempt(0.05), 0.05)
+        await asyncio.to_thread(pool.release, held)
+        async with pool.lease(timeout=2):
+            pass
+
+    asyncio.run(scenario())
+    assert pool.size == 1
+    pool.close()
+
+
+def test_queue_waits_never_open_the_circuit(monkeypatch):
+    import importlib
+    import time
+
+    from tools.scheduler import Scheduler
+
+    extract_links = importlib.import_module("tools.extract_links")
+    breaker = CircuitBreaker(threshold=2)
+
+    def slow_get(url, timeout):
+        time.sleep(0.1)
+        return "<html></html>"
+
+    monkeypatch.setattr(resilience, "breaker", breaker)
+    monkeypatch.setattr(resilience, "TIMEOUT", 0.3)
+    monkeypatch.setattr(extract_links, "scheduler", Scheduler(max_concurrency=1, host_rate=0))
+    monkeypatch.setattr(extract_links, "_get", slow_get)
+
+    async def main():
+        # served one at a time, the last call queues far longer than the page-load deadline
+        return await asyncio.gather(*(extract_links._download("https://queued.test/", "batch") for _ in range(8)))
+
+    assert asyncio.run(main()) == ["<html></html>"] * 8
+    assert not breaker.is_open("https://queued.test/")
+
+
+def test_user_browser_bounds_and_retries_page_loads(monkeypatch):
+    import importlib
+
+    from selenium.common.exceptions import TimeoutException
+    from tools.driver_pool import DriverPool
+
+    user_browser = importlib.import_module("tools.open_in_user_browser")
+    loads = []
+
+    class _Driver:
+        page_source = "<html></html>"
+
+        def set_page_load_timeout(self, timeout):
+            self.timeout = timeout
+
+        def get(self, url):
+            loads.append(self.timeout)
+            if len(loads) == 1:
+                raise TimeoutException("page load hung")
+
+        def quit(self):
+            pass
+
+    pool = DriverPool(_Driver, max_size=1, idle_timeout=0)
+    monkeypatch.setattr(user_browser, "user_drivers", pool)
+    monkeypatch.setattr(resilience, "breaker", CircuitBreaker())
+    monkeypatch.setattr(resilience, "_backoff", lambda attempt: 0)
+
+    result = asyncio.run(user_browser.open_in_user_browser("https://hung.test/"))
+    pool.close()
+    assert result["status"] == "success"
+    assert len(loads) == 2 and all(0 < t <= resilience.TIMEOUT for t in loads)
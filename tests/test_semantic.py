@@ -0,0 +1,56 @@
+import asyncio
+import sys
+from unittest.mock import patch
+
+import numpy as np
+
+from tools.semantic import EmbeddingCache, HashingEmbedder, rank_passages, top_k
+
+
+def test_top_k():
+    assert list(top_k(np.array([0.1, 0.9, 0.5, 0.7]), 2)) == [1, 3]
+    assert list(top_k(np.array([0.3]), 5)) == [0]
+
+
+def test_cache_embeds_each_passage_once():
+    calls = []
+    hashing = HashingEmbedder(64)
+
+    def embedder(texts):
+        calls.append(list(texts))
+        return hashing(texts)
+
+    embedder.name = "test"
+    cache = EmbeddingCache()
+    passages = ["the cat sat on the mat", "stock prices fell sharply", "a dog chased the cat"]
+    first = rank_passages("cat on a mat", passages, 2, embedder, cache)
+    second = rank_passages("cat on a mat", passages, 2, embedder, cache)
+    assert first == second
+    assert first[0][1] == "the cat sat on the mat"
+    assert len(calls) == 1 and cache.hits == 4
+    # lexical scores can reorder the semantic ranking
+    blended = rank_passages("cat on a mat", passages, 1, embedder, cache, lexical=[0, 0, 1], lexical_weight=0.9)
+    assert blended[0][1] == "a dog chased the cat"
+
+
+def test_scrape_website_semantic_ranking():
+    module = sys.modules["tools.scrape_website"]
+    content = "Shipping takes three days. Our office has a red door. Returns are accepted within thirty days."
+    with patch.object(module.scraper, "fetch_content", return_value=content), \
+            patch.object(module, "get_embedder", return_value=HashingEmbedder()), \
+            patch.object(module, "_split_passages", side_effect=module._split_sentences):
+        result = asyncio.run(
+            module.scrape_website("https://example.com", "how many days for returns", ranking="semantic")
+        )
+    assert result["status"] == "success"
+    assert result["data"]["content"].startswith("Returns are accepted")
+
+
+def test_scrape_website_falls_back_when_nothing_is_kept():
+    module = sys.modules["tools.scrape_website"]
+    with patch.object(module.scraper, "fetch_content", return_value="Some page text."), \
+            patch.object(module, "_semantic_filter", return_value=""), \
+            patch.object(module, "_filter_content", return_value="lexical result") as lexical:
+        result = asyncio.run(module.scrape_website("https://example.com", "returns", ranking="hybrid"))
+    lexical.assert_called_once()
+    assert result["data"]["content"] == "lexical result"
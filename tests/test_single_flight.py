@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from tools.single_flight import SingleFlight
+from tools.webscraper import WebScraper
+
+
+def test_concurrent_fetches_share_one_load():
+    scraper = WebScraper()
+    calls = []
+
+    async def fake_fetch(url, timeout, extract="full"):
+        calls.append(url)
+        await asyncio.sleep(0.05)
+        return "text"
+
+    scraper._fetch_content = fake_fetch
+
+    async def main():
+        return await asyncio.gather(
+            scraper.fetch_content("https://example.com/a"),
+            scraper.fetch_content("https://EXAMPLE.com/a#top"),
+            scraper.fetch_content("https://example.com/b"),
+        )
+
+    assert asyncio.run(main()) == ["text", "text", "text"]
+    assert calls == ["https://example.com/a", "https://example.com/b"]
+    assert scraper.flights.joined == 1
+
+
+def test_caller_timeout_keeps_shared_work_for_others():
+    flights = SingleFlight()
+    started = []
+
+    async def work():
+        started.append(1)
+        await asyncio.sleep(0.1)
+        return "done"
+
+    async def main():
+        impatient = asyncio.create_task(flights.do("k", work, timeout=0.01))
+        patient = asyncio.create_task(flights.do("k", work))
+        with pytest.raises(asyncio.TimeoutError):
+            await impatient
+        return await patient
+
+    assert asyncio.run(main()) == "done"
+    assert started == [1]
+
+
+def test_last_waiter_leaving_cancels_shared_work():
+    flights = SingleFlight()
+    cancelled = []
+
+    async def work():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def main():
+        callers = [asyncio.create_task(flights.do("k", work)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        callers[0].cancel()
+        await asyncio.sleep(0.01)
+        assert not cancelled
+        callers[1].cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        assert len(flights) == 0
+
+    asyncio.run(main())
+    assert cancelled == [1]
@@ -0,0 +1,23 @@
+import pytest
+
+from step_log import StepLogWriter, iter_steps
+
+
+@pytest.mark.parametrize("name", ["log.jsonl", "log.jsonl.zst"])
+def test_steps_round_trip(tmp_path, name):
+    path = str(tmp_path / name)
+    with StepLogWriter(path) as log:
+        log.append({"tool": "scrape_website", "result": {"data": "x" * 1000}})
+        # Earlier steps are readable before the writer is closed
+        assert [s["tool"] for s in iter_steps(path)] == ["scrape_website"]
+        log.append({"tool": "extract_links", "result": {"data": []}})
+    assert [s["tool"] for s in iter_steps(path)] == ["scrape_website", "extract_links"]
+
+
+@pytest.mark.parametrize("name", ["log.jsonl", "log.jsonl.zst"])
+def test_rerun_replaces_previous_log(tmp_path, name):
+    path = str(tmp_path / name)
+    for tool in ("first_run", "second_run"):
+        with StepLogWriter(path) as log:
+            log.append({"tool": tool})
+    assert [s["tool"] for s in iter_steps(path)] == ["second_run"]
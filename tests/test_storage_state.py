@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+from tools.storage_state import StorageStateStore, domain_key
+from tools.webscraper import WebScraper
+
+
+def _cookie(name, domain, expires=-1):
+    return {"name": name, "value": "1", "domain": domain, "path": "/", "expires": expires}
+
+
+def test_domain_key_uses_public_suffixes():
+    assert domain_key("https://www.example.com/a") == "example.com"
+    assert domain_key("https://shop.example.co.uk") == "example.co.uk"
+    assert domain_key("https://docs.aws.de") == "aws.de"
+    assert domain_key("https://a.example.co.uk") == domain_key("https://b.example.co.uk") == "example.co.uk"
+    assert domain_key("https://alice.github.io/x") == "alice.github.io"
+    assert domain_key("https://my-app.herokuapp.com") == "my-app.herokuapp.com"
+    assert domain_key("http://localhost:8000/") == "localhost"
+    assert domain_key("http://127.0.0.1/") == "127.0.0.1"
+
+
+def test_save_filters_and_load_drops_expired(tmp_path):
+    store = StorageStateStore(tmp_path)
+    state = {
+        "cookies": [
+            _cookie("consent", ".example.com"),
+            _cookie("old", "www.example.com", expires=time.time() - 10),
+            _cookie("tracker", ".ads.net"),
+        ],
+        "origins": [{"origin": "https://www.example.com", "localStorage": [{"name": "k", "value": "v"}]}],
+    }
+    assert store.save("https://www.example.com/page", state)
+    assert not store.save("https://www.example.com/other", state)  # unchanged, not rewritten
+    loaded = StorageStateStore(tmp_path).load("https://news.example.com")
+    assert [c["name"] for c in loaded["cookies"]] == ["consent"]
+    assert loaded["origins"] == state["origins"]
+
+
+def test_old_state_expires(tmp_path):
+    store = StorageStateStore(tmp_path, max_age=0)
+    store.save("https://example.com", {"cookies": [_cookie("a", "example.com")], "origins": []})
+    time.sleep(0.01)
+    assert store.load("https://example.com") is None
+    assert not list(tmp_path.iterdir())
+
+
+class _Page:
+    url = "https://www.example.com/"
+
+
+class _Context:
+    def set_default_navigation_timeout(self, timeout):
+        pass
+
+    async def new_page(self):
+        return _Page()
+
+    async def storage_state(self):
+        return {"cookies": [_cookie("consent", ".example.com")], "origins": []}
+
+    async def close(self):
+        pass
+
+
+class _Browser:
+    def __init__(self):
+        self.states = []
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self, **kwargs):
+        self.states.append(kwargs.get("storage_state"))
+        return _Context()
+
+
+def test_scraper_reuses_state_on_next_visit(tmp_path, monkeypatch):
+    monkeypatch.setattr("tools.webscraper.storage_states", StorageStateStore(tmp_path))
+    scraper = WebScraper()
+    scraper.browser = _Browser()
+
+    async def visit():
+        async with scraper._page("https://www.example.com/a"):
+            pass
+
+    asyncio.run(visit())
+    asyncio.run(visit())
+    assert scraper.browser.states[0] is None
+    assert [c["name"] for c in scraper.browser.states[1]["cookies"]] == ["consent"]
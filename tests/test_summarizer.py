@@ -10,3 +10,34 @@ def test_summarizer_run(tmp_path):
     with patch("summarizer._collect", return_value="Answer"):
         result = SummarizerAgent(str(log_file)).run()
     assert result == "Answer"
+
+
+def test_summarizer_map_reduce(tmp_path):
+    log_file = tmp_path / "log.json"
+    steps = [
+        {"tool": "scrape_website", "result": {"data": "a" * 300}},
+        {"tool": "extract_links", "result": {"data": "b" * 300}},
+    ]
+    with open(log_file, "w") as f:
+        json.dump(steps, f)
+    with patch("summarizer._complete", return_value="- fact") as complete, \
+            patch("summarizer._collect", return_value="<final>done</final>") as collect:
+        result = SummarizerAgent(str(log_file), query="q", chunk_tokens=100, parallelism=2).run()
+    assert result == "<final>done</final>"
+    assert complete.call_count == 2
+    final_payload = json.loads(collect.call_args[0][0][-1]["content"])
+    assert final_payload == {"query": "q", "notes": ["- fact", "- fact"]}
+
+
+def test_summarizer_reads_spilled_outputs(tmp_path):
+    from artifacts import store_for_log
+
+    log_file = tmp_path / "log.json"
+    handle = store_for_log(str(log_file)).put("c" * 1000)
+    with open(log_file, "w") as f:
+        json.dump([{"tool": "scrape_website", "result": {"data": handle}}], f)
+    with patch("summarizer._complete", return_value="- fact") as complete, \
+            patch("summarizer._collect", return_value="<final>done</final>"):
+        SummarizerAgent(str(log_file), chunk_tokens=100).run()
+    chunks = [c[0][0][-1]["content"] for c in complete.call_args_list]
+    assert sum(json.loads(c)["content"].count("c") for c in chunks) >= 1000
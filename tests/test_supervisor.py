@@ -0,0 +1,63 @@
+import asyncio
+
+from supervisor import HashRing, shard_key, Supervisor
+
+
+def test_hash_ring_moves_few_keys_when_growing():
+    keys = [f"host{i}.example.com" for i in range(1000)]
+    before = HashRing(4)
+    after = HashRing(5)
+    moved = sum(before.node_for(k) != after.node_for(k) for k in keys)
+    assert moved < 350  # about 1/5 of keys should move, never a full reshuffle
+    assert len({before.node_for(k) for k in keys}) == 4
+
+
+def test_shard_key_groups_by_host_and_session():
+    assert shard_key("scrape_website", {"url": "https://Docs.Example.com/a"}) == "docs.example.com"
+    assert shard_key("download_pdfs", {"links": ["https://x.org/a.pdf"]}) == "x.org"
+    assert shard_key("react_browser_task", {"url": "https://a.com", "session_id": "s1"}) == "session:s1"
+
+
+def test_worker_calls_metrics_and_crash_restart():
+    supervisor = Supervisor(1, {"health_interval": 0})
+    supervisor.start()
+
+    async def main():
+        result = await asyncio.wait_for(supervisor.call("read_pdfs", {"files": ["/missing.pdf"]}), 60)
+        assert result["status"] == "error"
+        metrics = await supervisor.metrics(timeout=30)
+        assert metrics["responding"] == 1 and metrics["served"] == 1
+
+        supervisor._procs[0].kill()
+        supervisor._procs[0].join(10)
+        assert supervisor.check_workers() == 1
+        result = await asyncio.wait_for(supervisor.call("read_pdfs", {"files": ["/missing.pdf"]}), 60)
+        assert result["status"] == "error"
+        assert (await supervisor.metrics(timeout=30))["restarts"] == 1
+
+    try:
+        asyncio.run(main())
+    finally:
+        supervisor.stop(10)
+    assert not supervisor._procs[0].is_alive()
+
+
+def test_worker_answers_cancelled_and_non_dict_calls(monkeypatch):
+    import queue
+
+    import tools
+    from supervisor import _serve_worker
+
+    async def hangs():
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(tools, "hangs", hangs, raising=False)
+    monkeypatch.setattr(tools, "plain", lambda: ["a", "b"], raising=False)
+    requests, results = queue.Queue(), queue.Queue()
+    for item in [(1, "hangs", {}), (2, "plain", {}), None]:
+        requests.put(item)
+
+    asyncio.run(asyncio.wait_for(_serve_worker(0, requests, results, {"drain_timeout": 0.2}), 30))
+    replies = dict(results.get_nowait() for _ in range(2))
+    assert replies[1]["status"] == "error" and "cancelled" in replies[1]["message"]
+    assert replies[2] == {"status": "success", "message": "", "data": ["a", "b"]}
@@ -0,0 +1,57 @@
+from typing import List, Optional
+from unittest.mock import patch
+
+from agent_utils import _structured, structured_stats
+from tool_schemas import args_schema, plan_schema, validate
+
+
+def _sample(url: str, tags: Optional[List[str]] = None, limit: int = 3) -> dict:
+    return {}
+
+
+def test_args_schema_from_signature():
+    schema = args_schema(_sample)
+    assert schema["required"] == ["url"]
+    assert schema["properties"]["tags"] == {"type": ["array", "null"], "items": {"type": "string"}}
+    assert schema["properties"]["limit"] == {"type": "integer"}
+
+
+def test_validate_reports_errors():
+    schema = args_schema(_sample)
+    assert validate({"url": "https://x", "tags": None}, schema) == []
+    errors = validate({"tags": ["a", 1], "limit": True, "extra": 1}, schema)
+    assert "$: missing required key 'url'" in errors
+    assert "$.tags[1]: expected string" in errors
+    assert "$.limit: expected integer" in errors
+    assert "$: unexpected key 'extra'" in errors
+
+
+def test_structured_retries_with_repair_prompt():
+    schema = plan_schema(["scrape_website"])
+    replies = ['{"plan": ["search"]}', '{"plan": ["scrape_website"]}']
+    with patch("agent_utils._collect", side_effect=replies) as collect:
+        data = _structured([{"role": "user", "content": "q"}], schema, model="test-model")
+    assert data == {"plan": ["scrape_website"]}
+    repair = collect.call_args_list[1][0][0][-1]["content"]
+    assert "must be one of" in repair
+    assert collect.call_args_list[0][1]["format"] == schema
+    assert structured_stats.retries["test-model"] == 1
+
+
+def test_stream_chat_sends_only_requested_tool_schema():
+    from agent_utils import _stream_chat, prompt_stats, TOOL_MAP
+    from tool_schemas import tool_spec, tool_spec_chars
+
+    assert tool_spec("scrape_website", TOOL_MAP["scrape_website"]) is tool_spec(
+        "scrape_website", TOOL_MAP["scrape_website"]
+    )
+    messages = [{"role": "user", "content": "hi"}]
+    with patch("agent_utils.chat", return_value=iter([])) as chat:
+        _stream_chat(messages, tools=["scrape_website"])
+        _stream_chat(messages)
+    step_tools = chat.call_args_list[0].kwargs["tools"]
+    assert [t["function"]["name"] for t in step_tools] == ["scrape_website"]
+    assert chat.call_args_list[1].kwargs["tools"] == []
+    assert prompt_stats.saved_tokens > 0
+    # schema sizes are measured once per tool, not on every call
+    assert tool_spec_chars.cache_info().currsize == len(TOOL_MAP)
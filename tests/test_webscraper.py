@@ -0,0 +1,84 @@
+import asyncio
+
+from tools.webscraper import WebScraper
+
+
+class _FakeContext:
+    def set_default_navigation_timeout(self, timeout):
+        self.navigation_timeout = timeout
+
+    async def new_page(self):
+        return object()
+
+    async def close(self):
+        pass
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        return _FakeContext()
+
+    async def close(self):
+        self.connected = False
+
+
+class _FakeChromium:
+    def __init__(self):
+        self.launches = 0
+
+    async def launch(self, **kwargs):
+        self.launches += 1
+        return _FakeBrowser()
+
+
+class _FakePlaywright:
+    def __init__(self):
+        self.chromium = _FakeChromium()
+
+    async def stop(self):
+        pass
+
+
+def test_dead_browser_is_relaunched():
+    async def scenario():
+        scraper = WebScraper()
+        scraper.playwright = _FakePlaywright()
+        await scraper.start()
+        assert await scraper.is_healthy()
+        scraper.browser.connected = False
+        assert not await scraper.is_healthy()
+        async with scraper._page():
+            assert scraper._inflight == 1
+        assert scraper.playwright.chromium.launches == 2
+        await scraper.shutdown(drain_timeout=0)
+        assert scraper.browser is None
+
+    asyncio.run(scenario())
+
+
+def test_monitor_survives_a_failed_relaunch():
+    async def scenario():
+        scraper = WebScraper()
+        scraper.playwright = _FakePlaywright()
+        await scraper.start()
+        scraper.browser.connected = False
+        restarts = []
+
+        async def failing_restart():
+            restarts.append(1)
+            raise RuntimeError("out of memory")
+
+        scraper.restart = failing_restart
+        monitor = asyncio.create_task(scraper.monitor(interval=0.01))
+        await asyncio.sleep(0.1)
+        assert not monitor.done()
+        monitor.cancel()
+        assert len(restarts) > 1
+
+    asyncio.run(scenario())
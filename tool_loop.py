@@ -0,0 +1,52 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine, Optional
+
+logger = logging.getLogger(__name__)
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="tool-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run ``coro`` on the shared background loop and wait for its result.
+
+    Async tools hold loop-bound resources (the Playwright browser, cached
+    sessions), so every call from every thread goes through the same loop
+    instead of a fresh ``asyncio.run`` per call.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+def shutdown(drain_timeout: float = 30) -> None:
+    """Close the shared browser and stop the background loop."""
+    global _loop
+    with _lock:
+        loop, _loop = _loop, None
+    if loop is None:
+        return
+    from tools.cpu_pool import cpu_pool
+    from tools.react_browser import close_sessions
+    from tools.webscraper import scraper
+
+    async def _close() -> None:
+        await close_sessions()
+        await scraper.shutdown(drain_timeout)
+
+    try:
+        asyncio.run_coroutine_threadsafe(_close(), loop).result()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("error while closing tools: %s", exc)
+    loop.call_soon_threadsafe(loop.stop)
+    cpu_pool.shutdown()
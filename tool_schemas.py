@@ -0,0 +1,124 @@
+import functools
+import inspect
+import json
+import typing
+from typing import Any, Callable, Dict, List
+
+_JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    dict: "object",
+}
+_PY_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+    "null": type(None),
+}
+
+
+def _annotation_schema(annotation: Any) -> Dict[str, Any]:
+    origin = typing.get_origin(annotation)
+    params = typing.get_args(annotation)
+    if origin is typing.Union:
+        options = [p for p in params if p is not type(None)]
+        schema = _annotation_schema(options[0]) if len(options) == 1 else {}
+        if type(None) in params and "type" in schema:
+            schema = {**schema, "type": [schema["type"], "null"]}
+        return schema
+    if origin in (list, List):
+        return {"type": "array", "items": _annotation_schema(params[0]) if params else {}}
+    if origin in (dict, Dict):
+        return {"type": "object"}
+    if annotation in _JSON_TYPES:
+        return {"type": _JSON_TYPES[annotation]}
+    return {}
+
+
+def args_schema(func: Callable[..., Any]) -> Dict[str, Any]:
+    """Return a JSON schema for the keyword arguments of ``func``."""
+    hints = typing.get_type_hints(func)
+    properties: Dict[str, Any] = {}
+    required: List[str] = []
+    for name, param in inspect.signature(func).parameters.items():
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        properties[name] = _annotation_schema(hints.get(name, Any))
+        if param.default is param.empty:
+            required.append(name)
+    return {"type": "object", "properties": properties, "required": required, "additionalProperties": False}
+
+
+def tool_call_schema(name: str, func: Callable[..., Any]) -> Dict[str, Any]:
+    """Schema for ``{"name": name, "args": {...}}`` as returned by the executor."""
+    return {
+        "type": "object",
+        "properties": {"name": {"type": "string", "enum": [name]}, "args": args_schema(func)},
+        "required": ["name", "args"],
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def tool_spec(name: str, func: Callable[..., Any]) -> Dict[str, Any]:
+    """Ollama tool definition for ``func``, built once per tool and reused."""
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": inspect.getdoc(func) or "",
+            "parameters": args_schema(func),
+        },
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def tool_spec_chars(name: str, func: Callable[..., Any]) -> int:
+    """Length of ``func``'s serialized tool definition, for prompt size estimates."""
+    return len(json.dumps(tool_spec(name, func)))
+
+
+def plan_schema(tools: List[str]) -> Dict[str, Any]:
+    """Schema for ``{"plan": [tool, ...]}`` restricted to the given tool names."""
+    return {
+        "type": "object",
+        "properties": {"plan": {"type": "array", "items": {"type": "string", "enum": tools}}},
+        "required": ["plan"],
+    }
+
+
+def validate(value: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """Check ``value`` against the subset of JSON schema produced above."""
+    errors: List[str] = []
+    expected = schema.get("type")
+    if expected:
+        types = expected if isinstance(expected, list) else [expected]
+        py_types = tuple(t for name in types for t in _as_tuple(_PY_TYPES[name]))
+        # bool is an int subclass but not a JSON integer
+        if not isinstance(value, py_types) or (isinstance(value, bool) and "boolean" not in types):
+            return [f"{path}: expected {' or '.join(types)}"]
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path}: must be one of {schema['enum']}")
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}: missing required key '{key}'")
+        for key, item in value.items():
+            if key in properties:
+                errors.extend(validate(item, properties[key], f"{path}.{key}"))
+            elif schema.get("additionalProperties") is False:
+                errors.append(f"{path}: unexpected key '{key}'")
+    if isinstance(value, list) and "items" in schema:
+        for i, item in enumerate(value):
+            errors.extend(validate(item, schema["items"], f"{path}[{i}]"))
+    return errors
+
+
+def _as_tuple(value: Any) -> tuple:
+    return value if isinstance(value, tuple) else (value,)
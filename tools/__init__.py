@@ -1,17 +1,21 @@
 from .mcp import mcp
 from .webscraper import scraper
+from .cpu_pool import cpu_pool
 from .open_in_user_browser import open_in_user_browser
 from .scrape_website import scrape_website
 from .extract_links import extract_links
 from .download_pdfs import download_pdfs
+from .read_pdfs import read_pdfs
 from .react_browser import react_browser_task
 
 __all__ = [
     "mcp",
     "scraper",
+    "cpu_pool",
     "open_in_user_browser",
     "scrape_website",
     "extract_links",
     "download_pdfs",
+    "read_pdfs",
     "react_browser_task",
 ]
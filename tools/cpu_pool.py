@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Number of worker processes; 0 disables the pool and runs everything inline
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Jobs allowed in flight before callers wait for a free slot
+CPU_MAX_PENDING = int(os.getenv("CPU_MAX_PENDING", str(max(CPU_WORKERS, 1) * 2)))
+# Inputs smaller than this many characters are cheaper to process inline
+CPU_INLINE_THRESHOLD = int(os.getenv("CPU_INLINE_THRESHOLD", "50000"))
+
+
+def _warm_worker() -> None:
+    """Import the HTML parser and load NLTK data once per worker."""
+    from bs4 import BeautifulSoup
+    from nltk.stem import PorterStemmer
+    from nltk.tokenize import word_tokenize
+
+    BeautifulSoup("<a href='/'>warm up</a>", "html.parser")
+    PorterStemmer().stem("warming")
+    try:
+        word_tokenize("warm up the tokenizer")
+    except LookupError:
+        logger.warning("NLTK tokenizer data not found in CPU worker; run nltk.download('punkt_tab')")
+
+
+class CpuPool:
+    def __init__(
+        self,
+        workers: int = CPU_WORKERS,
+        max_pending: int = CPU_MAX_PENDING,
+        inline_threshold: int = CPU_INLINE_THRESHOLD,
+    ) -> None:
+        """Offload CPU-bound post-processing to a pool of worker processes."""
+        self.workers = workers
+        self.max_pending = max_pending
+        self.inline_threshold = inline_threshold
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # asyncio primitives are bound to a loop, so keep one semaphore per loop
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            logger.info(f"Starting CPU pool with {self.workers} workers")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+            )
+        return self._executor
+
+    def _slot(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slot = self._slots.get(loop)
+        if slot is None:
+            slot = asyncio.Semaphore(self.max_pending)
+            self._slots[loop] = slot
+        return slot
+
+    def start(self) -> None:
+        """Spawn the workers ahead of the first request."""
+        if self.workers > 0:
+            executor = self._ensure_executor()
+            for _ in range(self.workers):
+                executor.submit(os.getpid)
+
+    async def run(self, func: Callable[..., T], *args: Any, size: int = 0) -> T:
+        """Run ``func(*args)`` in a worker process and return its result.
+
+        ``func`` and its arguments must be picklable. Inputs whose ``size`` is
+        below the inline threshold, or calls made while the pool is disabled,
+        run directly in the caller.
+        """
+        if self.workers <= 0 or size < self.inline_threshold:
+            return func(*args)
+
+        async with self._slot():
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._ensure_executor(), func, *args)
+            except BrokenProcessPool:
+                logger.error("CPU pool worker died; restarting pool and running in a thread")
+                self.shutdown()
+                return await asyncio.to_thread(func, *args)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("CPU pool shut down")
+
+
+cpu_pool = CpuPool()
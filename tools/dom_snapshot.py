@@ -0,0 +1,121 @@
+import re
+from typing import Any, Dict, List
+
+from playwright.async_api import Page
+
+# Roughly four characters per token for English text
+CHARS_PER_TOKEN = 4
+ELEMENT_ID_ATTR = "data-wd-id"
+_ELEMENT_ID = re.compile(r"^e\d+$")
+
+# Tags every interactive element with a short id that survives repeated
+# snapshots of the same page, and collects a text outline of the visible page.
+SNAPSHOT_SCRIPT = """
+() => {
+  const ATTR = "%s";
+  const INTERACTIVE = 'a[href], button, input:not([type=hidden]), select, textarea, summary, '
+    + '[role=button], [role=link], [role=tab], [role=menuitem], [role=checkbox], [onclick], [contenteditable=""], '
+    + '[contenteditable=true]';
+  const visible = (el) => {
+    const rect = el.getBoundingClientRect();
+    if (!rect.width || !rect.height) return false;
+    const style = getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+  };
+  const clean = (text, max) => (text || '').replace(/\\s+/g, ' ').trim().slice(0, max);
+  window.__wdNextId = window.__wdNextId || 1;
+
+  const elements = [];
+  for (const el of document.querySelectorAll(INTERACTIVE)) {
+    if (!visible(el)) continue;
+    let id = el.getAttribute(ATTR);
+    if (!id) {
+      id = 'e' + window.__wdNextId++;
+      el.setAttribute(ATTR, id);
+    }
+    elements.push({
+      id,
+      tag: el.tagName.toLowerCase(),
+      type: el.getAttribute('type') || el.getAttribute('role') || '',
+      text: clean(el.innerText || el.value || el.getAttribute('aria-label') || el.getAttribute('title')
+        || el.getAttribute('placeholder') || el.getAttribute('name'), 80),
+      href: el.getAttribute('href') || '',
+    });
+  }
+
+  const outline = [];
+  const blocks = document.querySelectorAll('h1, h2, h3, h4, p, li, td, pre, blockquote');
+  for (const el of blocks) {
+    if (!visible(el) || el.closest('nav, footer, script, style')) continue;
+    const text = clean(el.innerText, 300);
+    if (!text) continue;
+    const level = /^h[1-4]$/.test(el.tagName.toLowerCase()) ? Number(el.tagName[1]) : 0;
+    outline.push({level, text});
+  }
+  return {title: document.title, url: location.href, elements, outline};
+}
+""" % ELEMENT_ID_ATTR
+
+
+def _describe(element: Dict[str, Any]) -> str:
+    kind = element["tag"] if not element["type"] else f"{element['tag']}:{element['type']}"
+    line = f"[{element['id']}] {kind}"
+    if element["text"]:
+        line += f' "{element["text"]}"'
+    if element["href"] and not element["href"].startswith("javascript:"):
+        line += f" -> {element['href']}"
+    return line
+
+
+def format_snapshot(snapshot: Dict[str, Any], budget_tokens: int = 1500) -> str:
+    """Render a snapshot as compact text that fits in ``budget_tokens``.
+
+    Interactive elements get up to half of the budget; the visible text
+    outline fills the remainder.
+    """
+    budget = budget_tokens * CHARS_PER_TOKEN
+    header = f"Title: {snapshot.get('title', '')}\nURL: {snapshot.get('url', '')}"
+    used = len(header)
+
+    def take(lines: List[str], limit: int) -> List[str]:
+        nonlocal used
+        kept: List[str] = []
+        for line in lines:
+            if used + len(line) + 1 > limit:
+                kept.append("... (truncated)")
+                break
+            kept.append(line)
+            used += len(line) + 1
+        return kept
+
+    elements = take([_describe(e) for e in snapshot.get("elements", [])], budget // 2)
+    seen = set()
+    outline_lines = []
+    for block in snapshot.get("outline", []):
+        if block["text"] in seen:
+            continue  # nested blocks (li inside td, ...) repeat their text
+        seen.add(block["text"])
+        prefix = "#" * block["level"] + " " if block["level"] else ""
+        outline_lines.append(prefix + block["text"])
+    outline = take(outline_lines, budget)
+
+    sections = [header]
+    if elements:
+        sections.append("Interactive elements (use the id in brackets as target):\n" + "\n".join(elements))
+    if outline:
+        sections.append("Text:\n" + "\n".join(outline))
+    return "\n\n".join(sections)
+
+
+def resolve_target(target: str) -> str:
+    """Map a snapshot id such as ``e12`` to a selector; pass selectors through."""
+    candidate = target.strip().strip("[]")
+    if _ELEMENT_ID.match(candidate):
+        return f'[{ELEMENT_ID_ATTR}="{candidate}"]'
+    return target
+
+
+async def snapshot(page: Page, budget_tokens: int = 1500) -> str:
+    """Return a compact, id-annotated text view of ``page``."""
+    data = await page.evaluate(SNAPSHOT_SCRIPT)
+    return format_snapshot(data, budget_tokens)
@@ -2,16 +2,23 @@ from typing import Dict, Any, List
 import logging
 import os
 from urllib.parse import urlparse
-import requests
 
 from .mcp import mcp
+from .http_client import http
 from .prompt_utils import load_prompt
+from .resilience import call_with_retries_sync
 
 logger = logging.getLogger(__name__)
 
 PROMPT = load_prompt("download_pdfs")
 
 
+def _get(url: str, timeout: float) -> bytes:
+    response = http.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+
 @mcp.tool(description=PROMPT)
 def download_pdfs(links: List[str]) -> Dict[str, Any]:
     """Download PDF files from a list of links."""
@@ -30,10 +37,9 @@ def download_pdfs(links: List[str]) -> Dict[str, Any]:
                 file_name += ".pdf"
             file_path = os.path.join(download_dir, file_name)
             logger.info("Downloading PDF from %s to %s", clean_link, file_path)
-            response = requests.get(clean_link, timeout=30)
-            response.raise_for_status()
+            content = call_with_retries_sync(clean_link, lambda remaining: _get(clean_link, remaining))
             with open(file_path, "wb") as pdf_file:
-                pdf_file.write(response.content)
+                pdf_file.write(content)
             downloaded_files.append(file_path)
 
         return {
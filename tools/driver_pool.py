@@ -0,0 +1,202 @@
+import asyncio
+import atexit
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPool:
+    def __init__(
+        self,
+        factory: Callable[[], WebDriver],
+        max_size: int = 2,
+        idle_timeout: float = 300,
+    ) -> None:
+        """Reuse Selenium drivers across calls and quit them when idle.
+
+        At most ``max_size`` drivers exist at once; callers beyond that wait
+        for a driver to be released. Drivers idle for longer than
+        ``idle_timeout`` seconds are quit by a background reaper, and every
+        driver is quit when the pool is closed or the process exits.
+        """
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._idle: List[Tuple[WebDriver, float]] = []
+        self._generation: Dict[int, int] = {}
+        self._current_generation = 0
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._reaper: Optional[threading.Thread] = None
+        atexit.register(self.close)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _start_reaper(self) -> None:
+        if self._reaper is None and self.idle_timeout > 0:
+            self._reaper = threading.Thread(target=self._reap_forever, name="driver-pool-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap_forever(self) -> None:
+        while not self._closed:
+            time.sleep(max(self.idle_timeout / 2, 1))
+            self.reap_idle()
+
+    def _quit(self, driver: WebDriver) -> None:
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.error(f"Error quitting WebDriver: {str(e)}")
+
+    def _forget(self, driver: WebDriver) -> None:
+        """Drop bookkeeping for a driver that is about to be quit (lock held)."""
+        self._generation.pop(id(driver), None)
+        self._size -= 1
+        self._cond.notify()
+
+    def acquire(self, timeout: Optional[float] = None) -> WebDriver:
+        """Return an idle driver, create one if below ``max_size``, or wait."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("driver pool is closed")
+                if self._idle:
+                    driver, _ = self._idle.pop()
+                    return driver
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("timed out waiting for a WebDriver")
+                self._cond.wait(remaining)
+            generation = self._current_generation
+
+        try:
+            logger.info("Creating pooled Chrome WebDriver")
+            driver = self.factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._generation[id(driver)] = generation
+        self._start_reaper()
+        return driver
+
+    def release(self, driver: WebDriver, discard: bool = False) -> None:
+        """Return ``driver`` to the pool, or quit it if ``discard`` or stale."""
+        with self._cond:
+            stale = self._closed or self._generation.get(id(driver)) != self._current_generation
+            if discard or stale:
+                self._forget(driver)
+            else:
+                self._idle.append((driver, time.monotonic()))
+                self._cond.notify()
+                return
+        self._quit(driver)
+
+    def reap_idle(self) -> int:
+        """Quit drivers idle for longer than ``idle_timeout``; return how many."""
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._cond:
+            expired = [driver for driver, since in self._idle if since < cutoff]
+            self._idle = [(driver, since) for driver, since in self._idle if since >= cutoff]
+            for driver in expired:
+                self._forget(driver)
+        for driver in expired:
+            logger.info("Quitting idle Chrome WebDriver")
+            self._quit(driver)
+        return len(expired)
+
+    def probe_idle(self) -> int:
+        """Ping every idle driver and quit those whose session died; return how many died."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        alive, dead = [], []
+        for driver, since in idle:
+            try:
+                driver.execute_script("return 1")
+                alive.append((driver, since))
+            except Exception as e:
+                logger.warning(f"Idle Chrome WebDriver is unresponsive: {str(e)}")
+                dead.append(driver)
+        with self._cond:
+            # drivers keep their idle time so probing does not hold off the reaper
+            self._idle.extend(alive)
+            for driver in dead:
+                self._forget(driver)
+            self._cond.notify_all()
+        for driver in dead:
+            self._quit(driver)
+        return len(dead)
+
+    def clear(self) -> None:
+        """Quit idle drivers and retire busy ones when they are released."""
+        with self._cond:
+            self._current_generation += 1
+            idle = [driver for driver, _ in self._idle]
+            self._idle = []
+            for driver in idle:
+                self._forget(driver)
+        for driver in idle:
+            self._quit(driver)
+
+    def close(self) -> None:
+        """Quit every idle driver and refuse new acquisitions."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.clear()
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None) -> Iterator[WebDriver]:
+        driver = self.acquire(timeout)
+        discard = False
+        try:
+            yield driver
+        except WebDriverException:
+            # The session may be dead; do not hand it to the next caller
+            discard = True
+            raise
+        finally:
+            self.release(driver, discard=discard)
+
+    def _release_abandoned(self, pending: "asyncio.Future[WebDriver]") -> None:
+        """Hand back a driver acquired for a caller that was cancelled while waiting."""
+        if pending.cancelled() or pending.exception() is not None:
+            return
+        threading.Thread(target=self.release, args=(pending.result(),), daemon=True).start()
+
+    @asynccontextmanager
+    async def lease(self, timeout: Optional[float] = None) -> AsyncIterator[WebDriver]:
+        """Async variant of :meth:`driver` that never blocks the event loop."""
+        loop = asyncio.get_running_loop()
+        pending = loop.run_in_executor(None, self.acquire, timeout)
+        try:
+            # shielded so a cancelled caller does not lose the driver the thread may still return
+            driver = await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            pending.add_done_callback(self._release_abandoned)
+            raise
+        discard = False
+        try:
+            yield driver
+        except (WebDriverException, asyncio.CancelledError):
+            # A cancelled caller may leave the driver mid-navigation in its thread
+            discard = True
+            raise
+        finally:
+            await asyncio.to_thread(self.release, driver, discard)
@@ -1,45 +1,78 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
 import logging
-from urllib.parse import urljoin, urlparse
-import requests
-from bs4 import BeautifulSoup
 
 from .mcp import mcp
+from .http_client import http
+from .cpu_pool import cpu_pool
+from .link_utils import clean_links, normalize_url, parse_links
 from .prompt_utils import load_prompt
+from .resilience import call_with_retries
+from .scheduler import scheduler
+from .single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
 
 PROMPT = load_prompt("extract_links")
+# Concurrent calls for the same page share one download
+_downloads = SingleFlight()
+
+
+def _get(url: str, timeout: float) -> str:
+    response = http.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+
+async def _download(url: str, priority: str) -> str:
+    # queued outside the deadline so local throttling never counts against the host
+    async with scheduler.slot(url, priority):
+        return await call_with_retries(url, lambda remaining: asyncio.to_thread(_get, url, remaining))
+
+
+def _collect_links(
+    html: str,
+    base_url: str,
+    query: str,
+    same_domain: bool,
+    file_types: Optional[List[str]],
+    top_n: Optional[int],
+) -> Tuple[int, List[Dict[str, str]]]:
+    """Parse, clean and rank links; runs in the CPU pool for large pages."""
+    links = parse_links(html, base_url)
+    cleaned = clean_links(
+        links,
+        base_url,
+        query=query,
+        same_domain=same_domain,
+        file_types=file_types,
+        top_n=top_n,
+    )
+    return len(links), cleaned
 
 
 @mcp.tool(description=PROMPT)
-def extract_links(url: str) -> Dict[str, Any]:
+async def extract_links(
+    url: str,
+    query: str = "",
+    same_domain: bool = False,
+    file_types: Optional[List[str]] = None,
+    top_n: Optional[int] = None,
+    priority: str = "interactive",
+) -> Dict[str, Any]:
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        html = response.text
-        base_url = url
+        html = await _downloads.do(normalize_url(url), lambda: _download(url, priority))
 
-        soup = BeautifulSoup(html, "html.parser")
-
-        links = []
-        for a_tag in soup.find_all("a", href=True):
-            href = a_tag.get("href", "")
-            text = a_tag.get_text(strip=True)
-
-            if not href or href.lower().startswith("javascript:"):
-                continue
-
-            if not urlparse(href).scheme:
-                href = urljoin(base_url, href)
-
-            links.append({"url": href, "text": text if text else href})
+        raw_count, links = await cpu_pool.run(
+            _collect_links, html, url, query, same_domain, file_types, top_n, size=len(html)
+        )
+        logger.info("Kept %d of %d links from %s", len(links), raw_count, url)
 
         return {
             "status": "success",
             "no. of links": len(links),
-            "message": "Links extracted successfully",
+            "message": f"Links extracted successfully ({raw_count} found, {len(links)} kept)",
             "data": {"links": links},
         }
     except Exception as e:
@@ -59,7 +92,19 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="extract links from a url")
     parser.add_argument("url", help="url to fetch")
+    parser.add_argument("--query", default="", help="rank links by relevance to this text")
+    parser.add_argument("--same-domain", action="store_true", help="only keep links on the same site")
+    parser.add_argument("--file-types", nargs="*", default=None, help="only keep these extensions, e.g. pdf")
+    parser.add_argument("--top-n", type=int, default=None, help="maximum number of links to return")
     args = parser.parse_args()
 
-    result = extract_links(args.url)
+    result = asyncio.run(
+        extract_links(
+            args.url,
+            query=args.query,
+            same_domain=args.same_domain,
+            file_types=args.file_types,
+            top_n=args.top_n,
+        )
+    )
     print(json.dumps(result, indent=2))
@@ -0,0 +1,182 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from settings import CACHE_DIR
+
+from .storage_state import domain_key
+
+logger = logging.getLogger(__name__)
+
+# Cheapest first: plain HTTP without a browser, a browser load that stops at
+# DOMContentLoaded with images/media/fonts blocked, and a full render that
+# waits for the network to go idle.
+STRATEGIES = ("static", "light", "full")
+# Main-content extraction scores the rendered DOM, so it needs a browser
+BROWSER_STRATEGIES = ("light", "full")
+
+FETCH_PROFILES_FILE = CACHE_DIR / "fetch_profiles.json"
+# Pages yielding less text than this count as failed for the strategy used
+FETCH_MIN_CHARS = int(os.getenv("FETCH_MIN_CHARS", "200"))
+# The second and every Nth fetch of a site try the strategy it has not tried for the longest (0 disables)
+FETCH_EXPLORE_EVERY = int(os.getenv("FETCH_EXPLORE_EVERY", "20"))
+# A strategy must yield at least this share of the best text seen for the site
+FETCH_YIELD_RATIO = 0.5
+# Weight of the newest observation in the moving averages
+SMOOTHING = 0.3
+SAVE_INTERVAL = 30
+
+
+@dataclass
+class StrategyStats:
+    attempts: int = 0
+    failures: int = 0
+    success_rate: float = 0.0
+    latency: float = 0.0
+    chars: float = 0.0
+    last_attempt: float = 0.0
+
+    def record(self, ok: bool, latency: float, chars: int) -> None:
+        alpha = 1.0 if self.attempts == 0 else SMOOTHING
+        self.attempts += 1
+        self.failures += 0 if ok else 1
+        self.success_rate += alpha * ((1.0 if ok else 0.0) - self.success_rate)
+        self.latency += alpha * (latency - self.latency)
+        self.chars += alpha * (chars - self.chars)
+        self.last_attempt = time.time()
+
+
+@dataclass
+class DomainProfile:
+    fetches: int
+    strategies: Dict[str, StrategyStats]
+
+    def works(self, strategy: str) -> bool:
+        stats = self.strategies.get(strategy)
+        if stats is None or not stats.attempts or stats.success_rate < 0.5:
+            return False
+        best = max(s.chars for s in self.strategies.values())
+        return stats.chars >= max(FETCH_MIN_CHARS, FETCH_YIELD_RATIO * best)
+
+
+class FetchProfiles:
+    def __init__(
+        self,
+        path: Optional[Path] = FETCH_PROFILES_FILE,
+        explore_every: int = FETCH_EXPLORE_EVERY,
+        max_domains: int = 5000,
+    ) -> None:
+        """Learn per site which fetch strategy is cheapest while still yielding the page text.
+
+        Outcomes (latency, text length, failures) are kept as moving averages
+        per site and strategy and persisted to ``path``, so what was learned
+        survives restarts. Unknown sites start with the cheapest strategy and
+        escalate when it fails or returns too little text.
+        """
+        self.path = path
+        self.explore_every = explore_every
+        self.max_domains = max_domains
+        self._profiles: "OrderedDict[str, DomainProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            for key, entry in data.items():
+                self._profiles[key] = DomainProfile(
+                    entry["fetches"],
+                    {name: StrategyStats(**s) for name, s in entry["strategies"].items() if name in STRATEGIES},
+                )
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring unreadable fetch profiles at {self.path}")
+            self._profiles.clear()
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                key: {"fetches": p.fetches, "strategies": {n: asdict(s) for n, s in p.strategies.items()}}
+                for key, p in self._profiles.items()
+            }
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save fetch profiles: {str(e)}")
+
+    def plan(self, url: str, strategies: Sequence[str] = STRATEGIES) -> List[str]:
+        """Which of ``strategies`` to try for ``url`` in order; later ones are fallbacks."""
+        with self._lock:
+            profile = self._profiles.get(domain_key(url))
+            if profile is None:
+                return list(strategies)
+            working = [s for s in strategies if profile.works(s)]
+            if working:
+                # the cheapest by observed latency among those that still yield the page
+                first = min(working, key=lambda s: profile.strategies[s].latency)
+            else:
+                untried = [s for s in strategies if s not in profile.strategies]
+                first = untried[0] if untried else strategies[-1]
+            order = list(strategies[strategies.index(first):])
+            # exploring on the second visit quickly shows whether a heavier render yields more text
+            fetches = profile.fetches
+            if self.explore_every and fetches and (fetches == 1 or fetches % self.explore_every == 0):
+                stalest = min(
+                    (s for s in strategies if s != first),
+                    key=lambda s: profile.strategies[s].last_attempt if s in profile.strategies else 0,
+                )
+                logger.info(f"Re-exploring fetch strategy {stalest} for {domain_key(url)}")
+                order = [stalest] + [s for s in order if s != stalest]
+            return order
+
+    def record(self, url: str, strategy: str, ok: bool, latency: float, chars: int = 0) -> None:
+        """Store the outcome of fetching ``url`` with ``strategy``; see :meth:`save_due`."""
+        key = domain_key(url)
+        with self._lock:
+            profile = self._profiles.pop(key, None) or DomainProfile(0, {})
+            profile.strategies.setdefault(strategy, StrategyStats()).record(ok, latency, chars)
+            self._profiles[key] = profile
+            while len(self._profiles) > self.max_domains:
+                self._profiles.popitem(last=False)
+            self._dirty = True
+
+    def save_due(self) -> bool:
+        """Whether unsaved outcomes are older than ``SAVE_INTERVAL``; callers then run :meth:`save`."""
+        with self._lock:
+            return self._dirty and time.monotonic() - self._saved_at > SAVE_INTERVAL
+
+    def finished(self, url: str) -> None:
+        """Count one completed fetch of ``url``; drives periodic re-exploration."""
+        with self._lock:
+            profile = self._profiles.get(domain_key(url))
+            if profile is not None:
+                profile.fetches += 1
+                self._dirty = True
+
+    def snapshot(self, url: str) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            profile = self._profiles.get(domain_key(url))
+            return {n: asdict(s) for n, s in profile.strategies.items()} if profile else {}
+
+
+fetch_profiles = FetchProfiles()
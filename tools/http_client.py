@@ -0,0 +1,20 @@
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connections kept open per host; batch runs fetch from many threads at once
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+
+
+def create_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """Return a session that reuses keep-alive connections across tool calls."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by every tool so concurrent agent runs reuse the same connection pool
+http = create_session()
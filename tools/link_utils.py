@@ -0,0 +1,155 @@
+import re
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from bs4 import BeautifulSoup, Tag
+from nltk.stem import PorterStemmer
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_hsenc", "_hsmi", "ref_src", "spm",
+}
+TRACKING_PREFIXES = ("utm_",)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+ALLOWED_SCHEMES = ("http", "https")
+
+_stemmer = PorterStemmer()
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _host(url: str) -> str:
+    host = (urlsplit(url).hostname or "").rstrip(".")
+    return host[4:] if host.startswith("www.") else host
+
+
+def normalize_url(url: str, base_url: Optional[str] = None) -> str:
+    """Return a canonical form of ``url`` suitable for deduplication.
+
+    Relative links are resolved against ``base_url``. The fragment and
+    tracking parameters are removed, scheme and host are lowercased, default
+    ports and trailing slashes are dropped and the query string is sorted.
+    Raises ``ValueError`` for malformed URLs such as a non-numeric port.
+    """
+    url = url.strip()
+    if base_url and not urlsplit(url).scheme:
+        url = urljoin(base_url, url)
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    netloc = f"[{host}]" if ":" in host else host
+    port = parts.port
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{port}"
+    if parts.username:
+        credentials = parts.username + (f":{parts.password}" if parts.password else "")
+        netloc = f"{credentials}@{netloc}"
+    path = parts.path or "/"
+    if path != "/":
+        path = path.rstrip("/")
+    params = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking_param(k)]
+    query = urlencode(sorted(params))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def parse_links(html: str, base_url: str) -> List[Dict[str, str]]:
+    """Return every ``<a href>`` in ``html`` with relative links made absolute."""
+    soup = BeautifulSoup(html, "html.parser")
+    links = []
+    for a_tag in soup.find_all("a", href=True):
+        if not isinstance(a_tag, Tag):
+            continue
+
+        href_value = a_tag.get("href", "")
+        if isinstance(href_value, list):
+            href = href_value[0] if href_value else ""
+        else:
+            href = href_value or ""
+
+        text = a_tag.get_text(strip=True)
+
+        if not href or href.lower().startswith("javascript:"):
+            continue
+
+        if not urlsplit(href).scheme:
+            href = urljoin(base_url, href)
+
+        links.append({"url": href, "text": text if text else href})
+    return links
+
+
+def _tokens(text: str) -> set[str]:
+    return {_stemmer.stem(t) for t in _WORD_PATTERN.findall(text.lower())}
+
+
+def _relevance(link: Dict[str, str], query_tokens: set[str]) -> float:
+    """Score a link by how many query terms its anchor text (and URL) cover."""
+    if not query_tokens:
+        return 0.0
+    text_hits = len(query_tokens & _tokens(link["text"]))
+    url_hits = len(query_tokens & _tokens(urlsplit(link["url"]).path))
+    return (text_hits + 0.5 * url_hits) / len(query_tokens)
+
+
+def clean_links(
+    links: Iterable[Dict[str, str]],
+    base_url: str,
+    *,
+    query: str = "",
+    same_domain: bool = False,
+    file_types: Optional[List[str]] = None,
+    top_n: Optional[int] = None,
+) -> List[Dict[str, str]]:
+    """Normalize, deduplicate, filter and rank extracted links.
+
+    Args:
+        links: Items with ``url`` and ``text`` keys as produced by the extractors.
+        base_url: Page the links were found on, used for relative links and
+            the ``same_domain`` filter.
+        query: Optional text used to rank links by anchor-text relevance.
+        same_domain: Keep only links on the page's host or its subdomains.
+        file_types: Keep only links whose path ends with one of these
+            extensions (e.g. ``["pdf"]``).
+        top_n: Return at most this many links.
+    """
+    base_host = _host(base_url)
+    extensions = tuple("." + ext.lower().lstrip(".") for ext in file_types or [])
+
+    unique: Dict[str, Dict[str, str]] = {}
+    for link in links:
+        href = link.get("url", "")
+        if not href:
+            continue
+        try:
+            url = normalize_url(href, base_url)
+        except ValueError:
+            continue  # e.g. "http://example.com:abc/"; not a link we could fetch
+        if urlsplit(url).scheme not in ALLOWED_SCHEMES:
+            continue
+        if same_domain:
+            host = _host(url)
+            if host != base_host and not host.endswith("." + base_host):
+                continue
+        if extensions and not urlsplit(url).path.lower().endswith(extensions):
+            continue
+        text = (link.get("text") or "").strip()
+        if text in (href, url):
+            # The extractors fall back to the href when an anchor has no text
+            text = ""
+        existing = unique.get(url)
+        if existing is None:
+            unique[url] = {"url": url, "text": text or url}
+        elif existing["text"] == url and text:
+            existing["text"] = text
+
+    cleaned = list(unique.values())
+    query_tokens = _tokens(query) if query else set()
+    if query_tokens:
+        cleaned.sort(key=lambda link: _relevance(link, query_tokens), reverse=True)
+    if top_n is not None:
+        cleaned = cleaned[:max(top_n, 0)]
+    return cleaned
@@ -1,8 +1,13 @@
 from typing import Dict, Any
+import asyncio
 import logging
+import os
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.webdriver import WebDriver
 
 from .mcp import mcp
+from .driver_pool import DriverPool
+from .resilience import call_with_retries, TIMEOUT
 from .webscraper import chrome_options, create_driver
 from .prompt_utils import load_prompt
 
@@ -12,16 +17,36 @@ logger = logging.getLogger(__name__)
 PROMPT = load_prompt("open_in_user_browser")
 
 
+def _create_user_driver() -> WebDriver:
+    options = Options()
+    for arg in chrome_options.arguments:
+        if arg != "--headless":
+            options.add_argument(arg)
+    return create_driver(opts=options)
+
+
+# Visible windows stay open for reuse until they have been idle for a while
+user_drivers = DriverPool(
+    _create_user_driver,
+    max_size=1,
+    idle_timeout=float(os.getenv("USER_BROWSER_IDLE_TIMEOUT", "600")),
+)
+
+
+def _open(driver: WebDriver, url: str, timeout: float = TIMEOUT) -> str:
+    # Without a page-load timeout a hung page would hold the only user window
+    driver.set_page_load_timeout(timeout)
+    driver.get(url)
+    return driver.page_source
+
+
 @mcp.tool(description=PROMPT)
-def open_in_user_browser(url: str) -> Dict[str, Any]:
+async def open_in_user_browser(url: str) -> Dict[str, Any]:
     try:
-        options = Options()
-        for arg in chrome_options.arguments:
-            if arg != "--headless":
-                options.add_argument(arg)
-        driver = create_driver(opts=options)
-        driver.get(url)
-        page_source = driver.page_source
+        async with user_drivers.lease() as driver:
+            page_source = await call_with_retries(
+                url, lambda remaining: asyncio.to_thread(_open, driver, url, remaining)
+            )
         return {
             "status": "success",
             "message": f"Opened {url} in the user browser",
@@ -45,5 +70,6 @@ if __name__ == "__main__":
     parser.add_argument("url", help="the page to open")
     args = parser.parse_args()
 
-    result = open_in_user_browser(args.url)
+    result = asyncio.run(open_in_user_browser(args.url))
     print(json.dumps(result, indent=2))
+    user_drivers.close()
@@ -1,59 +1,187 @@
+import asyncio
 import logging
-from typing import Any, Dict
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
 
 from langchain_ollama import ChatOllama
 from langchain_core.messages import HumanMessage
 from langchain_core.tools import tool
 from langgraph.prebuilt import create_react_agent
-from playwright.sync_api import sync_playwright
+from playwright.async_api import BrowserContext, Page
 
 from settings import get_setting
 
 from .mcp import mcp
+from .dom_snapshot import resolve_target, snapshot
+from .link_utils import normalize_url
 from .prompt_utils import load_prompt
+from .resilience import call_with_retries, TIMEOUT
+from .webscraper import scraper
 
 logger = logging.getLogger(__name__)
 
 
 PROMPT = load_prompt("react_browser_task")
 
+# Sessions idle for longer than this are closed
+SESSION_TTL = float(os.getenv("REACT_SESSION_TTL", "600"))
+MAX_SESSIONS = int(os.getenv("REACT_MAX_SESSIONS", "8"))
+# Size of the page snapshot handed to the LLM on each page_content call
+SNAPSHOT_TOKENS = int(os.getenv("REACT_SNAPSHOT_TOKENS", "1500"))
+
+
+@dataclass
+class BrowserSession:
+    context: BrowserContext
+    page: Page
+    last_used: float = field(default_factory=time.monotonic)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Calls holding or waiting for this session; it is never expired while in use
+    users: int = 0
+
+    def in_use(self) -> bool:
+        return self.users > 0 or self.lock.locked()
+
+    def alive(self) -> bool:
+        return not self.page.is_closed() and scraper.browser is not None and scraper.browser.is_connected()
+
+    async def close(self) -> None:
+        try:
+            await self.context.close()
+        except Exception as e:
+            logger.warning(f"Error closing browser session: {str(e)}")
+
+
+_sessions: Dict[str, BrowserSession] = {}
+
+
+async def _open_session() -> BrowserSession:
+    context = await scraper.new_context()
+    page = await context.new_page()
+    # Bounds clicks and reads by the agent; navigations get their own deadline below
+    page.set_default_timeout(TIMEOUT * 1000)
+    return BrowserSession(context=context, page=page)
+
+
+async def _expire_sessions() -> None:
+    """Close sessions past their TTL and the least recently used beyond MAX_SESSIONS."""
+    now = time.monotonic()
+    idle = {sid: s for sid, s in _sessions.items() if not s.in_use()}
+    expired = [sid for sid, s in idle.items() if now - s.last_used > SESSION_TTL or not s.alive()]
+    by_age = sorted((s.last_used, sid) for sid, s in idle.items() if sid not in expired)
+    expired += [sid for _, sid in by_age[:max(len(by_age) - MAX_SESSIONS, 0)]]
+    for sid in expired:
+        logger.info(f"Closing browser session {sid}")
+        await _sessions.pop(sid).close()
+
+
+async def _get_session(session_id: str) -> BrowserSession:
+    """Return the session for ``session_id``, marked in use; the caller must call :func:`_put_session`."""
+    await _expire_sessions()
+    session = _sessions.get(session_id)
+    loser = None
+    if session is None:
+        created = await _open_session()
+        # another call may have created the same session while we awaited
+        session = _sessions.get(session_id)
+        if session is None:
+            session = _sessions[session_id] = created
+        else:
+            loser = created
+    session.users += 1
+    session.last_used = time.monotonic()
+    if loser is not None:
+        await loser.close()
+    return session
+
+
+def _put_session(session: BrowserSession) -> None:
+    session.users -= 1
+    session.last_used = time.monotonic()
+
+
+async def close_sessions() -> None:
+    """Close every persistent session (used on shutdown)."""
+    while _sessions:
+        _, session = _sessions.popitem()
+        await session.close()
+
+
+async def _goto(page: Page, url: str) -> None:
+    await call_with_retries(url, lambda remaining: page.goto(url, timeout=remaining * 1000))
+
+
+async def _run_agent(page: Page, url: str, goal: str) -> str:
+    @tool
+    async def goto(target: str) -> str:
+        """Navigate the page to the target URL."""
+        await _goto(page, target)
+        return f"navigated to {target}"
+
+    @tool
+    async def click(target: str) -> str:
+        """Click an element by its snapshot id (e.g. e12) or a CSS selector."""
+        await page.click(resolve_target(target))
+        return f"clicked {target}"
+
+    @tool
+    async def extract(target: str) -> str:
+        """Return the visible text of an element by its snapshot id (e.g. e12) or a CSS selector."""
+        return await page.inner_text(resolve_target(target))
+
+    @tool
+    async def page_content() -> str:
+        """Return a compact view of the page: interactive elements with ids and a text outline."""
+        return await snapshot(page, SNAPSHOT_TOKENS)
+
+    llm = ChatOllama(model=get_setting("react_model", "qwen3:4b"))
+    agent = create_react_agent(llm, [goto, click, extract, page_content])
+
+    # Reused sessions are often already on the right page; skip the reload
+    if page.url == "about:blank" or normalize_url(page.url) != normalize_url(url):
+        await _goto(page, url)
+    result = await agent.ainvoke({"messages": [HumanMessage(content=goal)]})
+    messages = result.get("messages", [])
+    return messages[-1].content if messages else ""
+
 
 @mcp.tool(description=PROMPT)
-def react_browser_task(url: str, goal: str) -> Dict[str, Any]:
-    with sync_playwright() as pw:
-        browser = pw.chromium.launch(headless=True)
-        page = browser.new_page()
-
-        @tool
-        def goto(target: str) -> str:
-            page.goto(target)
-            return f"navigated to {target}"
-
-        @tool
-        def click(selector: str) -> str:
-            page.click(selector)
-            return f"clicked {selector}"
-
-        @tool
-        def extract(selector: str) -> str:
-            return page.inner_text(selector)
-
-        @tool
-        def page_content() -> str:
-            return page.content()
-
-        llm = ChatOllama(model=get_setting("react_model", "qwen3:4b"))
-        agent = create_react_agent(llm, [goto, click, extract, page_content])
-
-        goto(url)
-        result = agent.invoke({"messages": [HumanMessage(content=goal)]})
-        messages = result.get("messages", [])
-        final = messages[-1].content if messages else ""
-        browser.close()
+async def react_browser_task(
+    url: str,
+    goal: str,
+    session_id: Optional[str] = None,
+    close_session: bool = False,
+) -> Dict[str, Any]:
+    try:
+        async with scraper.busy():
+            if session_id is None:
+                session = await _open_session()
+                try:
+                    final = await _run_agent(session.page, url, goal)
+                finally:
+                    await session.close()
+            else:
+                session = await _get_session(session_id)
+                try:
+                    async with session.lock:
+                        final = await _run_agent(session.page, url, goal)
+                finally:
+                    _put_session(session)
+                if close_session:
+                    await _sessions.pop(session_id, session).close()
         return {
             "status": "success",
             "message": "interaction finished",
-            "data": {"content": final},
+            "data": {"content": final, "session_id": session_id},
+        }
+    except Exception as e:
+        logger.error(f"react_browser_task failed for {url}: {str(e)}")
+        return {
+            "status": "error",
+            "message": str(e),
+            "data": None,
         }
 
 
@@ -71,5 +199,11 @@ if __name__ == "__main__":
     parser.add_argument("goal", help="task description")
     args = parser.parse_args()
 
-    result = react_browser_task(args.url, args.goal)
+    async def main() -> Dict[str, Any]:
+        try:
+            return await react_browser_task(args.url, args.goal)
+        finally:
+            await scraper.cleanup()
+
+    result = asyncio.run(main())
     print(json.dumps(result, indent=2))
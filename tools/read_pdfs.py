@@ -0,0 +1,147 @@
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import os
+
+import xxhash
+from pypdf import PdfReader
+
+from settings import CACHE_DIR
+
+from .mcp import mcp
+from .cpu_pool import cpu_pool
+from .prompt_utils import load_prompt
+from .scrape_website import _score_sentences, _split_sentences
+
+logger = logging.getLogger(__name__)
+
+
+PROMPT = load_prompt("read_pdfs")
+
+PDF_CACHE_DIR = CACHE_DIR / "pdf_text"
+# Pages handed to one worker; smaller batches stream results sooner
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "8"))
+
+
+def _file_hash(path: str) -> str:
+    digest = xxhash.xxh64()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _page_count(path: str) -> int:
+    return len(PdfReader(path).pages)
+
+
+def _extract_pages(path: str, start: int, stop: int) -> List[str]:
+    """Extract the text of pages ``start`` to ``stop``; runs in the CPU pool."""
+    reader = PdfReader(path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _load_cached(digest: str) -> Optional[List[str]]:
+    cache_file = PDF_CACHE_DIR / f"{digest}.json"
+    try:
+        with cache_file.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached(digest: str, pages: List[str]) -> None:
+    try:
+        PDF_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = PDF_CACHE_DIR / f"{digest}.json.tmp"
+        with tmp_file.open("w", encoding="utf-8") as f:
+            json.dump(pages, f)
+        os.replace(tmp_file, PDF_CACHE_DIR / f"{digest}.json")
+    except OSError as e:
+        logger.warning(f"Could not cache PDF text: {str(e)}")
+
+
+async def _read_pdf(path: str, query: str, max_sentences: int) -> Dict[str, Any]:
+    """Extract (or load cached) page text and filter it against ``query``."""
+    size = os.path.getsize(path)
+    digest = await asyncio.to_thread(_file_hash, path)
+    pages = await asyncio.to_thread(_load_cached, digest)
+    cached = pages is not None
+    # (score, first page of batch, position, sentence) for streaming top-k
+    scored: List[Tuple[float, int, int, str]] = []
+
+    async def score(start: int, batch: List[str]) -> None:
+        text = "\n".join(batch)
+        results = await cpu_pool.run(_score_sentences, text, query, size=len(text))
+        scored.extend((s, start, i, sentence) for i, (s, sentence) in enumerate(results))
+
+    if pages is None:
+        count = await asyncio.to_thread(_page_count, path)
+        ranges = [(i, min(i + PDF_PAGES_PER_TASK, count)) for i in range(0, count, PDF_PAGES_PER_TASK)]
+        share = size // max(len(ranges), 1)
+
+        async def extract(start: int, stop: int) -> Tuple[int, List[str]]:
+            return start, await cpu_pool.run(_extract_pages, path, start, stop, size=share)
+
+        pages = [""] * count
+        for done in asyncio.as_completed([extract(start, stop) for start, stop in ranges]):
+            start, batch = await done
+            pages[start:start + len(batch)] = batch
+            if query:
+                await score(start, batch)
+        await asyncio.to_thread(_store_cached, digest, pages)
+    elif query:
+        await asyncio.gather(*(
+            score(i, pages[i:i + PDF_PAGES_PER_TASK]) for i in range(0, len(pages), PDF_PAGES_PER_TASK)
+        ))
+
+    full_text = "\n".join(pages)
+    if not query:
+        content = full_text
+    elif scored:
+        scored.sort(key=lambda x: (-x[0], x[1], x[2]))
+        content = " ".join(sentence for *_, sentence in scored[:max_sentences])
+    else:
+        content = " ".join(_split_sentences(full_text)[:max_sentences])
+    return {"file": path, "pages": len(pages), "cached": cached, "content": content}
+
+
+@mcp.tool(description=PROMPT)
+async def read_pdfs(files: List[str], query: str = "", max_sentences: int = 5) -> Dict[str, Any]:
+    """Extract text from local PDF files."""
+    try:
+        documents = []
+        for path in files:
+            path = os.path.expanduser(path)
+            logger.info("Reading PDF %s", path)
+            documents.append(await _read_pdf(path, query, max_sentences))
+
+        return {
+            "status": "success",
+            "no. of files": len(documents),
+            "message": "PDF text extracted" if documents else "No files read",
+            "data": {"documents": documents},
+        }
+    except Exception as e:  # noqa: BLE001
+        return {
+            "status": "error",
+            "message": str(e),
+            "data": None,
+        }
+
+
+read_pdfs.__doc__ = PROMPT
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="extract text from downloaded pdf files")
+    parser.add_argument("files", nargs="+", help="paths to pdf files")
+    parser.add_argument("--query", default="", help="only return sentences relevant to this text")
+    args = parser.parse_args()
+
+    result = asyncio.run(read_pdfs(args.files, args.query))
+    print(json.dumps(result, indent=2))
+    cpu_pool.shutdown()
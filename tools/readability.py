@@ -0,0 +1,133 @@
+from typing import Any, Dict
+
+# Articles shorter than this fall back to the whole body text
+MIN_ARTICLE_CHARS = 250
+
+# Readability-style main content extraction that runs inside the page.
+# Paragraph-like blocks add a score (length and commas) to their parent and
+# grandparent; candidates are weighted by class/id hints and link density,
+# and the best one plus sufficiently scored siblings becomes the article.
+# Only the article's headings and text blocks are sent back to Python.
+READABILITY_SCRIPT = """
+(minChars) => {
+  const words = (list) => new RegExp(list.join('|'), 'i');
+  const UNLIKELY = words(['banner', 'breadcrumb', 'combx', 'comment', 'community', 'consent', 'cookie', 'disqus',
+    'footer', 'gdpr', 'header', 'menu', 'modal', 'nav', 'newsletter', 'pagination', 'pager', 'popup', 'related',
+    'remark', 'replies', 'rss', 'share', 'shoutbox', 'sidebar', 'skyscraper', 'social', 'sponsor', 'subscribe',
+    'ad-break', 'agegate']);
+  const MAYBE = /and|article|body|column|content|main|shadow/i;
+  const POSITIVE = /article|body|content|entry|hentry|h-entry|main|page|post|text|blog|story/i;
+  const NEGATIVE = words(['hidden', 'banner', 'combx', 'comment', 'com-', 'contact', 'foot', 'footnote', 'masthead',
+    'media', 'meta', 'outbrain', 'promo', 'related', 'scroll', 'share', 'shoutbox', 'sidebar', 'skyscraper',
+    'sponsor', 'shopping', 'tags', 'tool', 'widget']);
+  const JUNK = 'nav, footer, aside, form, script, style, noscript, svg, [role=navigation], '
+    + '[role=banner], [role=contentinfo], [role=dialog], [aria-hidden=true]';
+  const PARAGRAPHS = 'p, pre, td, blockquote';
+  const BLOCKS = 'h1, h2, h3, h4, h5, h6, p, li, pre, blockquote, td, th, dt, dd, figcaption';
+  const TAG_SCORES = {DIV: 5, ARTICLE: 10, MAIN: 10, SECTION: 3, PRE: 3, TD: 3, BLOCKQUOTE: 3,
+    FORM: -3, OL: -3, UL: -3, DL: -3, LI: -3, TH: -5};
+
+  const clean = (text) => (text || '').replace(/\\s+/g, ' ').trim();
+  const hints = (el) => `${typeof el.className === 'string' ? el.className : ''} ${el.id || ''}`;
+  const unlikely = (el) => {
+    for (let node = el; node && node !== document.body; node = node.parentElement) {
+      const h = hints(node);
+      if (UNLIKELY.test(h) && !MAYBE.test(h) && node.tagName !== 'ARTICLE' && node.tagName !== 'MAIN') return true;
+    }
+    return false;
+  };
+  const junk = (el) => el.closest(JUNK) !== null || unlikely(el);
+  const visible = (el) => {
+    const style = getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden';
+  };
+  const classWeight = (el) => {
+    const h = hints(el);
+    return (POSITIVE.test(h) ? 25 : 0) - (NEGATIVE.test(h) ? 25 : 0);
+  };
+  const linkDensity = (el) => {
+    const total = clean(el.innerText).length;
+    if (!total) return 1;
+    let links = 0;
+    for (const a of el.querySelectorAll('a')) links += clean(a.innerText).length;
+    return links / total;
+  };
+
+  const scores = new Map();
+  const addScore = (el, score) => {
+    if (!el || el === document.documentElement) return;
+    if (!scores.has(el)) scores.set(el, (TAG_SCORES[el.tagName] || 0) + classWeight(el));
+    scores.set(el, scores.get(el) + score);
+  };
+  for (const p of document.body.querySelectorAll(PARAGRAPHS)) {
+    const text = clean(p.innerText);
+    if (text.length < 25 || junk(p)) continue;
+    const score = 1 + text.split(',').length + Math.min(3, Math.floor(text.length / 100));
+    addScore(p.parentElement, score);
+    if (p.parentElement) addScore(p.parentElement.parentElement, score / 2);
+  }
+
+  let top = null;
+  let topScore = 0;
+  for (const [el, score] of scores) {
+    const final = score * (1 - linkDensity(el));
+    scores.set(el, final);
+    if (final > topScore) {
+      top = el;
+      topScore = final;
+    }
+  }
+
+  const roots = [];
+  if (top) {
+    const threshold = Math.max(10, topScore * 0.2);
+    const siblings = top.parentElement ? Array.from(top.parentElement.children) : [top];
+    for (const el of siblings) {
+      if (el === top || (scores.get(el) || 0) >= threshold) roots.push(el);
+    }
+  }
+
+  const blocks = [];
+  let chars = 0;
+  const emit = (el) => {
+    const text = clean(el.innerText);
+    if (!text) return;
+    const tag = el.tagName.toLowerCase();
+    blocks.push({level: /^h[1-6]$/.test(tag) ? Number(tag[1]) : 0, item: tag === 'li', text});
+    chars += text.length;
+  };
+  for (const root of roots) {
+    if (root.matches(BLOCKS)) {
+      if (!junk(root) && visible(root)) emit(root);
+      continue;
+    }
+    const before = blocks.length;
+    for (const el of root.querySelectorAll(BLOCKS)) {
+      const outer = el.parentElement.closest(BLOCKS);
+      if ((outer && root.contains(outer)) || junk(el) || !visible(el)) continue;
+      emit(el);
+    }
+    if (blocks.length === before && !junk(root)) emit(root);
+  }
+
+  if (chars < minChars) {
+    return {title: document.title, blocks: [], body: document.body.innerText};
+  }
+  return {title: document.title, blocks, body: null};
+}
+"""
+
+
+def format_article(article: Dict[str, Any]) -> str:
+    """Render the script's result as text, marking headings with ``#`` and list items with ``-``."""
+    if article.get("body") is not None:
+        return article["body"]
+    lines = []
+    for block in article.get("blocks", []):
+        if block["level"]:
+            lines.append(f"{'#' * block['level']} {block['text']}")
+        elif block["item"]:
+            lines.append(f"- {block['text']}")
+        else:
+            lines.append(block["text"])
+    return "\n".join(lines)
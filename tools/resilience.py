@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import os
+import random
+import re
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from urllib3.exceptions import NameResolutionError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Both are passed by mcp.json; TIMEOUT is the overall budget for one tool call
+MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
+TIMEOUT = float(os.getenv("TIMEOUT", "30"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+BREAKER_THRESHOLD = int(os.getenv("BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "60"))
+
+RETRY_STATUS = {408, 425, 429, 500, 502, 503, 504}
+# Chromium network error codes (reported as ``net::ERR_...`` by Playwright and
+# Selenium) worth retrying. Name resolution failures are deliberately absent:
+# a host that does not resolve will not start resolving a second later.
+TRANSIENT_NET_ERRORS = {
+    "ERR_CONNECTION_RESET",
+    "ERR_CONNECTION_REFUSED",
+    "ERR_CONNECTION_CLOSED",
+    "ERR_CONNECTION_ABORTED",
+    "ERR_CONNECTION_FAILED",
+    "ERR_CONNECTION_TIMED_OUT",
+    "ERR_TIMED_OUT",
+    "ERR_NETWORK_CHANGED",
+    "ERR_INTERNET_DISCONNECTED",
+    "ERR_EMPTY_RESPONSE",
+    "ERR_HTTP2_PROTOCOL_ERROR",
+}
+NET_ERROR = re.compile(r"\bnet::(ERR_[A-Z0-9_]+)")
+# Browser crashes surface only as message text; both phrases contain spaces so
+# they cannot come from a URL embedded in the message
+CLOSED_MARKERS = ("target closed", "has been closed")
+
+
+class CircuitOpenError(Exception):
+    """Raised without contacting the host while its circuit is open."""
+
+
+def _name_not_resolved(exc: requests.ConnectionError) -> bool:
+    reason = exc.args[0] if exc.args else None
+    return isinstance(getattr(reason, "reason", reason), NameResolutionError)
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Return whether ``exc`` (or an exception it was raised from) is worth retrying.
+
+    Decisions rest on exception types and Chromium error codes, never on
+    free text that may include the requested URL.
+    """
+    while exc is not None:
+        if isinstance(exc, CircuitOpenError):
+            return False
+        if isinstance(exc, requests.ConnectionError):
+            return not _name_not_resolved(exc)
+        if isinstance(exc, (asyncio.TimeoutError, TimeoutError, requests.Timeout, PlaywrightTimeoutError,
+                            TimeoutException)):
+            return True
+        if isinstance(exc, requests.HTTPError):
+            return exc.response is not None and exc.response.status_code in RETRY_STATUS
+        match = NET_ERROR.search(str(exc))
+        if match:
+            return match.group(1) in TRANSIENT_NET_ERRORS
+        if isinstance(exc, (PlaywrightError, WebDriverException)):
+            first_line = str(exc).split("\n", 1)[0].lower()
+            if any(marker in first_line for marker in CLOSED_MARKERS):
+                return True
+        exc = exc.__cause__
+    return False
+
+
+def _host(url: str) -> str:
+    return (urlsplit(url).hostname or url).lower()
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN) -> None:
+        """Per-host breaker that fails fast after ``threshold`` consecutive transient errors.
+
+        While open, calls are rejected with the last error (negative cache)
+        until ``cooldown`` seconds pass; then a single trial call is let
+        through and its outcome closes or re-opens the circuit.
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures: Dict[str, int] = {}
+        self._opened: Dict[str, float] = {}
+        self._last_error: Dict[str, str] = {}
+        self._trial: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def check(self, url: str) -> None:
+        host = _host(url)
+        with self._lock:
+            opened = self._opened.get(host)
+            if opened is None:
+                return
+            if time.monotonic() - opened < self.cooldown or self._trial.get(host):
+                raise CircuitOpenError(
+                    f"{host} is failing, not retrying for now (last error: {self._last_error.get(host)})"
+                )
+            self._trial[host] = True  # half-open: let one call through
+
+    def success(self, url: str) -> None:
+        host = _host(url)
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened.pop(host, None)
+            self._trial.pop(host, None)
+
+    def failure(self, url: str, exc: BaseException) -> None:
+        host = _host(url)
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            self._last_error[host] = str(exc)
+            if self._trial.pop(host, False) or self._failures[host] >= self.threshold:
+                if host not in self._opened:
+                    logger.warning(f"Opening circuit for {host} after {self._failures[host]} failures")
+                self._opened[host] = time.monotonic()
+
+    def abandon(self, url: str) -> None:
+        """Forget a half-open trial whose caller gave up before it finished."""
+        with self._lock:
+            self._trial.pop(_host(url), None)
+
+    def is_open(self, url: str) -> bool:
+        with self._lock:
+            return _host(url) in self._opened
+
+
+breaker = CircuitBreaker()
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, RETRY_BASE_DELAY * 2 ** attempt)
+
+
+def _next_delay(url: str, exc: BaseException, attempt: int, retries: int, remaining: float) -> Optional[float]:
+    """Record a failed attempt and return the delay before the next one, or None to give up."""
+    transient = is_transient(exc)
+    if transient:
+        breaker.failure(url, exc)
+    else:
+        breaker.success(url)  # the host answered; the request itself was bad
+    if not transient or attempt >= retries or breaker.is_open(url):
+        return None
+    delay = _backoff(attempt)
+    if delay >= remaining:
+        return None
+    logger.warning(f"Attempt {attempt + 1} for {url} failed ({exc}); retrying in {delay:.2f}s")
+    return delay
+
+
+async def call_with_retries(
+    url: str,
+    func: Callable[[float], Awaitable[T]],
+    *,
+    timeout: Optional[float] = None,
+    retries: Optional[int] = None,
+) -> T:
+    """Run ``func(remaining_seconds)`` under one deadline with jittered retries.
+
+    Each attempt is cancelled when the deadline passes, which also cancels
+    any browser navigation it is awaiting.
+    """
+    timeout = TIMEOUT if timeout is None else timeout
+    retries = MAX_RETRIES if retries is None else retries
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        breaker.check(url)
+        remaining = deadline - time.monotonic()
+        try:
+            result = await asyncio.wait_for(func(remaining), remaining)
+        except asyncio.CancelledError:
+            breaker.abandon(url)
+            raise
+        except asyncio.TimeoutError as exc:
+            breaker.failure(url, exc)
+            raise TimeoutError(f"{url} did not respond within {timeout:.0f}s") from exc
+        except Exception as exc:  # noqa: BLE001
+            delay = _next_delay(url, exc, attempt, retries, deadline - time.monotonic())
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+        breaker.success(url)
+        return result
+
+
+def call_with_retries_sync(
+    url: str,
+    func: Callable[[float], T],
+    *,
+    timeout: Optional[float] = None,
+    retries: Optional[int] = None,
+) -> T:
+    """Blocking variant of :func:`call_with_retries`; ``func`` must honour the remaining time itself."""
+    timeout = TIMEOUT if timeout is None else timeout
+    retries = MAX_RETRIES if retries is None else retries
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        breaker.check(url)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"{url} did not respond within {timeout:.0f}s")
+        try:
+            result = func(remaining)
+        except Exception as exc:  # noqa: BLE001
+            delay = _next_delay(url, exc, attempt, retries, deadline - time.monotonic())
+            if delay is None:
+                raise
+            time.sleep(delay)
+            attempt += 1
+            continue
+        breaker.success(url)
+        return result
@@ -0,0 +1,201 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_MAX_CONCURRENCY = int(os.getenv("SCRAPER_MAX_CONCURRENCY", "4"))
+HOST_RATE = float(os.getenv("HOST_RATE", "1"))
+HOST_BURST = float(os.getenv("HOST_BURST", "3"))
+# Longest a request waits in the local queue; separate from the page-load TIMEOUT
+SLOT_TIMEOUT = float(os.getenv("SLOT_TIMEOUT", "60"))
+# Past this many tracked hosts, buckets that have refilled are dropped
+MAX_HOST_BUCKETS = int(os.getenv("MAX_HOST_BUCKETS", "1024"))
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+# Lower value is served first
+PRIORITIES = {INTERACTIVE: 0, BATCH: 1}
+
+
+class QueueTimeoutError(TimeoutError):
+    """Raised when a request waited too long for a slot; the host was never contacted."""
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        """Allow ``rate`` requests per second on average and ``burst`` at once."""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def full(self, now: float) -> bool:
+        """Whether the bucket has refilled, making it indistinguishable from a new one."""
+        return self.tokens + (now - self.updated) * self.rate >= self.burst
+
+    def reserve(self) -> float:
+        """Take a token and return how long to wait before using it.
+
+        The balance may go negative so that concurrent callers are spaced out
+        in the order they arrived.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self) -> None:
+        """Give back a token reserved by a caller that gave up before using it."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate + 1)
+        self.updated = now
+
+
+@dataclass
+class QueueMetrics:
+    queued: int = 0
+    served: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def record(self, wait: float) -> None:
+        self.served += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.served if self.served else 0.0
+
+
+class Scheduler:
+    def __init__(
+        self,
+        max_concurrency: int = SCRAPER_MAX_CONCURRENCY,
+        host_rate: float = HOST_RATE,
+        host_burst: float = HOST_BURST,
+        max_host_buckets: int = MAX_HOST_BUCKETS,
+        queue_timeout: float = SLOT_TIMEOUT,
+    ) -> None:
+        """Admit requests under per-host token buckets and a global concurrency cap.
+
+        Requests first wait for their host's token without holding a slot, so
+        one slow-to-admit site never blocks others, then wait for a global
+        slot where interactive requests are served before batch ones (FIFO
+        within a class). ``host_rate`` of 0 disables per-host limiting.
+        """
+        self.max_concurrency = max(max_concurrency, 1)
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.max_host_buckets = max_host_buckets
+        self.queue_timeout = queue_timeout
+        self.default_priority = INTERACTIVE
+        self._active = 0
+        self._waiters: List[List[Any]] = []
+        self._seq = itertools.count()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.metrics = {name: QueueMetrics() for name in PRIORITIES}
+
+    async def _host_turn(self, host: str) -> None:
+        if self.host_rate <= 0:
+            return
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            if len(self._buckets) >= self.max_host_buckets:
+                self._prune_buckets()
+            bucket = self._buckets[host] = TokenBucket(self.host_rate, self.host_burst)
+        delay = bucket.reserve()
+        if delay:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                bucket.refund()  # otherwise later requests wait for tokens nobody used
+                raise
+
+    def _prune_buckets(self) -> None:
+        now = time.monotonic()
+        for host in [host for host, bucket in self._buckets.items() if bucket.full(now)]:
+            del self._buckets[host]
+
+    async def _acquire(self, priority: str) -> None:
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [PRIORITIES[priority], next(self._seq), future])
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()  # the slot was handed over just as we were cancelled
+            raise
+
+    def _release(self) -> None:
+        while self._waiters:
+            future = heapq.heappop(self._waiters)[2]
+            if not future.done():
+                future.set_result(None)  # hand the slot over; active count is unchanged
+                return
+        self._active -= 1
+
+    @asynccontextmanager
+    async def slot(
+        self, url: str, priority: Optional[str] = None, timeout: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """Hold one scraper slot for ``url`` while the block runs.
+
+        Waiting longer than ``timeout`` (default ``queue_timeout``) raises
+        :class:`QueueTimeoutError`. Callers should enter the slot outside any
+        page-load deadline or circuit breaker, so local queueing is never
+        mistaken for a slow host.
+        """
+        priority = priority or self.default_priority
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {priority!r}; use one of {', '.join(PRIORITIES)}")
+        timeout = self.queue_timeout if timeout is None else timeout
+        metrics = self.metrics[priority]
+        queued_at = time.monotonic()
+        metrics.queued += 1
+        try:
+            async with asyncio.timeout(timeout if timeout > 0 else None):
+                await self._host_turn((urlsplit(url).hostname or url).lower())
+                await self._acquire(priority)
+        except TimeoutError as exc:
+            raise QueueTimeoutError(f"{priority} request for {url} waited over {timeout:.0f}s for a slot") from exc
+        finally:
+            metrics.queued -= 1
+        wait = time.monotonic() - queued_at
+        metrics.record(wait)
+        if wait > 1:
+            logger.info(f"{priority} request for {url} waited {wait:.1f}s for a slot")
+        try:
+            yield
+        finally:
+            self._release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current queue depths and wait times per priority class."""
+        return {
+            "active": self._active,
+            **{
+                name: {
+                    "queued": m.queued,
+                    "served": m.served,
+                    "avg_wait": round(m.avg_wait, 3),
+                    "max_wait": round(m.max_wait, 3),
+                }
+                for name, m in self.metrics.items()
+            },
+        }
+
+
+scheduler = Scheduler()
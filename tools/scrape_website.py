@@ -1,18 +1,24 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence
+import asyncio
 import logging
 import re
 from nltk.stem import PorterStemmer
 from nltk.tokenize import word_tokenize
 
 from .mcp import mcp
+from .cpu_pool import cpu_pool
 from .webscraper import scraper
 from .prompt_utils import load_prompt
+from .semantic import embedding_cache, get_embedder, rank_passages
 
 logger = logging.getLogger(__name__)
 
 
 PROMPT = load_prompt("scrape_website")
 _stemmer = PorterStemmer()
+RANKINGS = ("lexical", "semantic", "hybrid")
+# Sentences are grouped into passages of about this many characters for embedding
+PASSAGE_CHARS = 400
 
 
 def _tokenize(text: str) -> set[str]:
@@ -20,31 +26,87 @@ def _tokenize(text: str) -> set[str]:
     return {_stemmer.stem(t.lower()) for t in tokens if t.isalpha()}
 
 
-def _filter_content(content: str, query: str, max_sentences: int = 5) -> str:
-    sentences = re.split(r"(?<=[.!?])\s+", content)
+def _split_sentences(content: str) -> list[str]:
+    return re.split(r"(?<=[.!?])\s+", content)
+
+
+def _split_passages(content: str, max_chars: int = PASSAGE_CHARS) -> list[str]:
+    passages: list[str] = []
+    current = ""
+    for sentence in _split_sentences(content):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            passages.append(current)
+            current = ""
+        current = f"{current} {sentence}" if current else sentence
+    if current:
+        passages.append(current)
+    return passages
+
+
+def _jaccard(query_tokens: set[str], tokens: set[str]) -> float:
+    union = query_tokens | tokens
+    return len(query_tokens & tokens) / len(union) if union else 0
+
+
+def _score_sentences(content: str, query: str) -> list[tuple[float, str]]:
+    """Return ``(score, sentence)`` pairs for sentences that overlap the query."""
     query_tokens = _tokenize(query)
     scored: list[tuple[float, str]] = []
-    for sentence in sentences:
+    for sentence in _split_sentences(content):
         sent_tokens = _tokenize(sentence)
         if not sent_tokens:
             continue
-        intersection = query_tokens & sent_tokens
-        union = query_tokens | sent_tokens
-        score = len(intersection) / len(union) if union else 0
+        score = _jaccard(query_tokens, sent_tokens)
         if score:
             scored.append((score, sentence.strip()))
+    return scored
+
+
+def _filter_content(content: str, query: str, max_sentences: int = 5) -> str:
+    scored = _score_sentences(content, query)
     scored.sort(key=lambda x: x[0], reverse=True)
     if not scored:
-        return " ".join(sentences[:max_sentences])
+        return " ".join(_split_sentences(content)[:max_sentences])
     relevant = [s for _, s in scored[:max_sentences]]
     return " ".join(relevant)
 
 
+def _semantic_filter(content: str, query: str, ranking: str, max_passages: int = 3) -> str:
+    """Keep the passages closest to ``query`` in embedding space.
+
+    ``hybrid`` blends the cosine score with the lexical overlap so exact
+    term matches still count alongside paraphrases.
+    """
+    passages = _split_passages(content)
+    lexical: Optional[Sequence[float]] = None
+    if ranking == "hybrid":
+        query_tokens = _tokenize(query)
+        lexical = [_jaccard(query_tokens, _tokenize(p)) for p in passages]
+    ranked = rank_passages(query, passages, max_passages, get_embedder(), embedding_cache, lexical)
+    return "\n\n".join(p for _, p in ranked)
+
+
 @mcp.tool(description=PROMPT)
-async def scrape_website(url: str, query: str) -> Dict[str, Any]:
+async def scrape_website(
+    url: str, query: str, priority: str = "interactive", extract: str = "main", ranking: str = "lexical"
+) -> Dict[str, Any]:
     try:
-        content = await scraper.fetch_content(url)
-        content = _filter_content(content, query)
+        if ranking not in RANKINGS:
+            raise ValueError(f"Unknown ranking {ranking!r}; use one of {', '.join(RANKINGS)}")
+        content = await scraper.fetch_content(url, priority=priority, extract=extract)
+        filtered = None
+        if ranking != "lexical":
+            try:
+                # nothing kept (e.g. no passages survived) is treated like a failure
+                filtered = await asyncio.to_thread(_semantic_filter, content, query, ranking) or None
+            except Exception as e:
+                logger.warning(f"Semantic ranking failed, falling back to lexical: {str(e)}")
+        if filtered is None:
+            filtered = await cpu_pool.run(_filter_content, content, query, size=len(content))
+        content = filtered
         return {
             "status": "success",
             "no. of characters": len(content),
@@ -64,13 +126,13 @@ scrape_website.__doc__ = PROMPT
 
 if __name__ == "__main__":
     import argparse
-    import asyncio
     import json
 
     parser = argparse.ArgumentParser(description="scrape relevant text from a website")
     parser.add_argument("url", help="page to scrape")
     parser.add_argument("query", help="information to look for")
+    parser.add_argument("--ranking", choices=RANKINGS, default="lexical", help="how passages are scored")
     args = parser.parse_args()
 
-    result = asyncio.run(scrape_website(args.url, args.query))
+    result = asyncio.run(scrape_website(args.url, args.query, ranking=args.ranking))
     print(json.dumps(result, indent=2))
@@ -0,0 +1,143 @@
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import xxhash
+
+logger = logging.getLogger(__name__)
+
+# "ollama" calls the embeddings endpoint; "hashing" is a dependency-free local stand-in
+EMBEDDER = os.getenv("EMBEDDER", "ollama")
+EMBED_MODEL = os.getenv("EMBED_MODEL", "nomic-embed-text")
+# Passages sent to the embedder per request
+EMBED_BATCH = int(os.getenv("EMBED_BATCH", "64"))
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "20000"))
+# Weight of the lexical score in hybrid ranking; the cosine score gets the rest
+LEXICAL_WEIGHT = float(os.getenv("LEXICAL_WEIGHT", "0.3"))
+
+_WORD = re.compile(r"\w+")
+
+Embedder = Callable[[List[str]], np.ndarray]
+
+
+class OllamaEmbedder:
+    def __init__(self, model: str = EMBED_MODEL) -> None:
+        """Embed texts with Ollama's ``/api/embed`` endpoint."""
+        self.name = f"ollama:{model}"
+        self.model = model
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        from ollama import embed
+
+        return np.asarray(embed(model=self.model, input=texts)["embeddings"], dtype=np.float32)
+
+
+class HashingEmbedder:
+    def __init__(self, dim: int = 512) -> None:
+        """Signed feature hashing of lower-cased words; no model or network needed."""
+        self.name = f"hashing:{dim}"
+        self.dim = dim
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in _WORD.findall(text.lower()):
+                h = xxhash.xxh32_intdigest(word.encode("utf-8"))
+                vectors[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        return vectors
+
+
+def create_embedder(kind: str = EMBEDDER) -> Embedder:
+    if kind == "hashing":
+        return HashingEmbedder()
+    if kind == "ollama":
+        return OllamaEmbedder()
+    raise ValueError(f"Unknown embedder {kind!r}; use ollama or hashing")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class EmbeddingCache:
+    def __init__(self, max_entries: int = EMBED_CACHE_SIZE) -> None:
+        """LRU of unit-length embeddings keyed by embedder name and passage hash."""
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._vectors: "OrderedDict[Tuple[str, int], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed(self, embedder: Embedder, texts: Sequence[str]) -> np.ndarray:
+        """Return a ``len(texts) x dim`` matrix, embedding only passages not seen before."""
+        name = getattr(embedder, "name", repr(embedder))
+        keys = [(name, xxhash.xxh64_intdigest(text.encode("utf-8"))) for text in texts]
+        found: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for key in keys:
+                vector = self._vectors.get(key)
+                if vector is not None:
+                    self._vectors.move_to_end(key)
+                found.append(vector)
+            missing = [i for i, vector in enumerate(found) if vector is None]
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            logger.debug(f"Embedding {len(missing)} of {len(texts)} passages; the rest were cached")
+        for start in range(0, len(missing), EMBED_BATCH):
+            batch = missing[start:start + EMBED_BATCH]
+            vectors = _normalize(embedder([texts[i] for i in batch]))
+            with self._lock:
+                for i, vector in zip(batch, vectors):
+                    found[i] = vector
+                    self._vectors[keys[i]] = vector
+                while len(self._vectors) > self.max_entries:
+                    self._vectors.popitem(last=False)
+        if not found:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack(found)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indexes of the ``k`` highest scores, best first."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=int)
+    best = np.argpartition(-scores, k - 1)[:k]
+    return best[np.argsort(-scores[best], kind="stable")]
+
+
+def rank_passages(
+    query: str,
+    passages: List[str],
+    k: int,
+    embedder: Embedder,
+    cache: EmbeddingCache,
+    lexical: Optional[Sequence[float]] = None,
+    lexical_weight: float = LEXICAL_WEIGHT,
+) -> List[Tuple[float, str]]:
+    """Rank ``passages`` by cosine similarity to ``query``, optionally blended with lexical scores."""
+    if not passages:
+        return []
+    # cached embeddings are unit length, so the dot product is the cosine similarity
+    vectors = cache.embed(embedder, [query, *passages])
+    scores = vectors[1:] @ vectors[0]
+    if lexical is not None:
+        scores = (1 - lexical_weight) * scores + lexical_weight * np.asarray(lexical, dtype=np.float32)
+    return [(float(scores[i]), passages[i]) for i in top_k(scores, k)]
+
+
+embedding_cache = EmbeddingCache()
+_embedder: Optional[Embedder] = None
+
+
+def get_embedder() -> Embedder:
+    global _embedder
+    if _embedder is None:
+        _embedder = create_embedder()
+    return _embedder
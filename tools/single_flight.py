@@ -0,0 +1,61 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self, task: "asyncio.Task[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        """Share one in-flight task between concurrent callers with the same key.
+
+        Each caller may give up on its own (timeout or cancellation) without
+        affecting the others; the shared task is only cancelled when the last
+        caller waiting for it leaves.
+        """
+        self._calls: Dict[Hashable, _Call] = {}
+        self.started = 0
+        self.joined = 0
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[T]],
+        timeout: Optional[float] = None,
+    ) -> T:
+        loop = asyncio.get_running_loop()
+        call = self._calls.get(key)
+        if call is not None and (call.task.done() or call.task.get_loop() is not loop):
+            call = None  # finished, or owned by another event loop
+        if call is None:
+            call = _Call(loop.create_task(func()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, c=call: self._forget(key, c))
+            self.started += 1
+        else:
+            self.joined += 1
+            logger.info(f"Joining in-flight request for {key}")
+        call.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(call.task), timeout)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                logger.info(f"Last waiter left; cancelling in-flight request for {key}")
+                call.task.cancel()
+                self._forget(key, call)
+
+    def __len__(self) -> int:
+        return len(self._calls)
@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import tldextract
+
+from settings import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+PERSIST_STORAGE_STATE = os.getenv("PERSIST_STORAGE_STATE", "true").lower() == "true"
+# Saved states older than this are discarded, forcing a fresh consent/login
+STORAGE_STATE_MAX_AGE = float(os.getenv("STORAGE_STATE_MAX_AGE", str(7 * 24 * 3600)))
+STORAGE_STATE_DIR = CACHE_DIR / "storage_state"
+
+# The bundled suffix list snapshot, without fetching a fresh one at runtime;
+# private suffixes keep tenants of shared hosts like github.io apart
+_suffixes = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None, include_psl_private_domains=True)
+
+
+def domain_key(url: str) -> str:
+    """Site a URL belongs to: its registrable domain, or the host for IPs and local names.
+
+    Using the public suffix list, ``www.example.com`` and ``shop.example.com``
+    share one key while ``a.github.io`` and ``b.github.io`` do not.
+    """
+    host = (urlsplit(url).hostname or url).lower().rstrip(".")
+    parts = _suffixes(host)
+    return f"{parts.domain}.{parts.suffix}" if parts.domain and parts.suffix else host
+
+
+def _belongs(domain: str, keys: Iterable[str]) -> bool:
+    """Whether a cookie or origin for ``domain`` is sent to one of the sites in ``keys``."""
+    domain = domain.lower().lstrip(".")
+    return any(domain == key or domain.endswith(f".{key}") or key.endswith(f".{domain}") for key in keys)
+
+
+class StorageStateStore:
+    def __init__(self, root: Path = STORAGE_STATE_DIR, max_age: float = STORAGE_STATE_MAX_AGE) -> None:
+        """Per-site Playwright storage state (cookies and localStorage) kept on disk.
+
+        States are loaded into new browser contexts so repeat visits skip
+        consent pages and logins. Expired cookies are dropped on load and a
+        whole state is discarded once it is older than ``max_age`` seconds.
+        Files are only rewritten when the state changed.
+        """
+        self.root = Path(root)
+        self.max_age = max_age
+        self._saved: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def load(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the saved state for ``url``'s site, or ``None`` if there is none or it expired."""
+        key = domain_key(url)
+        path = self._path(key)
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - data.get("saved_at", 0) > self.max_age:
+            logger.info(f"Storage state for {key} expired; starting fresh")
+            self.forget(url)
+            return None
+        now = time.time()
+        state = data["state"]
+        cookies = [c for c in state.get("cookies", []) if c.get("expires", -1) in (-1, None) or c["expires"] > now]
+        return {"cookies": cookies, "origins": state.get("origins", [])}
+
+    def save(self, url: str, state: Dict[str, Any], *, visited: Iterable[str] = ()) -> bool:
+        """Store the cookies and localStorage of ``url``'s site (and any ``visited`` redirect targets).
+
+        Third-party cookies picked up while loading the page are not kept.
+        Returns whether the file was written.
+        """
+        key = domain_key(url)
+        keys = {key, *(domain_key(v) for v in visited)}
+        kept = {
+            "cookies": [c for c in state.get("cookies", []) if _belongs(c.get("domain", ""), keys)],
+            "origins": [o for o in state.get("origins", []) if _belongs(urlsplit(o["origin"]).hostname or "", keys)],
+        }
+        if not kept["cookies"] and not kept["origins"]:
+            return False
+        encoded = json.dumps(kept, sort_keys=True)
+        with self._lock:
+            if self._saved.get(key) == encoded and self._path(key).exists():
+                return False
+            self.root.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp = path.with_suffix(".tmp")
+            # cookies can hold login sessions; keep them private to the user
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"saved_at": time.time(), "state": kept}, f)
+            os.replace(tmp, path)
+            self._saved[key] = encoded
+        return True
+
+    def forget(self, url: str) -> None:
+        key = domain_key(url)
+        with self._lock:
+            self._saved.pop(key, None)
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+
+
+storage_states = StorageStateStore()
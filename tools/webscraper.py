@@ -2,12 +2,15 @@ import logging
 import os
 import re
 import shutil
-from typing import Optional, List, Dict
-from urllib.parse import urljoin
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, List, Dict, TypeVar
 
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup
 from langdetect import detect, LangDetectException  # noqa: F401
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.remote.webdriver import WebDriver
@@ -15,10 +18,38 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 import asyncio
-from playwright.async_api import async_playwright
+from playwright.async_api import BrowserContext, Page, Route, async_playwright
+
+try:
+    import psutil
+except ImportError:  # optional, only needed for memory-based recycling
+    psutil = None
+
+from settings import CACHE_DIR
+
+from .cpu_pool import cpu_pool
+from .driver_pool import DriverPool
+from .fetch_profiles import BROWSER_STRATEGIES, FETCH_MIN_CHARS, STRATEGIES, fetch_profiles
+from .http_client import http
+from .link_utils import clean_links, normalize_url, parse_links
+from .readability import format_article, MIN_ARTICLE_CHARS, READABILITY_SCRIPT
+from .resilience import call_with_retries, TIMEOUT
+from .scheduler import scheduler
+from .single_flight import SingleFlight
+from .storage_state import PERSIST_STORAGE_STATE, storage_states
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+SELENIUM_POOL_SIZE = int(os.getenv("SELENIUM_POOL_SIZE", "2"))
+SELENIUM_IDLE_TIMEOUT = float(os.getenv("SELENIUM_IDLE_TIMEOUT", "300"))
+CHROMEDRIVER_CACHE_FILE = CACHE_DIR / "chromedriver_path"
+# "main" keeps only the article found by the in-page readability script; "full" returns all body text
+EXTRACT_MODES = ("main", "full")
+# Not downloaded by the "light" fetch strategy
+BLOCKED_RESOURCES = {"image", "media", "font"}
+
 chrome_options = Options()
 chrome_options.add_argument('--headless')
 chrome_options.add_argument('--no-sandbox')
@@ -51,6 +82,44 @@ def _get_chrome_binary() -> Optional[str]:
     return None
 
 
+_chromedriver_lock = threading.Lock()
+_chromedriver_path: Optional[str] = None
+
+
+def _resolve_chromedriver(refresh: bool = False) -> str:
+    """Return the chromedriver path, resolving it at most once per process.
+
+    ``CHROMEDRIVER_PATH`` wins when set. Otherwise the path found by
+    webdriver-manager is remembered on disk so later processes skip the
+    version lookup; ``refresh`` forces a new lookup.
+    """
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path and not refresh and os.path.exists(_chromedriver_path):
+            return _chromedriver_path
+
+        env_path = os.getenv("CHROMEDRIVER_PATH")
+        if env_path and os.path.exists(env_path):
+            _chromedriver_path = env_path
+            return env_path
+
+        if not refresh and CHROMEDRIVER_CACHE_FILE.exists():
+            cached = CHROMEDRIVER_CACHE_FILE.read_text().strip()
+            if cached and os.access(cached, os.X_OK):
+                logger.info(f"Using cached chromedriver at {cached}")
+                _chromedriver_path = cached
+                return cached
+
+        path = ChromeDriverManager().install()
+        try:
+            CHROMEDRIVER_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            CHROMEDRIVER_CACHE_FILE.write_text(path)
+        except OSError as e:
+            logger.warning(f"Could not cache chromedriver path: {str(e)}")
+        _chromedriver_path = path
+        return path
+
+
 def create_driver(opts: Optional[Options] = None) -> WebDriver:
     """Initialize and return a Chrome WebDriver."""
     options = opts or chrome_options
@@ -61,16 +130,58 @@ def create_driver(opts: Optional[Options] = None) -> WebDriver:
     else:
         logger.warning("Chrome binary not found; relying on default discovery")
 
-    return webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()), options=options
+    try:
+        return webdriver.Chrome(service=Service(_resolve_chromedriver()), options=options)
+    except SessionNotCreatedException:
+        # Chrome was probably updated and the cached driver no longer matches
+        logger.warning("Cached chromedriver rejected by Chrome; resolving a new one")
+        return webdriver.Chrome(service=Service(_resolve_chromedriver(refresh=True)), options=options)
+
+
+def _load_in_driver(driver: WebDriver, url: str, settle: float, timeout: float = TIMEOUT) -> None:
+    """Navigate ``driver`` to ``url`` and wait for the body to render (blocking)."""
+    driver.set_page_load_timeout(timeout)
+    driver.get(url)
+    WebDriverWait(driver, timeout).until(
+        EC.presence_of_element_located(("tag name", "body"))
     )
+    time.sleep(settle)
+
+
+def _get_html(url: str, timeout: float) -> str:
+    response = http.get(url, timeout=timeout, headers={"User-Agent": user_agent})
+    response.raise_for_status()
+    content_type = response.headers.get("content-type", "text/html")
+    if "html" not in content_type:
+        raise Exception(f"Expected an HTML page but got {content_type}")
+    return response.text
+
+
+def _parse_and_clean_links(html: str, url: str) -> List[Dict[str, str]]:
+    return clean_links(parse_links(html, url), url)
+
+
+def _static_text(html: str) -> str:
+    """Body text of server-rendered HTML, for the strategy that skips the browser."""
+    soup = BeautifulSoup(html, "html.parser")
+    # "enable JavaScript" notices must not make a client-rendered shell look like a page
+    for element in soup.find_all(["script", "style", "noscript", "template"]):
+        element.decompose()
+    return soup.body.get_text(separator="\n", strip=True) if soup.body else ""
+
+
+async def _block_heavy_resources(route: Route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
 
 
 class WebScraper:
     def __init__(self, mode: str = "playwright") -> None:
         """Create a web scraper using either Selenium or Playwright."""
         self.mode = mode.lower()
-        self.driver: Optional[WebDriver] = None
+        self.drivers: Optional[DriverPool] = None
         self.unwanted_elements = [
             'script', 'style', 'nav', 'footer', 'header', 'aside',
             'iframe', 'noscript', 'svg', 'form', 'button', 'input',
@@ -88,51 +199,125 @@ class WebScraper:
             re.compile(r'^[A-Z\s]+$'),
             re.compile(r'cookie|privacy|terms|conditions', re.IGNORECASE)
         ]
+        self._inflight = 0
+        self._closing = False
+        self._recycling = False
+        self._launch_lock = asyncio.Lock()
+        # Concurrent requests for the same page share one navigation
+        self.flights = SingleFlight()
+        self.persist_state = PERSIST_STORAGE_STATE
         if self.mode == "playwright":
             # Delay Playwright startup until first use so we can await it
             self.playwright = None
             self.browser = None
-            self.page = None
             logger.info("WebScraper (async‑Playwright) will initialise on first request")
         else:
-            try:
-                logger.info("Initializing Chrome WebDriver...")
-                self.driver = create_driver()
-                logger.info("Chrome WebDriver initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize Chrome WebDriver: {str(e)}")
-                self.driver = None
+            self.drivers = DriverPool(
+                create_driver, max_size=SELENIUM_POOL_SIZE, idle_timeout=SELENIUM_IDLE_TIMEOUT
+            )
+
+    def _browser_alive(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
 
-    async def _ensure_page(self) -> None:
-        """Lazily start Playwright, browser and page (async‑safe)."""
-        if self.page:
+    async def _ensure_browser(self) -> None:
+        """Lazily start Playwright and the browser, relaunching it if it died."""
+        if self._browser_alive() and not self._recycling:
             return
 
-        if not self.playwright:
-            self.playwright = await async_playwright().start()
+        async with self._launch_lock:
+            if self._browser_alive():
+                return
+            if self.browser:
+                logger.warning("Playwright browser disconnected; relaunching")
+                await self._close_browser()
 
-        if not self.browser:
+            if not self.playwright:
+                self.playwright = await async_playwright().start()
             self.browser = await self.playwright.chromium.launch(headless=True)
+            logger.info("Playwright browser launched")
 
-        if not self.page:
-            self.page = await self.browser.new_page(user_agent=user_agent)
+    async def _close_browser(self) -> None:
+        if self.browser:
+            try:
+                await self.browser.close()
+            except Exception as e:
+                logger.error(f"Error closing Playwright browser: {str(e)}")
+            self.browser = None
+
+    @asynccontextmanager
+    async def busy(self) -> AsyncIterator[None]:
+        """Count the enclosed work as in flight so recycling and shutdown wait for it."""
+        if self._closing:
+            raise Exception("WebScraper is shutting down")
+        self._inflight += 1
+        try:
+            yield
+        finally:
+            self._inflight -= 1
+
+    async def new_context(self, url: Optional[str] = None) -> BrowserContext:
+        """Open a browser context on the shared browser; the caller must close it.
+
+        With ``url`` the context starts with the cookies and localStorage
+        saved from earlier visits to that site.
+        """
+        await self._ensure_browser()
+        assert self.browser is not None
+        state = await asyncio.to_thread(storage_states.load, url) if url and self.persist_state else None
+        context = await self.browser.new_context(user_agent=user_agent, storage_state=state)
+        context.set_default_navigation_timeout(TIMEOUT * 1000)
+        return context
+
+    async def _save_state(self, context: BrowserContext, page: Page, url: str) -> None:
+        try:
+            state = await context.storage_state()
+            if await asyncio.to_thread(storage_states.save, url, state, visited=[page.url]):
+                logger.debug(f"Saved browser storage state for {url}")
+        except Exception as e:
+            logger.warning(f"Could not save browser storage state for {url}: {str(e)}")
+
+    @asynccontextmanager
+    async def _page(self, url: Optional[str] = None) -> AsyncIterator[Page]:
+        """Yield a fresh page in its own browser context and track it as in flight.
+
+        With ``url`` the site's saved storage state is loaded first and, if
+        the block succeeds, saved again for the next visit.
+        """
+        async with self.busy():
+            context = await self.new_context(url)
+            try:
+                page = await context.new_page()
+                yield page
+                if url and self.persist_state:
+                    await self._save_state(context, page, url)
+            finally:
+                await context.close()
 
     async def _ensure_driver(self) -> None:
         # NOTE: this method is now awaited by callers
         if self.mode == "playwright":
-            await self._ensure_page()
+            await self._ensure_browser()
         else:
-            if self.driver:
+            assert self.drivers is not None
+            if self.drivers.size:
                 return
             try:
-                logger.info("Attempting to reinitialize Chrome WebDriver...")
-                self.driver = await asyncio.get_running_loop().run_in_executor(None, create_driver)
-                logger.info("Chrome WebDriver reinitialized successfully")
+                logger.info("Initializing Chrome WebDriver...")
+                async with self.drivers.lease():
+                    pass
+                logger.info("Chrome WebDriver initialized successfully")
             except Exception as e:
                 error_msg = f"Failed to initialize Chrome WebDriver: {str(e)}"
                 logger.error(error_msg)
                 raise Exception(error_msg)
 
+    async def _with_driver(self, func: Callable[[WebDriver], T]) -> T:
+        """Run blocking ``func(driver)`` on a pooled driver in a worker thread."""
+        assert self.drivers is not None
+        async with self.busy():
+            async with self.drivers.lease() as driver:
+                return await asyncio.to_thread(func, driver)
+
     def _clean_text(self, text: str) -> str:
         text = re.sub(r'\s+', ' ', text)
         text = re.sub(r'[^\w\s.,!?-]', '', text)
@@ -168,73 +353,149 @@ class WebScraper:
 
         return main_content.get_text(separator='\n', strip=True) if main_content else ''
 
-    async def extract_links(self, url: str) -> List[Dict[str, str]]:
-        await self._ensure_driver()
+    async def _coalesced(
+        self,
+        kind: str,
+        url: str,
+        func: Callable[[str, float], Awaitable[T]],
+        timeout: Optional[float],
+        priority: Optional[str],
+    ) -> T:
+        key = (kind, self.mode, normalize_url(url))
+        timeout = TIMEOUT if timeout is None else timeout
+
+        async def load() -> T:
+            # queued outside the deadline so local throttling never counts against the host
+            async with scheduler.slot(url, priority):
+                return await call_with_retries(url, lambda remaining: func(url, remaining), timeout=timeout)
+
+        try:
+            return await self.flights.do(key, load)
+        except asyncio.TimeoutError as e:
+            error_msg = f"Timed out waiting for {url}: {str(e)}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
 
+    async def extract_links(
+        self, url: str, timeout: Optional[float] = None, priority: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """Return cleaned links; concurrent calls for the same URL share one page load."""
+        return await self._coalesced("links", url, self._extract_links, timeout, priority)
+
+    async def fetch_content(
+        self,
+        url: str,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+        extract: str = "main",
+    ) -> str:
+        """Return the page text; concurrent calls for the same URL share one page load.
+
+        ``extract="main"`` returns only the main article (headings marked with
+        ``#``), ``"full"`` the whole body text.
+        """
+        if extract not in EXTRACT_MODES:
+            raise ValueError(f"Unknown extract mode {extract!r}; use one of {', '.join(EXTRACT_MODES)}")
+        return await self._coalesced(
+            f"content:{extract}",
+            url,
+            lambda u, remaining: self._fetch_content(u, remaining, extract),
+            timeout,
+            priority,
+        )
+
+    async def _extract_links(self, url: str, timeout: float = TIMEOUT) -> List[Dict[str, str]]:
         try:
             logger.info(f"Extracting links from URL: {url}")
             if self.mode == "playwright":
-                assert self.page is not None
-                await self.page.goto(url, wait_until="domcontentloaded")
-                html_content = await self.page.content()
+                async with self._page(url) as page:
+                    await page.goto(url, wait_until="domcontentloaded", timeout=timeout * 1000)
+                    html_content = await page.content()
             else:
-                assert self.driver is not None
-                await asyncio.get_running_loop().run_in_executor(None, self.driver.get, url)
-                WebDriverWait(self.driver, 30).until(
-                    EC.presence_of_element_located(("tag name", "body"))
-                )
-                await asyncio.sleep(2)
-                html_content = self.driver.page_source
-            soup = BeautifulSoup(html_content, 'html.parser')
-
-            links = []
-            for a_tag in soup.find_all('a', href=True):
-                if not isinstance(a_tag, Tag):
-                    continue
-
-                href_value = a_tag.get('href', '')
-                if isinstance(href_value, list):
-                    href = href_value[0] if href_value else ""
-                else:
-                    href = href_value or ""
-
-                text = a_tag.get_text(strip=True)
-
-                if not href or href.startswith('javascript:'):
-                    continue
-
-                if not href.startswith(('http://', 'https://')):
-                    href = urljoin(url, href)
-
-                links.append({
-                    "url": href,
-                    "text": text if text else href
-                })
+                def read_source(driver: WebDriver) -> str:
+                    _load_in_driver(driver, url, settle=2, timeout=timeout)
+                    return driver.page_source
 
+                html_content = await self._with_driver(read_source)
+            links = await cpu_pool.run(_parse_and_clean_links, html_content, url, size=len(html_content))
             logger.info(f"Successfully extracted {len(links)} links from {url}")
             return links
         except Exception as e:
             error_msg = f"Error extracting links from {url}: {str(e)}"
             logger.error(error_msg)
-            raise Exception(error_msg)
-
-    async def fetch_content(self, url: str) -> str:
-        await self._ensure_driver()
-
+            raise Exception(error_msg) from e
+
+    async def _page_text(self, page: Page, url: str, extract: str) -> str:
+        if extract == "main":
+            article = await page.evaluate(READABILITY_SCRIPT, MIN_ARTICLE_CHARS)
+            if article.get("body") is not None:
+                logger.info(f"No main article found on {url}; returning the full body text")
+            return format_article(article)
+        return await page.locator("body").inner_text()
+
+    async def _fetch_with(self, strategy: str, url: str, timeout: float, extract: str) -> str:
+        """Fetch the page text using one of the ``STRATEGIES``."""
+        if strategy == "static":
+            html = await asyncio.to_thread(_get_html, url, timeout)
+            return await cpu_pool.run(_static_text, html, size=len(html))
+        async with self._page(url) as page:
+            if strategy == "light":
+                await page.route("**/*", _block_heavy_resources)
+            wait_until = "domcontentloaded" if strategy == "light" else "networkidle"
+            await page.goto(url, wait_until=wait_until, timeout=timeout * 1000)
+            return await self._page_text(page, url, extract)
+
+    async def _fetch_adaptive(self, url: str, timeout: float, extract: str) -> str:
+        """Try the strategies the site's profile suggests, escalating on errors or thin pages.
+
+        Only full-text fetches may skip the browser: the main-content scorer
+        runs in the page, and a static extraction would be learned as working
+        on sites where the scorer would have picked something else.
+        """
+        deadline = time.monotonic() + timeout
+        best = ""
+        error: Optional[Exception] = None
+        strategies = STRATEGIES if extract == "full" else BROWSER_STRATEGIES
+        for strategy in fetch_profiles.plan(url, strategies):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            started = time.monotonic()
+            try:
+                text = await self._fetch_with(strategy, url, remaining, extract)
+            except Exception as e:
+                fetch_profiles.record(url, strategy, False, time.monotonic() - started)
+                logger.info(f"{strategy} fetch of {url} failed: {str(e)}")
+                error = e
+                continue
+            ok = len(text.strip()) >= FETCH_MIN_CHARS
+            fetch_profiles.record(url, strategy, ok, time.monotonic() - started, len(text))
+            if len(text) > len(best):
+                best = text
+            if ok:
+                logger.debug(f"Fetched {url} with the {strategy} strategy")
+                break
+            logger.info(f"{strategy} fetch of {url} returned {len(text)} characters; escalating")
+        fetch_profiles.finished(url)
+        if fetch_profiles.save_due():
+            await asyncio.to_thread(fetch_profiles.save)
+        if not best and error is not None:
+            raise error
+        return best
+
+    async def _fetch_content(self, url: str, timeout: float = TIMEOUT, extract: str = "full") -> str:
         try:
             logger.info(f"Fetching content from URL: {url}")
             if self.mode == "playwright":
-                assert self.page is not None
-                await self.page.goto(url, wait_until="networkidle")
-                text = await self.page.locator("body").inner_text()
+                text = await self._fetch_adaptive(url, timeout, extract)
             else:
-                assert self.driver is not None
-                await asyncio.get_running_loop().run_in_executor(None, self.driver.get, url)
-                WebDriverWait(self.driver, 30).until(
-                    EC.presence_of_element_located(("tag name", "body"))
-                )
-                await asyncio.sleep(5)
-                text = self.driver.find_element("tag name", "body").text
+                def read_text(driver: WebDriver) -> Dict[str, Any]:
+                    _load_in_driver(driver, url, settle=5, timeout=timeout)
+                    if extract == "main":
+                        return driver.execute_script(f"return ({READABILITY_SCRIPT})(arguments[0]);", MIN_ARTICLE_CHARS)
+                    return {"body": driver.find_element("tag name", "body").text}
+
+                text = format_article(await self._with_driver(read_text))
             # html_content = await self.page.content()  # noqa: ERA001
             # soup = BeautifulSoup(html_content, 'html.parser')  # noqa: ERA001
             # text = self._extract_main_content(soup)  # noqa: ERA001
@@ -256,25 +517,115 @@ class WebScraper:
         except Exception as e:
             error_msg = f"Error fetching content from {url}: {str(e)}"
             logger.error(error_msg)
-            raise Exception(error_msg)
+            raise Exception(error_msg) from e
+
+    async def start(self) -> None:
+        """Launch the browser or driver ahead of the first request."""
+        await self._ensure_driver()
+        logger.info("WebScraper prewarmed")
+
+    async def is_healthy(self, timeout: float = 10) -> bool:
+        """Return whether the browser (or driver) still responds."""
+        try:
+            if self.mode == "playwright":
+                if not self._browser_alive():
+                    return False
+                assert self.browser is not None
+                context = await asyncio.wait_for(self.browser.new_context(), timeout)
+                await context.close()
+            else:
+                # Busy drivers are discarded by the pool if their session dies;
+                # idle ones are pinged, and a dead one means Chrome went away
+                assert self.drivers is not None
+                await asyncio.to_thread(self.drivers.reap_idle)
+                return await asyncio.to_thread(self.drivers.probe_idle) == 0
+            return True
+        except Exception as e:
+            logger.warning(f"WebScraper health check failed: {str(e)}")
+            return False
+
+    def browser_rss_mb(self) -> Optional[float]:
+        """Total resident memory of the Chromium processes we launched, or None."""
+        if psutil is None:
+            return None
+        total = 0
+        for proc in psutil.Process().children(recursive=True):
+            try:
+                if "chrom" in proc.name().lower():
+                    total += proc.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+
+    async def _drain(self, timeout: float) -> bool:
+        """Wait until no request is in flight; return False on timeout."""
+        deadline = time.monotonic() + timeout
+        while self._inflight and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        return self._inflight == 0
+
+    async def restart(self, drain_timeout: float = 30) -> None:
+        """Relaunch the browser (or driver), letting in-flight requests finish first."""
+        logger.info("Restarting WebScraper browser")
+        if self.mode == "playwright":
+            self._recycling = True
+            try:
+                async with self._launch_lock:
+                    if not await self._drain(drain_timeout):
+                        logger.warning(f"Recycling browser with {self._inflight} requests still in flight")
+                    await self._close_browser()
+            finally:
+                self._recycling = False
+        else:
+            assert self.drivers is not None
+            await asyncio.to_thread(self.drivers.clear)
+        await self._ensure_driver()
+
+    async def monitor(self, interval: float = 60, max_rss_mb: float = 0) -> None:
+        """Periodically relaunch a dead browser and recycle one using too much memory."""
+        if max_rss_mb and psutil is None:
+            logger.warning("psutil is not installed; memory-based browser recycling is disabled")
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._monitor_once(max_rss_mb)
+            except Exception:
+                # a failed relaunch must not end monitoring; try again next interval
+                logger.exception("WebScraper monitor check failed")
+
+    async def _monitor_once(self, max_rss_mb: float) -> None:
+        if self.mode == "playwright" and self.browser is None:
+            return  # not launched yet, nothing to check
+        if not await self.is_healthy():
+            logger.warning("WebScraper browser is unhealthy; relaunching")
+            await self.restart()
+            return
+        rss = self.browser_rss_mb() if max_rss_mb else None
+        logger.info(f"Scheduler: {scheduler.snapshot()}")
+        if rss is not None and rss > max_rss_mb:
+            logger.warning(f"Browser RSS {rss:.0f} MB exceeds {max_rss_mb:.0f} MB; recycling")
+            await self.restart()
+
+    async def shutdown(self, drain_timeout: float = 30) -> None:
+        """Stop accepting requests, wait for in-flight ones, then clean up."""
+        self._closing = True
+        if not await self._drain(drain_timeout):
+            logger.warning(f"Shutting down with {self._inflight} requests still in flight")
+        await self.cleanup()
 
     async def cleanup(self) -> None:
+        await asyncio.to_thread(fetch_profiles.save)
         if self.mode == "playwright":
             if self.browser:
-                try:
-                    await self.browser.close()
-                    logger.info("Playwright browser cleaned up successfully")
-                except Exception as e:
-                    logger.error(f"Error during Playwright cleanup: {str(e)}")
+                await self._close_browser()
+                logger.info("Playwright browser cleaned up successfully")
             if self.playwright:
                 await self.playwright.stop()
+                self.playwright = None
         else:
-            if self.driver:
-                try:
-                    await asyncio.get_running_loop().run_in_executor(None, self.driver.quit)
-                    logger.info("Chrome WebDriver cleaned up successfully")
-                except Exception as e:
-                    logger.error(f"Error during WebDriver cleanup: {str(e)}")
+            assert self.drivers is not None
+            await asyncio.to_thread(self.drivers.close)
+            logger.info("Chrome WebDriver pool cleaned up successfully")
 
 
 # The scraper instance can be created synchronously; its heavy resources
@@ -299,6 +650,12 @@ if __name__ == "__main__":
         action="store_true",
         help="extract links instead of text content",
     )
+    parser.add_argument(
+        "--extract",
+        choices=EXTRACT_MODES,
+        default="main",
+        help="main article only, or the full body text",
+    )
     args = parser.parse_args()
 
     scraper = WebScraper(mode=args.mode)
@@ -306,7 +663,7 @@ if __name__ == "__main__":
         if args.links:
             data = asyncio.run(scraper.extract_links(args.url))
         else:
-            data = asyncio.run(scraper.fetch_content(args.url))
+            data = asyncio.run(scraper.fetch_content(args.url, extract=args.extract))
         print(json.dumps(data, indent=2))
     finally:
         asyncio.run(scraper.cleanup())